@@ -0,0 +1,147 @@
+'''
+This file is part of MSR Ensemble (MSRE-X).
+
+MSRE-X is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+MSRE-X is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with MSRE-X. If not, see <http://www.gnu.org/licenses/>.
+
+MSR Ensemble (MSRE-X) Version 0.5, Prototype Alpha
+
+Authors:
+Edmund S. L. Lam      sllam@qatar.cmu.edu
+Iliano Cervesato      iliano@cmu.edu
+
+* This implementation was made possible by an NPRP grant (NPRP 09-667-1-100, Effective Programming 
+for Large Distributed Ensembles) from the Qatar National Research Fund (a member of the Qatar 
+Foundation). The statements made herein are solely the responsibility of the authors.
+'''
+# Benchmark for ordered store lookups: generates large random graphs for the ensem_shortpath program,
+# compiles each with and without ordered (range) lookups, builds the C++ output and times the runs.
+# The 'elim' rule of shortpath ([X]path(Y,D1) \ [X]path(Y,D2) | D1 <= D2) is the one that benefits.
+#
+# Usage: python benchmarks/shortpath_bench.py [--nodes N ..] [--degree D] [--np P] [--runs R]
+
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from argparse import ArgumentParser
+
+from msrex.frontend.process import process_msre
+from msrex.frontend.code.code_generator import CPPCodeGenerator
+import msrex.frontend.compile.lookup_context as lookup_context
+
+RUNTIME_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'runtime')
+
+SHORTPATH_RULES = '''ensem shortpath {
+
+	predicate trans_req :: (loc,int) -> fact.
+	predicate edge :: (loc,int) -> fact.
+	predicate path :: (loc,int) -> fact.
+
+	rule base  :: [X]edge(Y,D) \\ 1 --o [X]path(Y,D).
+	rule elim  :: [X]path(Y,D1) \\ [X]path(Y,D2) | D1 <= D2 --o 1.
+	rule trans_1 :: [X]edge(Y,D) \\ 1 --o [Y]trans_req(X,D).
+	rule trans_2 :: [Y]trans_req(X,D1), [Y]path(Z,D2) \\ 1 | X != Z --o [X]path(Z,D1+D2).
+}
+'''
+
+def random_graph_msr(num_nodes, degree, max_weight, seed):
+	rand = random.Random(seed)
+	locs = map(lambda i: "L%s" % i, range(0,num_nodes))
+	edges = []
+	for i in range(0,num_nodes):
+		# A ring keeps the graph connected, the remaining edges are random.
+		edges.append( "[%s]edge(%s,%s)" % (locs[i],locs[(i+1) % num_nodes],rand.randint(1,max_weight)) )
+		for dest in rand.sample(range(0,num_nodes), min(degree-1,num_nodes-1)):
+			if dest != i:
+				edges.append( "[%s]edge(%s,%s)" % (locs[i],locs[dest],rand.randint(1,max_weight)) )
+	return "%s\nexecute shortpath {\n\texists %s.\n\t%s.\n}\n" % (SHORTPATH_RULES, ', '.join(locs), ',\n\t'.join(edges))
+
+def compile_program(msr_file, use_ord, work_dir, cxx, cxx_flags):
+	lookup_context.USE_ORD_LOOKUP = use_ord
+	start = time.time()
+	output = process_msre(msr_file)
+	if not output['valid']:
+		for report in output['error_reports']:
+			print report
+		return None
+	prog = output['prog']
+	cpp_gen = CPPCodeGenerator(prog, prog.fact_dir, output['data'])
+	cpp_gen.generate()
+	compile_time = time.time() - start
+	cpp_file = os.path.join(work_dir, "%s_%s.cpp" % (prog.prog_name, "ord" if use_ord else "hash"))
+	shutil.move("%s.cpp" % prog.prog_name, cpp_file)
+	exe_file = cpp_file[:-4]
+	cmd = [cxx] + cxx_flags.split() + ["-I%s" % RUNTIME_DIR, cpp_file, "-o", exe_file, "-lboost_mpi", "-lboost_serialization"]
+	if subprocess.call(cmd) != 0:
+		print "Failed to build %s" % cpp_file
+		return None
+	return (compile_time, exe_file)
+
+def time_run(exe_file, num_procs, runs):
+	timings = []
+	for _ in range(0,runs):
+		start = time.time()
+		with open(os.devnull, 'w') as devnull:
+			subprocess.check_call(["mpirun", "-np", str(num_procs), exe_file], stdout=devnull)
+		timings.append( time.time() - start )
+	return min(timings)
+
+def main():
+	arg_parser = ArgumentParser(prog='shortpath_bench.py')
+	arg_parser.add_argument('--nodes', dest='nodes', type=int, nargs='+', default=[50,100,200])
+	arg_parser.add_argument('--degree', dest='degree', type=int, default=8)
+	arg_parser.add_argument('--max-weight', dest='max_weight', type=int, default=100)
+	arg_parser.add_argument('--seed', dest='seed', type=int, default=0)
+	arg_parser.add_argument('--np', dest='num_procs', type=int, default=4)
+	arg_parser.add_argument('--runs', dest='runs', type=int, default=3)
+	arg_parser.add_argument('--cxx', dest='cxx', default='mpiCC')
+	arg_parser.add_argument('--cxx-flags', dest='cxx_flags', default='-O2')
+	args = arg_parser.parse_args()
+
+	work_dir = tempfile.mkdtemp()
+	orig_dir = os.getcwd()
+	os.chdir(work_dir)
+	try:
+		print "%-8s %-8s %14s %14s %14s %14s %8s" % ("nodes","edges","hash comp (s)","ord comp (s)","hash run (s)","ord run (s)","speedup")
+		for num_nodes in args.nodes:
+			msr_text = random_graph_msr(num_nodes, args.degree, args.max_weight, args.seed)
+			msr_file = os.path.join(work_dir, "shortpath_%s.msr" % num_nodes)
+			open(msr_file, 'w').write( msr_text )
+			num_edges = msr_text.count("edge(") - SHORTPATH_RULES.count("edge(")
+			results = {}
+			for use_ord in [False,True]:
+				compiled = compile_program(msr_file, use_ord, work_dir, args.cxx, args.cxx_flags)
+				if compiled == None:
+					break
+				compile_time,exe_file = compiled
+				results[use_ord] = (compile_time, time_run(exe_file, args.num_procs, args.runs))
+			if len(results) < 2:
+				print "%-8s %s" % (num_nodes, "failed, skipped")
+				continue
+			hash_comp,hash_run = results[False]
+			ord_comp,ord_run   = results[True]
+			print "%-8s %-8s %14.4f %14.4f %14.4f %14.4f %7.1fx" % (num_nodes,num_edges,hash_comp,ord_comp,hash_run,ord_run,hash_run / max(ord_run,1e-9))
+	finally:
+		lookup_context.USE_ORD_LOOKUP = True
+		os.chdir(orig_dir)
+		shutil.rmtree(work_dir)
+
+if __name__ == "__main__":
+	main()
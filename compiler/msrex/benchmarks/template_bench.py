@@ -0,0 +1,97 @@
+'''
+This file is part of MSR Ensemble (MSRE-X).
+
+MSRE-X is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+MSRE-X is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with MSRE-X. If not, see <http://www.gnu.org/licenses/>.
+
+MSR Ensemble (MSRE-X) Version 0.5, Prototype Alpha
+
+Authors:
+Edmund S. L. Lam      sllam@qatar.cmu.edu
+Iliano Cervesato      iliano@cmu.edu
+
+* This implementation was made possible by an NPRP grant (NPRP 09-667-1-100, Effective Programming 
+for Large Distributed Ensembles) from the Qatar National Research Fund (a member of the Qatar 
+Foundation). The statements made herein are solely the responsibility of the authors.
+'''
+
+# Benchmark for the template engine: generates C++ code for the sample programs with both the
+# legacy (rescanning) template engine and the precompiled one, and checks that outputs are identical.
+#
+# Usage: python benchmarks/template_bench.py [--runs N] [msr files..] (defaults to ../../samples/*.msr)
+
+import os
+import sys
+import glob
+import time
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from argparse import ArgumentParser
+
+from msrex.frontend.process import process_msre
+import msrex.frontend.code.code_generator as code_generator
+import msrex.misc.template as template
+
+DEFAULT_SAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'samples', '*.msr')
+
+def generate_code(prog, data, engine, runs):
+	code_generator.compile_template = engine
+	template.clear_template_cache()
+	timings = []
+	code = None
+	for _ in range(0,runs):
+		start = time.time()
+		cpp_gen = code_generator.CPPCodeGenerator(prog, prog.fact_dir, data)
+		cpp_gen.generate()
+		timings.append( time.time() - start )
+		file_name = "%s.cpp" % prog.prog_name
+		code = open(file_name).read()
+		os.remove(file_name)
+	return (min(timings), code)
+
+def main():
+	arg_parser = ArgumentParser(prog='template_bench.py')
+	arg_parser.add_argument('filenames', nargs='*')
+	arg_parser.add_argument('--runs', dest='runs', type=int, default=3)
+	args = arg_parser.parse_args()
+
+	file_names = map(os.path.abspath, args.filenames if len(args.filenames) > 0 else sorted(glob.glob(DEFAULT_SAMPLES)))
+	work_dir = tempfile.mkdtemp()
+	orig_dir = os.getcwd()
+	os.chdir(work_dir)
+	all_same = True
+	try:
+		print "%-30s %12s %12s %8s %10s" % ("program","legacy (s)","compiled (s)","speedup","identical")
+		for file_name in file_names:
+			output = process_msre(file_name)
+			if not output['valid']:
+				print "%-30s %s" % (os.path.basename(file_name), "compilation failed, skipped")
+				continue
+			prog = output['prog']
+			(legacy_time, legacy_code) = generate_code(prog, output['data'], template.compile_template_legacy, args.runs)
+			(new_time, new_code)       = generate_code(prog, output['data'], template.compile_template, args.runs)
+			same = legacy_code == new_code
+			all_same = all_same and same
+			print "%-30s %12.4f %12.4f %7.1fx %10s" % (os.path.basename(file_name), legacy_time, new_time, legacy_time / max(new_time,1e-9), same)
+	finally:
+		code_generator.compile_template = template.compile_template
+		os.chdir(orig_dir)
+		shutil.rmtree(work_dir)
+	if not all_same:
+		sys.exit(1)
+
+if __name__ == "__main__":
+	main()
@@ -26,9 +26,11 @@ Foundation). The statements made herein are solely the responsibility of the aut
 '''
 
 from msrex.frontend.process import process_msre
-from msrex.frontend.code.code_generator import CPPCodeGenerator
+from msrex.frontend.cache import CompilationCache, generate_cpp
 
 from msrex.misc.msr_logging import init_logger, log_info
+import msrex.misc.visit as visit
+import msrex.misc.parallel as parallel
 
 from string import split
 from argparse import ArgumentParser
@@ -36,10 +38,25 @@ from argparse import ArgumentParser
 
 arg_parser = ArgumentParser(prog='msre.py')
 arg_parser.add_argument('filename')
+arg_parser.add_argument('-p', '--profile', dest="profile", default=None, help="Store sizes from a previous run, used to order joins")
+arg_parser.add_argument('-b', '--binary-facts', dest="binary_facts", action="store_true", help="Write ground initial facts to a binary fact file, loaded at runtime")
+arg_parser.add_argument('-s', '--split', dest="split", action="store_true", help="Write separately compiled C++ units, with a Makefile for incremental builds, to <prog>_cpp/")
+arg_parser.add_argument('--no-cache', dest="no_cache", action="store_true", help="Do not reuse or store compilation results in the compilation cache")
+arg_parser.add_argument('--cache-dir', dest="cache_dir", default=None, help="Directory of the compilation cache (default: $MSRE_CACHE_DIR or ~/.msre_cache)")
+arg_parser.add_argument('--dump-node-centric', dest="dump_node_centric", action="store_true", help="Write the node-centric codes of system-centric programs to a .cmg file")
+arg_parser.add_argument('-j', '--jobs', dest="jobs", type=int, default=1, help="Number of worker processes used by the compiler (default: 1)")
+arg_parser.add_argument('--profile-dispatch', dest="profile_dispatch", action="store_true", help="Count visitor dispatches per compiler pass and node type (passes skipped by cache hits are not counted)")
 # arg_parser.add_argument('-o', dest="output")
 args = arg_parser.parse_args()
 
-output = process_msre(args.filename)
+cache = None if args.no_cache else CompilationCache( args.cache_dir )
+
+parallel.set_jobs( args.jobs )
+
+if args.profile_dispatch:
+	visit.start_profile()
+
+output = process_msre(args.filename, profile_file=args.profile, cache=cache, dump_node_centric=args.dump_node_centric)
 
 if output["valid"]:
 	prog = output["prog"]
@@ -48,14 +65,16 @@ if output["valid"]:
 		print "\n"
 		print ana
 		print "\n"
-	cppGen = CPPCodeGenerator(prog, prog.fact_dir, output['data'])
-	cppGen.generate()
+	generate_cpp(output, cache=cache, binary_facts=args.binary_facts, split=args.split)
 else:
 	for report in output['error_reports']:
 		print "\n"
 		print report
 		print "\n"
 
+if args.profile_dispatch:
+	print visit.stop_profile()
+
 # mpiCC mergesort.cpp -lboost_mpi -lboost_serialization -o mergesort
 
 
@@ -35,6 +35,12 @@ ERROR_IDX = 1
 
 class Checker:
 
+	# Checkers that must have passed before this checker runs (see msrex.frontend.analyze.scheduler)
+	depends_on = []
+
+	# Checkers that annotate the AST run in the compiler process, others may run in forked workers
+	annotates_ast = False
+
 	# Front End Interfaces
 
 	def __init__(self, decs, source_text, default_highlight=terminal.T_RED_BACK, builtin_preds=[]):
@@ -104,6 +104,8 @@ def getHeads(match_obligations, var_name):
 
 class NeighborRestrictChecker(Checker):
 
+	annotates_ast = True
+
 	def __init__(self, decs, source_text, builtin_preds=[]):
 		self.initialize(decs, source_text, builtin_preds=builtin_preds)
 		self.inspect = Inspector()
@@ -32,13 +32,14 @@ import msrex.misc.visit as visit
 from msrex.frontend.analyze.inspectors import Inspector
 from msrex.frontend.analyze.checkers.base_checker import Checker
 
-PRAGMA_TEXT_SOLO_EXEC = "solo"
+PRAGMA_TEXT_SOLO_EXEC   = "solo"
+PRAGMA_TEXT_CARDINALITY = "cardinality"
 
 class PragmaChecker(Checker):
 
 	def __init__(self, decs, source_text, builtin_preds=[]):
 		self.initialize(decs, source_text, builtin_preds=builtin_preds)
-		self.pragma_dict = { 'solo' : False }
+		self.pragma_dict = { 'solo' : False, 'cardinality' : {} }
 
 	def check(self):
 		inspect = Inspector()
@@ -47,12 +48,20 @@ class PragmaChecker(Checker):
 		
 	def check_pragma(self, pragma_dec):
 		pragma_text = pragma_dec.pragma_text
-		if not pragma_text in [PRAGMA_TEXT_SOLO_EXEC]:
+		if not pragma_text in [PRAGMA_TEXT_SOLO_EXEC, PRAGMA_TEXT_CARDINALITY]:
 			error_idx = self.declare_error("Unknown pragma \'%s\'" % pragma_dec.pragma_text)
 			self.extend_error(error_idx, pragma_dec)
 		else:
 			if pragma_text == PRAGMA_TEXT_SOLO_EXEC:
 				self.pragma_dict['solo'] = True
+			elif pragma_text == PRAGMA_TEXT_CARDINALITY:
+				# pragma cardinality <predicate> <size>.
+				args = pragma_dec.pragma_args
+				if len(args) != 2 or not isinstance(args[0], str) or not isinstance(args[1], int):
+					error_idx = self.declare_error("Pragma \'%s\' expects a predicate name and a store size" % pragma_text)
+					self.extend_error(error_idx, pragma_dec)
+				else:
+					self.pragma_dict['cardinality'][args[0]] = args[1]
 
 	def get_analysis_name(self):
 		return "pragmas"
@@ -29,6 +29,7 @@ import msrex.frontend.lex_parse.ast as ast
 import msrex.frontend.lex_parse.constants as constants
 
 import msrex.misc.visit as visit
+import msrex.misc.parallel as parallel
 import msrex.misc.terminal_color as terminal
 
 '''
@@ -41,6 +42,7 @@ from msrex.frontend.analyze.smt_solver import Solver, tyVar, tyLoc, tyInt, tyBoo
 
 from msrex.frontend.analyze.inspectors import Inspector
 from msrex.frontend.analyze.checkers.base_checker import Checker
+from msrex.frontend.analyze.checkers.var_scope_checker import VarScopeChecker
 
 from msrex.misc.aggregators import foldl
 
@@ -94,6 +96,9 @@ def copy_ctxt(ctxt):
 
 class TypeChecker(Checker):
 
+	depends_on = [VarScopeChecker]
+	annotates_ast = True
+
 	def __init__(self, decs, source_text, builtin_preds=[]):
 		self.inspect = Inspector()
 		self.initialize(decs, source_text, builtin_preds=builtin_preds)	
@@ -132,7 +137,7 @@ class TypeChecker(Checker):
 		for export_dec in inspect.filter_decs(ast_node.decs, export=True):
 			(s,cons) = self.int_check_dec(export_dec, ctxt)
 			s0 = s0 and s
-			if self.check_type_sat( cons + fact_dec_cons ):			
+			if self.check_type_sat( fact_dec_cons + cons ):			
 				export_dec_cons += cons
 			else:
 				this_s = False
@@ -151,10 +156,14 @@ class TypeChecker(Checker):
 			this_s = False
 
 		rule_dec_cons = []
+		rule_cons = []
 		for rule_dec in inspect.filter_decs(ast_node.decs, rule=True):
 			(s,cons) = self.int_check_dec(rule_dec, ctxt)
 			s0 = s0 and s
-			if self.check_type_sat( cons + extern_cons + fact_dec_cons ):	
+			rule_cons.append( cons )
+		rule_sats = self.check_types_sat( map(lambda cons: extern_cons + fact_dec_cons + cons, rule_cons) )
+		for (cons,sat) in zip(rule_cons, rule_sats):
+			if sat:
 				rule_dec_cons += cons
 			else:
 				this_s = False
@@ -594,14 +603,52 @@ class TypeChecker(Checker):
 					del self.infer_goals[key]
 			return True
 		else:
-			error_idx = self.declare_error("Type Error in the following sites")
-			for error_site in foldl( map(lambda c: c.get_just(),mus), []):
-				self.extend_error(error_idx, error_site)
+			self.report_type_error(mus)
 			return False
 
+	def report_type_error(self, mus):
+		error_idx = self.declare_error("Type Error in the following sites")
+		for error_site in foldl( map(lambda c: c.get_just(),mus), []):
+			self.extend_error(error_idx, error_site)
+
+	# Checks independent sets of constraints, in order. With several jobs, the sets are solved by forked
+	# workers (see solve_forked_type_cons), and their outcomes are applied here in order. SMT types of
+	# inferred types, which cannot be pickled, are then not recorded.
+	def check_types_sat(self, cons_list):
+		if not parallel.is_parallel() or len(cons_list) < 2:
+			return map(lambda cons: self.check_type_sat(cons), cons_list)
+		outcomes = parallel.fork_map(solve_forked_type_cons, (self,cons_list), range(len(cons_list)))
+		sats = []
+		for (cons,(mus_idxs,inferred)) in zip(cons_list, outcomes):
+			if mus_idxs == None:
+				for (key,ty) in inferred:
+					if key in self.infer_goals:
+						self.infer_goals[key].type = ty
+						del self.infer_goals[key]
+				sats.append( True )
+			else:
+				self.report_type_error( map(lambda idx: cons[idx], mus_idxs) )
+				sats.append( False )
+		return sats
+
 	# Type inference operations
 
 	def mark_for_infer(self, ast_node, ty_var):
 		self.infer_goals[str(ty_var)] = ast_node
 
-
+# Solves a set of constraints in a forked worker. Returns the positions of a minimal unsatisfiable subset
+# of the constraints, or the types inferred from a model of the constraints.
+def solve_forked_type_cons((checker,cons_list), idx):
+	cons = cons_list[idx]
+	mus  = min_unsat_subset(checker.solver, cons)
+	if len(mus) == 0:
+		model = checker.solver.solve(cons)
+		inferred = []
+		for d in model:
+			key = str(d)
+			if key in checker.infer_goals:
+				inferred.append( (key,coerce_type( model[d] )) )
+		return (None,inferred)
+	else:
+		cons_ids = map(id, cons)
+		return (map(lambda c: cons_ids.index(id(c)), mus),None)
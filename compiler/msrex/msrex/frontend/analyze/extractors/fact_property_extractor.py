@@ -47,9 +47,13 @@ import msrex.misc.visit as visit
 
 from msrex.frontend.analyze.inspectors import Inspector
 from msrex.frontend.analyze.checkers.base_checker import Checker
+from msrex.frontend.analyze.checkers.lhs_restrict_checker import LHSRestrictChecker
 
 class FactPropertyExtractor(Checker):
 
+	depends_on = [LHSRestrictChecker]
+	annotates_ast = True
+
 	def __init__(self, decs, source_text, builtin_preds=[]):
 		self.initialize(decs, source_text, builtin_preds=builtin_preds)
 		self.rule_unique_heads = {}
@@ -187,6 +191,7 @@ class FactPropertyExtractor(Checker):
 			fact_dec.local      = fact_dec.name not in non_local_pred_names
 			fact_dec.monotone   = fact_dec.name not in lhs_compre_pred_names
 			fact_dec.uses_priority = fact_dec.name in prioritized_pred_names
+			fact_dec.exported_queries = []
 		self.fact_decs = fact_decs
 
 		# Annotate rule declaration nodes with relevant information
@@ -291,11 +291,7 @@ class Inspector:
 	def count_terms(self, ast_node):
 		if ast_node.type == None:
 			return 0
-		c = self.count_terms(ast_node.type)
-		if isinstance(c, list):
-			return c[0]
-		else:
-			return c
+		return self.count_terms(ast_node.type)
 
 	@visit.when(ast.TypeTuple)
 	def count_terms(self, ast_node):
@@ -315,12 +311,7 @@ class Inspector:
 	def tuple_term_to_list(self, ast_node):
 		if ast_node.type == None:
 			return []
-		c = self.tuple_term_to_list(ast_node.type)
-		if isinstance(c, list):
-			return [c[0]]
-		else:
-			# print c['types']
-			return c['types']
+		return self.tuple_term_to_list(ast_node.type)['types']
 
 	@visit.when(ast.TypeTuple)
 	def tuple_term_to_list(self, ast_node):
@@ -342,143 +333,149 @@ class Inspector:
 
 	# Free Variables
 
-	@visit.on('ast_node')
-	def free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
-		pass
+	# Free variables are computed bottom-up once per AST node and combination of flags, and cached
+	# on the node (see FreeVars). Lists are not cached, but their elements are.
 
-	@visit.when(list)
 	def free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
-		this_free_vars = []
-		for obj in ast_node:
-			this_free_vars += self.free_vars( obj, loc=loc, args=args, compre_binders=compre_binders, uscores=uscores )
-		return this_free_vars
+		return list( self.free_var_tuple(ast_node, loc=loc, args=args, compre_binders=compre_binders, uscores=uscores) )
+
+	def free_var_tuple(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
+		flags = (loc,args,compre_binders,uscores)
+		if ast_node.__class__ == list:
+			fvs = []
+			for obj in ast_node:
+				fvs.extend( self.cached_free_vars(obj, flags).term_vars )
+			return tuple(fvs)
+		return self.cached_free_vars(ast_node, flags).term_vars
+
+	def cached_free_vars(self, ast_node, flags):
+		if ast_node.__class__ == list:
+			return FreeVars( self.free_var_tuple(ast_node, *flags) )
+		if not isinstance(ast_node, ast.ASTNode):
+			return FreeVars( tuple(self.int_free_vars(ast_node, *flags)) )
+		cache = getattr(ast_node, 'free_vars_cache', None)
+		if cache == None or cache[0] != FREE_VARS_EPOCH[0]:
+			cache = (FREE_VARS_EPOCH[0], {})
+			ast_node.free_vars_cache = cache
+		fvs = cache[1].get(flags)
+		if fvs == None:
+			fvs = FreeVars( tuple(self.int_free_vars(ast_node, *flags)) )
+			cache[1][flags] = fvs
+		return fvs
+
+	@visit.on('ast_node')
+	def int_free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
+		pass
 
 	@visit.when(ast.FactBase)
-	def free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
-		return self.free_vars(ast_node.terms, loc=loc, args=args, compre_binders=compre_binders, uscores=uscores)
+	def int_free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
+		return self.free_var_tuple(ast_node.terms, loc=loc, args=args, compre_binders=compre_binders, uscores=uscores)
 
 	@visit.when(ast.FactLoc)
-	def free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
-		fvs = []
+	def int_free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
+		fvs = ()
 		if loc:
-			fvs += self.free_vars(ast_node.loc, loc=loc, args=args, compre_binders=compre_binders, uscores=uscores)
+			fvs += self.free_var_tuple(ast_node.loc, loc=loc, args=args, compre_binders=compre_binders, uscores=uscores)
 		if args:
-			fvs += self.free_vars(ast_node.fact, loc=loc, args=args, compre_binders=compre_binders, uscores=uscores)
+			fvs += self.free_var_tuple(ast_node.fact, loc=loc, args=args, compre_binders=compre_binders, uscores=uscores)
 		return fvs
 
 	@visit.when(ast.FactLocCluster)
-	def free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
-		fvs = []
+	def int_free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
+		fvs = ()
 		if loc:
-			fvs += self.free_vars(ast_node.loc, loc=loc, args=args, compre_binders=compre_binders, uscores=uscores)
+			fvs += self.free_var_tuple(ast_node.loc, loc=loc, args=args, compre_binders=compre_binders, uscores=uscores)
 		if args:
-			fvs += self.free_vars(ast_node.facts, loc=loc, args=args, compre_binders=compre_binders, uscores=uscores)
+			fvs += self.free_var_tuple(ast_node.facts, loc=loc, args=args, compre_binders=compre_binders, uscores=uscores)
 		return fvs
 
 	@visit.when(ast.FactCompre)
-	def free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
+	def int_free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
 		comp_term_vars   = map(lambda comp_range: comp_range.term_vars, ast_node.comp_ranges)
 		comp_term_ranges = map(lambda comp_range: comp_range.term_range, ast_node.comp_ranges)	
 
-		binders    = self.free_vars( comp_term_vars )
-		scope_vars = self.free_vars( ast_node.facts, loc=loc, args=args, compre_binders=compre_binders, uscores=uscores ) 
+		binders    = self.free_var_tuple( comp_term_vars )
+		scope_vars = self.free_var_tuple( ast_node.facts, loc=loc, args=args, compre_binders=compre_binders, uscores=uscores ) 
 
 		if args:
-			scope_vars += self.free_vars( ast_node.guards, compre_binders=compre_binders, uscores=uscores ) 
-			scope_vars += self.free_vars( comp_term_ranges, compre_binders=compre_binders, uscores=uscores )
+			scope_vars += self.free_var_tuple( ast_node.guards, compre_binders=compre_binders, uscores=uscores ) 
+			scope_vars += self.free_var_tuple( comp_term_ranges, compre_binders=compre_binders, uscores=uscores )
 
 		if compre_binders:
-			this_free_vars = scope_vars + binders
+			return scope_vars + binders
 		else:
-			this_free_vars = []
-			for scope_var in scope_vars:
-				if not contains_var(scope_var, binders):
-					this_free_vars.append( scope_var )
-		return this_free_vars
+			return filter_binders(scope_vars, binders)
 
 	@visit.when(ast.TermCons)
-	def free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
-		return []
+	def int_free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
+		return ()
 
 	@visit.when(ast.TermVar)
-	def free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
-		return [ast_node]
+	def int_free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
+		return (ast_node,)
 
 	@visit.when(ast.TermApp)
-	def free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
-		return self.free_vars( ast_node.term1, compre_binders=compre_binders, uscores=uscores ) + self.free_vars( ast_node.term2, compre_binders=compre_binders, uscores=uscores )
+	def int_free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
+		return self.free_var_tuple( ast_node.term1, compre_binders=compre_binders, uscores=uscores ) + self.free_var_tuple( ast_node.term2, compre_binders=compre_binders, uscores=uscores )
 
 	@visit.when(ast.TermTuple)
-	def free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
-		this_free_vars = []
-		for term in ast_node.terms:
-			this_free_vars += self.free_vars( term, compre_binders=compre_binders, uscores=uscores )
-		return this_free_vars
+	def int_free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
+		return self.free_var_tuple( ast_node.terms, compre_binders=compre_binders, uscores=uscores )
 
 	@visit.when(ast.TermList)
-	def free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
-		this_free_vars = []
-		for term in ast_node.terms:
-			this_free_vars += self.free_vars( term, compre_binders=compre_binders, uscores=uscores )
-		return this_free_vars
+	def int_free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
+		return self.free_var_tuple( ast_node.terms, compre_binders=compre_binders, uscores=uscores )
 
 	@visit.when(ast.TermListCons)
-	def free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
-		return self.free_vars( ast_node.term1, compre_binders=compre_binders, uscores=uscores ) + self.free_vars( ast_node.term2, compre_binders=compre_binders, uscores=uscores )
+	def int_free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
+		return self.free_var_tuple( ast_node.term1, compre_binders=compre_binders, uscores=uscores ) + self.free_var_tuple( ast_node.term2, compre_binders=compre_binders, uscores=uscores )
 
 	@visit.when(ast.TermMSet)
-	def free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
-		this_free_vars = []
-		for term in ast_node.terms:
-			this_free_vars += self.free_vars( term, compre_binders=compre_binders, uscores=uscores )
-		return this_free_vars
+	def int_free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
+		return self.free_var_tuple( ast_node.terms, compre_binders=compre_binders, uscores=uscores )
 
 	@visit.when(ast.TermEnumMSet)
-	def free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
-		fvs1 = self.free_vars(ast_node.texp1,loc=loc,args=args,compre_binders=compre_binders,uscores=uscores)
-		fvs2 = self.free_vars(ast_node.texp2,loc=loc,args=args,compre_binders=compre_binders,uscores=uscores)
+	def int_free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
+		fvs1 = self.free_var_tuple(ast_node.texp1,loc=loc,args=args,compre_binders=compre_binders,uscores=uscores)
+		fvs2 = self.free_var_tuple(ast_node.texp2,loc=loc,args=args,compre_binders=compre_binders,uscores=uscores)
 		return fvs1 + fvs2
 
 	@visit.when(ast.TermCompre)
-	def free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
+	def int_free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
 		comp_term_vars   = map(lambda comp_range: comp_range.term_vars, ast_node.comp_ranges)
 		comp_term_ranges = map(lambda comp_range: comp_range.term_range, ast_node.comp_ranges)	
 
-		binders    = self.free_vars( comp_term_vars )
-		scope_vars = self.free_vars( ast_node.term ) + self.free_vars( ast_node.guards ) + self.free_vars( comp_term_ranges )
+		binders    = self.free_var_tuple( comp_term_vars )
+		scope_vars = self.free_var_tuple( ast_node.term ) + self.free_var_tuple( ast_node.guards ) + self.free_var_tuple( comp_term_ranges )
 
 		if not compre_binders:
-			this_free_vars = []
-			for scope_var in scope_vars:
-				if not contains_var(scope_var, binders):
-					this_free_vars.append( scope_var )
+			return filter_binders(scope_vars, binders)
 		else:
-			this_free_vars = scope_vars + binders
-		return this_free_vars
+			return scope_vars + binders
 
 	@visit.when(ast.TermBinOp)
-	def free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
-		return self.free_vars( ast_node.term1, compre_binders=compre_binders, uscores=uscores ) + self.free_vars( ast_node.term2, compre_binders=compre_binders,uscores=uscores )
+	def int_free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
+		return self.free_var_tuple( ast_node.term1, compre_binders=compre_binders, uscores=uscores ) + self.free_var_tuple( ast_node.term2, compre_binders=compre_binders,uscores=uscores )
 
 	@visit.when(ast.TermUnaryOp)
-	def free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
-		return self.free_vars( ast_node.term, compre_binders=compre_binders,uscores=uscores )
+	def int_free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
+		return self.free_var_tuple( ast_node.term, compre_binders=compre_binders,uscores=uscores )
 
 	@visit.when(ast.TermLit)
-	def free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
-		return []
+	def int_free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
+		return ()
 
 	@visit.when(ast.TermUnderscore)
-	def free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
+	def int_free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
 		if not uscores:
-			return []
+			return ()
 		else:
-			return [ast_node]
+			return (ast_node,)
 
 	@visit.when(ast.AssignDec)
-	def free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
-		pat_vars = self.free_vars(ast_node.term_pat, uscores=uscores)
-		exp_vars = self.free_vars(ast_node.builtin_exp, compre_binders=compre_binders, uscores=uscores)
+	def int_free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
+		pat_vars = self.free_var_tuple(ast_node.term_pat, uscores=uscores)
+		exp_vars = self.free_var_tuple(ast_node.builtin_exp, compre_binders=compre_binders, uscores=uscores)
 
 		if not compre_binders:
 			return exp_vars
@@ -486,8 +483,22 @@ class Inspector:
 			return pat_vars + exp_vars
 
 	def free_var_idxs(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
-		free_vars = self.free_vars(ast_node, loc=loc, args=args, compre_binders=compre_binders, uscores=uscores)
-		return set(map(lambda fv: fv.rule_idx, free_vars))
+		flags = (loc,args,compre_binders,uscores)
+		if ast_node.__class__ == list:
+			idxs = set()
+			for obj in ast_node:
+				idxs |= self.cached_free_vars(obj, flags).get_idxs()
+			return idxs
+		return self.cached_free_vars(ast_node, flags).get_idxs()
+
+	def unique_free_vars(self, ast_node, loc=True, args=True, compre_binders=False, uscores=False):
+		flags = (loc,args,compre_binders,uscores)
+		if ast_node.__class__ == list:
+			vs = []
+			for obj in ast_node:
+				vs.extend( self.cached_free_vars(obj, flags).get_unique_vars() )
+			return vs
+		return self.cached_free_vars(ast_node, flags).get_unique_vars()
 
 	def set_vars(self, vs, comp=lambda v: v.rule_idx):
 		vs_dict = {}
@@ -497,9 +508,9 @@ class Inspector:
 		return vs_dict.values()
 
 	def get_all_free_vars(self, ast_node):
-		pat_vars = self.set_vars( self.free_vars(ast_node, loc=True, args=True, compre_binders=False) )
-		binders  = self.set_vars( self.free_vars(ast_node, loc=False, args=False, compre_binders=True) )
-		all_vars = self.set_vars( self.free_vars(ast_node, loc=True, args=True, compre_binders=True) )
+		pat_vars = self.set_vars( self.unique_free_vars(ast_node, loc=True, args=True, compre_binders=False) )
+		binders  = self.set_vars( self.unique_free_vars(ast_node, loc=False, args=False, compre_binders=True) )
+		all_vars = self.set_vars( self.unique_free_vars(ast_node, loc=True, args=True, compre_binders=True) )
 		return pat_vars,binders,all_vars
 
 	# Pretty Printer
@@ -898,8 +909,44 @@ class Inspector:
 			ts = ts + self.unfold_term_seq(t) 
 		return ts
 
+# Free variables of an AST node, for one combination of flags: the variables in order of occurrence,
+# and (computed on demand) their rule indices and the first occurrence of each rule index.
+class FreeVars:
+
+	def __init__(self, term_vars):
+		self.term_vars   = term_vars
+		self.idxs        = None
+		self.unique_vars = None
+
+	def get_idxs(self):
+		if self.idxs == None:
+			self.idxs = frozenset( map(lambda fv: fv.rule_idx, self.term_vars) )
+		return self.idxs
+
+	def get_unique_vars(self):
+		if self.unique_vars == None:
+			seen = set()
+			unique_vars = []
+			for fv in self.term_vars:
+				if fv.rule_idx not in seen:
+					seen.add( fv.rule_idx )
+					unique_vars.append( fv )
+			self.unique_vars = tuple(unique_vars)
+		return self.unique_vars
+
+# Cached free variables are only valid within the epoch they were computed in. Transformers rewrite
+# the AST in place, hence start a new epoch (see Transformer.initialize).
+FREE_VARS_EPOCH = [0]
+
+def invalidate_free_vars():
+	FREE_VARS_EPOCH[0] += 1
+
 # Auxiliary operations
 
+def filter_binders(scope_vars, binders):
+	binder_names = set( map(lambda b: b.name, binders) )
+	return tuple( filter(lambda v: v.name not in binder_names, scope_vars) )
+
 def contains_var(term_var, context):
 	for elem in context:
 		if term_var.name == elem.name:
@@ -0,0 +1,169 @@
+'''
+This file is part of MSR Ensemble (MSRE-X).
+
+MSRE-X is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+MSRE-X is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with MSRE-X. If not, see <http://www.gnu.org/licenses/>.
+
+MSR Ensemble (MSRE-X) Version 0.5, Prototype Alpha
+
+Authors:
+Edmund S. L. Lam      sllam@qatar.cmu.edu
+Iliano Cervesato      iliano@cmu.edu
+
+* This implementation was made possible by an NPRP grant (NPRP 09-667-1-100, Effective Programming 
+for Large Distributed Ensembles) from the Qatar National Research Fund (a member of the Qatar 
+Foundation). The statements made herein are solely the responsibility of the authors.
+'''
+
+import sys
+
+from StringIO import StringIO
+
+import msrex.misc.visit as visit
+import msrex.misc.parallel as parallel
+import msrex.frontend.analyze.checkers.base_checker as base_checker
+
+# Runs a pipeline of checkers, stopping at the first checker that reports errors.
+#
+# With several jobs (see msrex.misc.parallel), checkers that do not annotate the AST, and do not depend
+# on checkers that do, run in forked workers. Checkers that annotate the AST run in the compiler
+# process, as soon as the checkers they depend on have passed. Results are merged in the order of the
+# pipeline, so that error reports (and their error indices), analyses, outputs and early exits are those
+# of a sequential run. Checkers after the first failing one may have run, but their results are discarded.
+
+class CheckerScheduler:
+
+	def __init__(self, checkers, decs, source_text, builtin_preds=[]):
+		self.checkers = checkers
+		self.decs = decs
+		self.source_text = source_text
+		self.builtin_preds = builtin_preds
+
+	def run(self):
+		if parallel.is_parallel():
+			return self.run_parallel()
+		else:
+			return self.run_sequential()
+
+	def run_sequential(self):
+		reports = []
+		analysis = []
+		data = {}
+		for checker in self.checkers:
+			visit.enter_pass( checker.__name__ )
+			result = run_checker(checker, self.decs, self.source_text, self.builtin_preds)
+			reports += result['reports']
+			self.merge_analysis(result, analysis, data)
+			if len(reports) > 0:
+				break
+		return (reports,analysis,data)
+
+	def deps(self, checker):
+		return filter(lambda dep: dep in self.checkers, checker.depends_on)
+
+	def in_worker(self, checker):
+		return not checker.annotates_ast and all(map(lambda dep: not dep.annotates_ast, self.deps(checker)))
+
+	def run_parallel(self):
+		base_error_idx = base_checker.ERROR_IDX
+		forked = filter(lambda checker: self.in_worker(checker), self.checkers)
+		pool = None
+		results = {}
+		try:
+			if len(forked) > 0:
+				pool = parallel.fork_pool( (self.decs,self.source_text,self.builtin_preds), len(forked) )
+				for checker in forked:
+					results[checker] = pool.apply_async(parallel.call_with_state, ((run_forked_checker,checker),))
+			failed = False
+			for checker in self.checkers:
+				if checker in forked:
+					continue
+				if failed or not self.passed(self.deps(checker), results):
+					results[checker] = None
+					continue
+				visit.enter_pass( checker.__name__ )
+				results[checker] = run_captured_checker(checker, self.decs, self.source_text, self.builtin_preds)
+				failed = not succeeded( results[checker] )
+			return self.merge(results, base_error_idx)
+		finally:
+			if pool != None:
+				pool.terminate()
+				pool.join()
+
+	def passed(self, checkers, results):
+		return all(map(lambda checker: succeeded( get_result(results[checker]) ), checkers))
+
+	def merge(self, results, base_error_idx):
+		reports = []
+		analysis = []
+		data = {}
+		error_idx = base_error_idx
+		for checker in self.checkers:
+			(output,result,error) = get_result( results[checker] )
+			sys.stdout.write( output )
+			if error != None:
+				if isinstance(error, tuple):
+					raise error[0], error[1], error[2]
+				raise error
+			reports += result['reports']
+			self.merge_analysis(result, analysis, data)
+			error_idx = result['error_idx']
+			if len(reports) > 0:
+				break
+		base_checker.ERROR_IDX = error_idx
+		return (reports,analysis,data)
+
+	def merge_analysis(self, result, analysis, data):
+		if result['analysis'] != None:
+			analysis.append( result['analysis'] )
+		if result['analysis_data'] != None:
+			data[result['analysis_name']] = result['analysis_data']
+
+# Results of checkers run in the compiler process are triples (output,result,error), results of forked
+# checkers are async results of their pool.
+def get_result(result):
+	if isinstance(result, tuple):
+		return result
+	else:
+		return result.get()
+
+def succeeded((output,result,error)):
+	return error == None and len(result['reports']) == 0
+
+def run_checker(checker, decs, source_text, builtin_preds):
+	c = checker(decs,source_text,builtin_preds=builtin_preds)
+	c.check()
+	c.init_build_display_regions()
+	return { 'reports'       : c.get_error_reports()
+               , 'analysis'      : c.get_analysis()
+               , 'analysis_name' : c.get_analysis_name()
+               , 'analysis_data' : c.get_analysis_data()
+               , 'error_idx'     : base_checker.ERROR_IDX }
+
+# Runs a checker, capturing what it prints, so that it can be replayed in the order of the pipeline.
+# Failures are returned as the exception info (or the exception, if run in a forked worker).
+def run_captured_checker(checker, decs, source_text, builtin_preds, forked=False):
+	stdout = sys.stdout
+	sys.stdout = StringIO()
+	try:
+		try:
+			result = run_checker(checker, decs, source_text, builtin_preds)
+			return (sys.stdout.getvalue(),result,None)
+		except Exception, e:
+			error = e if forked else sys.exc_info()
+			return (sys.stdout.getvalue(),None,error)
+	finally:
+		sys.stdout = stdout
+
+def run_forked_checker((decs,source_text,builtin_preds), checker):
+	return run_captured_checker(checker, decs, source_text, builtin_preds, forked=True)
@@ -0,0 +1,151 @@
+'''
+This file is part of MSR Ensemble (MSRE-X).
+
+MSRE-X is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+MSRE-X is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with MSRE-X. If not, see <http://www.gnu.org/licenses/>.
+
+MSR Ensemble (MSRE-X) Version 0.5, Prototype Alpha
+
+Authors:
+Edmund S. L. Lam      sllam@qatar.cmu.edu
+Iliano Cervesato      iliano@cmu.edu
+
+* This implementation was made possible by an NPRP grant (NPRP 09-667-1-100, Effective Programming 
+for Large Distributed Ensembles) from the Qatar National Research Fund (a member of the Qatar 
+Foundation). The statements made herein are solely the responsibility of the authors.
+'''
+
+import os
+import sys
+import hashlib
+import cPickle as pickle
+
+import msrex.misc.visit as visit
+
+# On-disk compilation cache. Entries are pickled objects, stored under a directory per kind of entry
+# ('prog' for whole front end outputs, 'rule' for rule compilations, 'cpp' for generated files) and
+# keyed by a hash of their inputs and of the compiler version.
+
+CACHE_DIR_ENV = "MSRE_CACHE_DIR"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".msre_cache")
+
+# Pickling ASTs, rules and join orderings recurses deeply
+PICKLE_RECURSION_LIMIT = 20000
+
+COMPILER_VERSION = None
+
+# Version of the compiler: hash of its source files, so that any change to the compiler invalidates the cache.
+def compiler_version():
+	global COMPILER_VERSION
+	if COMPILER_VERSION == None:
+		msrex_dir = os.path.dirname( os.path.dirname( os.path.abspath(__file__) ) )
+		h = hashlib.sha1()
+		for (dir_path,dir_names,file_names) in sorted( os.walk(msrex_dir) ):
+			dir_names.sort()
+			for file_name in sorted(file_names):
+				if file_name.endswith(".py"):
+					h.update( os.path.relpath(os.path.join(dir_path,file_name), msrex_dir) )
+					h.update( open(os.path.join(dir_path,file_name)).read() )
+		COMPILER_VERSION = h.hexdigest()
+	return COMPILER_VERSION
+
+def builtin_preds_signature(builtin_preds):
+	return map(lambda bp: (bp.name,str(bp.type),bp.act_name,bp.role), builtin_preds)
+
+class CompilationCache:
+
+	def __init__(self, cache_dir=None):
+		if cache_dir == None:
+			cache_dir = os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR)
+		self.cache_dir = cache_dir
+		self.hits   = 0
+		self.misses = 0
+
+	def key(self, *parts):
+		h = hashlib.sha1( compiler_version() )
+		for part in parts:
+			h.update( "|%s" % (part,) )
+		return h.hexdigest()
+
+	def entry_path(self, kind, key):
+		return os.path.join(self.cache_dir, kind, "%s.pickle" % key)
+
+	def load(self, kind, key):
+		path = self.entry_path(kind, key)
+		if not os.path.exists(path):
+			self.misses += 1
+			return None
+		limit = sys.getrecursionlimit()
+		sys.setrecursionlimit( max(limit, PICKLE_RECURSION_LIMIT) )
+		try:
+			obj = pickle.load( open(path, 'rb') )
+		except Exception:
+			# Stale or corrupted entry, treat as a miss
+			self.misses += 1
+			return None
+		finally:
+			sys.setrecursionlimit( limit )
+		self.hits += 1
+		return obj
+
+	# Stores an entry. Returns false if the object could not be stored, in which case the cache is
+	# simply not used for it.
+	def store(self, kind, key, obj):
+		path = self.entry_path(kind, key)
+		limit = sys.getrecursionlimit()
+		sys.setrecursionlimit( max(limit, PICKLE_RECURSION_LIMIT) )
+		try:
+			data = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+		except Exception:
+			return False
+		finally:
+			sys.setrecursionlimit( limit )
+		try:
+			if not os.path.exists( os.path.dirname(path) ):
+				os.makedirs( os.path.dirname(path) )
+			# Write and rename, so that concurrent compilations never see partial entries
+			tmp_path = "%s.%s.tmp" % (path, os.getpid())
+			tmp_file = open(tmp_path, 'wb')
+			tmp_file.write( data )
+			tmp_file.close()
+			os.rename(tmp_path, path)
+		except (IOError,OSError):
+			return False
+		return True
+
+# Generates the C++ codes of a front end output, reusing the generated files of a previous identical
+# compilation if there is one. Returns the names of the generated files. Restored files are only
+# rewritten if their contents changed, so that split builds (see CPPCodeGenerator.generate_units)
+# remain incremental. Split outputs embed a digest of the runtime headers, which is part of their key.
+def generate_cpp(output, cache=None, binary_facts=False, split=False):
+	from msrex.frontend.code.code_generator import CPPCodeGenerator, write_if_changed, runtime_include_dir, runtime_headers_digest
+	prog = output['prog']
+	key = None
+	if cache != None and 'cache_key' in output:
+		runtime_digest = runtime_headers_digest( runtime_include_dir() ) if split else None
+		key = cache.key( output['cache_key'], binary_facts, split, runtime_digest )
+		gen_files = cache.load('cpp', key)
+		if gen_files != None:
+			for (file_name,contents) in gen_files:
+				if os.path.dirname(file_name) != "" and not os.path.exists( os.path.dirname(file_name) ):
+					os.makedirs( os.path.dirname(file_name) )
+				write_if_changed(file_name, contents)
+			return map(lambda (file_name,_): file_name, gen_files)
+	visit.enter_pass( "CPPCodeGenerator" )
+	cpp_gen = CPPCodeGenerator(prog, prog.fact_dir, output['data'], binary_facts=binary_facts, split=split)
+	cpp_gen.generate()
+	file_names = cpp_gen.file_names + cpp_gen.fact_file_names.values()
+	if key != None:
+		cache.store('cpp', key, map(lambda file_name: (file_name,open(file_name, 'rb').read()), file_names))
+	return file_names
+
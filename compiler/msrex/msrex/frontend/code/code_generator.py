@@ -26,6 +26,9 @@ for Large Distributed Ensembles) from the Qatar National Research Fund (a member
 Foundation). The statements made herein are solely the responsibility of the authors.
 '''
 
+import os
+import hashlib
+
 from string import split
 
 import msrex.frontend.lex_parse.ast as ast
@@ -36,9 +39,13 @@ from msrex.frontend.analyze.inspectors import Inspector
 import msrex.frontend.compile.join_ordering as join
 
 from msrex.frontend.compile.lookup_context import HASH_LK, MEM_LK, ORD_LK, LOC_HASH_LK, LINEAR_LK, LookupTables
+from msrex.frontend.compile.lookup_context import ORD_LEQ, ORD_GEQ, ORD_LT, ORD_GT
 from msrex.frontend.compile.prog_compilation import ProgCompilation
 
+from msrex.frontend.code.fact_file import FactFileWriter, encodable_types
+
 import msrex.misc.visit as visit
+import msrex.misc.parallel as parallel
 from msrex.misc.template import compile_template, template, compact
 
 BASE_IMPORT_LIST = template('''
@@ -61,11 +68,13 @@ BASE_IMPORT_LIST = template('''
 	#include \"msre/fact.h\"
 	#include \"msre/comm.h\"
 	#include \"msre/store.h\"
+	#include \"msre/pool.h\"
 	#include \"msre/goals.h\"
 	#include \"msre/rewrite.h\"
 	#include \"msre/directory.h\"
 	#include \"msre/logger.h\"			
 	#include \"msre/hash.h\"
+	#include \"msre/fact_file.h\"
 
 	using namespace std;
 	using namespace boost;
@@ -119,7 +128,73 @@ BOILER_PLATE_CODES = template('''
 	}
 ''')
 
-PRIME_NUMBERS = [7919,13259,31547,53173,72577,91099,103421,224737,350377,499979]
+# Split mode (see CPPCodeGenerator.generate_units)
+
+RUNTIME_HEADER_NAME = "msre_runtime.h"
+
+# Directory of the MSRE runtime headers (msre_config.h and msre/*.h) in split mode builds, taken from
+# this environment variable (set by the msre script), or else the current directory.
+MSRE_INCLUDE_ENV = 'MSRE_INCLUDE'
+
+def runtime_include_dir():
+	return os.path.abspath( os.environ.get(MSRE_INCLUDE_ENV, '.') )
+
+# Digest of the names and contents of the runtime headers in include_dir. Raises IOError if there are none,
+# as split builds would then be keyed on nothing of the runtime.
+def runtime_headers_digest(include_dir):
+	msre_dir = os.path.join(include_dir, 'msre')
+	header_names = ['msre_config.h']
+	if os.path.isdir(msre_dir):
+		header_names += map(lambda h: os.path.join('msre', h), sorted(filter(lambda h: h.endswith('.h'), os.listdir(msre_dir))))
+	header_names = filter(lambda h: os.path.isfile(os.path.join(include_dir, h)), header_names)
+	if len(header_names) == 0:
+		raise IOError("No MSRE runtime headers in %s: set %s to the runtime directory" % (include_dir,MSRE_INCLUDE_ENV))
+	digest = hashlib.sha1()
+	for header_name in header_names:
+		digest.update( header_name )
+		digest.update( open(os.path.join(include_dir, header_name), 'rb').read() )
+	return digest.hexdigest()
+
+RUNTIME_HEADER_CODES = template('''
+	#ifndef MSRE_RUNTIME_H
+	#define MSRE_RUNTIME_H
+
+	// Runtime headers digest: {| runtime_digest |}
+
+	{| base_macro_list |}
+
+	{| base_import_list |}
+
+	#endif /* MSRE_RUNTIME_H */
+''')
+
+ENSEM_HEADER_CODES = template('''
+	#ifndef {| header_guard |}
+	#define {| header_guard |}
+
+	#include "{| runtime_header_name |}"
+
+	{| '\\n'.join( extern_import_list ) |}
+
+	{| '\\n'.join( ensem_classes ) |}
+
+	#endif /* {| header_guard |} */
+''')
+
+UNIT_CODES = template('''
+	#include "{| runtime_header_name |}"
+	#include "{| ensem_header_name |}"
+
+	{| unit_codes |}
+''')
+
+def write_if_changed(file_name, contents):
+	if os.path.exists(file_name) and open(file_name, 'rb').read() == contents:
+		return False
+	output = open(file_name, 'wb')
+	output.write( contents )
+	output.close()
+	return True
 
 def mk_ensem_name( name ):
 	ensem_name = ""
@@ -154,8 +229,14 @@ def req_collision_check(idx_var_eq):
 
 class CPPCodeGenerator:
 
-	def __init__(self, prog, fact_dir, extract_data):
+	def __init__(self, prog, fact_dir, extract_data, binary_facts=False, split=False):
 		self.prog = prog
+		self.binary_facts = binary_facts
+		self.split = split
+		self.fact_file_names = {}
+		self.file_names = []
+		self.unit_names = []
+		self.unit_codes = {}
 		self.rule_names = prog.getRuleNames()
 		self.fact_dir = fact_dir
 		self.lookup_tables = prog.lookup_tables
@@ -203,29 +284,51 @@ class CPPCodeGenerator:
 			for fact_store in fact_stores:
 				store_idx = fact_store.lookup_idx
 				store_name = "%s_store_%s" % ( mk_cpp_var_name(fact_name) ,store_idx)
-				# print "Ho ho ho: %s" % fact_store.type
-				if fact_store.type == LINEAR_LK:
-					store_type = "ListStore<%s>" % fact_name
+				fact_arg_names  = [fact_info['loc_name']] + fact_info['arg_names']
+				fact_type_codes = [fact_info['loc_type']] + fact_info['type_codes']
+				idx_codes = []
+				for idx in fact_store.lookupArgIndices():
+					idx_codes.append( { 'idx':idx, 'arg_name':fact_arg_names[idx], 'type_code':fact_type_codes[idx] } )			
+
+				# Hash stores are keyed by the exact values of the index arguments
+				if len(idx_codes) == 0:
+					key_type = "int"
+				elif len(idx_codes) == 1:
+					key_type = idx_codes[0]['type_code']
+				else:
+					key_type = "tuple<%s>" % ','.join(map(lambda i: i['type_code'], idx_codes))
+
+				ord_idx_code = None
+				columnar = False
+				if fact_store.type == LINEAR_LK and fact_info['persistent'] and fact_info['local'] \
+                                   and self.lookup_tables.is_joined_linear_lookup(fact_idx, store_idx):
+					# Persistent facts are only appended and scanned, so they are stored by columns
+					store_type = "%sColumnStore" % fact_name
+					iter_type  = "ColumnIter<%s>" % fact_name
+					has_index  = False
+					columnar   = True
+				elif fact_store.type == LINEAR_LK:
+					store_type = "ListStore<%s,MSRE_PURGE_POLICY>" % fact_name
 					iter_type  = "ListIter<%s>" % fact_name
 					has_index  = False
 				elif fact_store.type == HASH_LK or fact_store.type == LOC_HASH_LK:
-					store_type = "MultimapStore<%s>" % fact_name
-					iter_type  = "MultimapIter<%s>" % fact_name
+					store_type = "MultimapStore<%s,%s,MSRE_PURGE_POLICY>" % (fact_name,key_type)
+					iter_type  = "MultimapIter<%s,%s>" % (fact_name,key_type)
+					has_index  = True
+				elif fact_store.type == ORD_LK:
+					ord_idx = fact_store.ordArgIndex()
+					ord_idx_code = { 'idx':ord_idx, 'arg_name':fact_arg_names[ord_idx], 'type_code':fact_type_codes[ord_idx] }
+					store_type = "OrdMapStore<%s,%s,%s,MSRE_PURGE_POLICY>" % (fact_name,key_type,ord_idx_code['type_code'])
+					iter_type  = "OrdIter<%s,%s>" % (fact_name,ord_idx_code['type_code'])
 					has_index  = True
 				else:
-					print "Hahah"
-					# TODO
-					pass
-				fact_arg_names  = [fact_info['loc_name']] + fact_info['arg_names']
-				fact_type_codes = [fact_info['loc_type']] + fact_info['type_codes']
+					# Mem lookups are not scheduled by the lookup context (see LookupContext.lookupOptions)
+					raise TypeError("No store implementation for lookup %s" % fact_store)
 				idx_func_name = "index%s%s" % (store_idx,fact_name)
-
-				idx_codes = []
-				for idx in fact_store.lookupArgIndices():
-					idx_codes.append( { 'idx':idx, 'arg_name':fact_arg_names[idx], 'type_code':fact_type_codes[idx] } )			
 	
 				store_info = { 'name':store_name, 'type':store_type, 'iter':iter_type, 'idx_func':idx_func_name, 'sort':fact_store.type
-		                             , 'idx':idx_codes, 'collision_free':len(idx_codes)<=1, 'has_index':has_index, 'store_idx':store_idx }
+		                             , 'idx':idx_codes, 'collision_free':True, 'has_index':has_index, 'store_idx':store_idx
+		                             , 'ord_idx':ord_idx_code, 'key_type':key_type, 'columnar':columnar }
 
 				if fact_idx in self.store_dict:
 					self.store_dict[fact_idx].append( store_info )
@@ -265,7 +368,10 @@ class CPPCodeGenerator:
 		if len(exec_decs) > 0:
 			exec_call_codes = []
 			for idx in range(0,len(exec_decs)):
-				exec_call_codes.append( "execute_%s(argv[1]);" % idx )
+				if idx in self.fact_file_names:
+					exec_call_codes.append( "execute_%s(argv[1], argc > 2 ? argv[2] : \"%s\");" % (idx,self.fact_file_names[idx]) )
+				else:
+					exec_call_codes.append( "execute_%s(argv[1]);" % idx )
 			main_codes = compile_template( template('''
 			int main(int argc, char* argv[]) { 
 
@@ -293,12 +399,94 @@ class CPPCodeGenerator:
 			{| main_codes |}
 		''')		
 		
-		file_name = "%s.cpp" % prog_name
-
-		output = open(file_name, 'w')
-		output.write( compile_template(ensem_code, base_import_list=BASE_IMPORT_LIST, base_macro_list=base_marco_list
-                                              ,extern_import_list=extern_import_list, ensem_classes=ensem_classes, exec_codes=exec_codes
-                                              ,main_codes=main_codes) )
+		if self.split:
+			self.generate_units(prog_name, base_marco_list, extern_import_list, ensem_classes, exec_codes, main_codes)
+		else:
+			file_name = "%s.cpp" % prog_name
+
+			output = open(file_name, 'w')
+			output.write( compile_template(ensem_code, base_import_list=BASE_IMPORT_LIST, base_macro_list=base_marco_list
+                                                      ,extern_import_list=extern_import_list, ensem_classes=ensem_classes, exec_codes=exec_codes
+                                                      ,main_codes=main_codes) )
+			output.close()
+			self.file_names.append( file_name )
+
+	# Split mode: writes the C++ codes to <prog>_cpp/, as
+	#    - msre_runtime.h, the MSRE runtime headers, precompiled by the build,
+	#    - <prog>.h, the ensemble class, with the members of join orderings and facts only declared,
+	#    - a translation unit per rule (rule_<name>.cpp) and per predicate (pred_<name>.cpp), defining
+	#      these members, and main.cpp, with the execute codes and main,
+	#    - a Makefile, for parallel incremental builds (make -j).
+	# Objects are named after a digest of the contents of their unit and of the headers, including the runtime
+	# headers under MSRE_INCLUDE, so that units that have not changed are never recompiled. Files are only
+	# rewritten if their contents changed, and objects of previous versions of the units are removed.
+	def generate_units(self, prog_name, base_macro_list, extern_import_list, ensem_classes, exec_codes, main_codes):
+		dir_name = "%s_cpp" % prog_name
+		if not os.path.exists(dir_name):
+			os.makedirs(dir_name)
+
+		ensem_header_name = "%s.h" % prog_name
+		header_guard = "MSRE_%s_H" % ''.join(map(lambda c: c if c.isalnum() else '_', prog_name.upper()))
+		include_dir = runtime_include_dir()
+		runtime_digest = runtime_headers_digest( include_dir )
+		runtime_header = compile_template(RUNTIME_HEADER_CODES, runtime_digest=runtime_digest, base_macro_list=base_macro_list
+                                                 ,base_import_list=BASE_IMPORT_LIST)
+		ensem_header = compile_template(ENSEM_HEADER_CODES, header_guard=header_guard, runtime_header_name=RUNTIME_HEADER_NAME
+                                               ,extern_import_list=extern_import_list, ensem_classes=ensem_classes)
+		headers = [(RUNTIME_HEADER_NAME,runtime_header),(ensem_header_name,ensem_header)]
+
+		units = map(lambda unit_name: (unit_name,'\n'.join(self.unit_codes[unit_name])), self.unit_names)
+		units.append( ("main",'\n\n'.join(exec_codes + [main_codes])) )
+		unit_files = []
+		header_digest = hashlib.sha1( runtime_header + ensem_header ).hexdigest()
+		for (unit_name,unit_codes) in units:
+			unit_file = compile_template(UNIT_CODES, runtime_header_name=RUNTIME_HEADER_NAME, ensem_header_name=ensem_header_name
+                                                    ,unit_codes=unit_codes)
+			obj_digest = hashlib.sha1( header_digest + unit_file ).hexdigest()[:16]
+			unit_files.append( ("%s.cpp" % unit_name,unit_file,"obj/%s-%s.o" % (unit_name,obj_digest)) )
+
+		makefile = self.generate_makefile(prog_name, ensem_header_name, unit_files, include_dir)
+
+		for (file_name,contents) in headers + map(lambda (f,c,_): (f,c), unit_files) + [("Makefile",makefile)]:
+			write_if_changed(os.path.join(dir_name, file_name), contents)
+			self.file_names.append( os.path.join(dir_name, file_name) )
+
+		obj_dir = os.path.join(dir_name, "obj")
+		if os.path.isdir(obj_dir):
+			obj_names = map(lambda (_,__,obj_name): os.path.basename(obj_name), unit_files)
+			for file_name in os.listdir(obj_dir):
+				if file_name.endswith(".o") and file_name not in obj_names:
+					os.remove( os.path.join(obj_dir, file_name) )
+
+	def generate_makefile(self, prog_name, ensem_header_name, unit_files, include_dir):
+		pch_name = "%s.gch" % RUNTIME_HEADER_NAME
+		lines  = [ "# Generated by MSRE. Objects are named after the contents of their sources, so that only"
+                         , "# units that changed are recompiled. Run 'make clean' after changing the flags below."
+                         , ""
+                         , "CXX = mpiCC"
+                         , "MSRE_INCLUDE = %s" % include_dir
+                         , "CXXFLAGS = -I$(MSRE_INCLUDE)"
+                         , "RUNTIME_HEADERS = $(wildcard $(MSRE_INCLUDE)/msre_config.h $(MSRE_INCLUDE)/msre/*.h)"
+                         , "LDLIBS = -lboost_mpi -lboost_serialization"
+                         , ""
+                         , "OBJS = %s" % ' '.join( map(lambda (_,__,obj_name): obj_name, unit_files) )
+                         , ""
+                         , "%s: $(OBJS) Makefile" % prog_name
+                         , "\t$(CXX) $(CXXFLAGS) $(OBJS) $(LDLIBS) -o %s" % prog_name
+                         , ""
+                         , "%s: %s $(RUNTIME_HEADERS)" % (pch_name,RUNTIME_HEADER_NAME)
+                         , "\t$(CXX) $(CXXFLAGS) -x c++-header -c %s -o %s" % (RUNTIME_HEADER_NAME,pch_name)
+                         , "" ]
+		for (unit_file_name,_,obj_name) in unit_files:
+			lines += [ "%s: $(RUNTIME_HEADERS) | %s %s %s" % (obj_name,unit_file_name,ensem_header_name,pch_name)
+                                 , "\t@mkdir -p obj"
+                                 , "\t$(CXX) $(CXXFLAGS) -c %s -o %s" % (unit_file_name,obj_name)
+                                 , "" ]
+		lines += [ "clean:"
+                         , "\trm -rf obj %s %s" % (pch_name,prog_name)
+                         , ""
+                         , ".PHONY: clean" ]
+		return '\n'.join( lines ) + '\n'
 
 	def generate_extern_import(self, extern_dec):
 		extern_import_codes = template('''
@@ -322,6 +510,8 @@ class CPPCodeGenerator:
 		return arg_contexts,fact_args
 
 	def generate_exec(self, exec_dec, idx):
+		if self.binary_facts:
+			return self.generate_binary_exec(exec_dec, idx)
 
 		ensem_name = mk_ensem_name( exec_dec.name )
 		inspect = Inspector()
@@ -359,6 +549,86 @@ class CPPCodeGenerator:
 		return compact( compile_template( exec_codes, idx=idx, ensem_name=ensem_name, exist_codes=exist_codes
                                                 , rest_codes=rest_codes ) )
 
+	# Generates an execute function that loads ground initial facts and location nodes from a binary
+	# fact file (written here, or given at runtime), instead of inlining them as C++ statements. 
+	# Only facts that are not ground (or have arguments of unsupported types) remain inlined.
+	def generate_binary_exec(self, exec_dec, idx):
+
+		ensem_name = mk_ensem_name( exec_dec.name )
+		inspect = Inspector()
+		cpp_type_coerce = CPPTypeCoercion()
+		exist_decs = inspect.filter_decs(exec_dec.decs, exist=True)
+		rest_decs  = inspect.filter_decs(exec_dec.decs, loc_facts=True, assign=True)
+
+		idx_dict = { 'loc':0, 'compre':0 }
+		writer = FactFileWriter()
+
+		loc_ids = {}
+		other_exist_vars = []
+		for exist_dec in exist_decs:
+			for exist_var in exist_dec.exist_vars:
+				if exist_var.type.name == ast.LOC:
+					loc_ids[exist_var.name] = idx_dict['loc']
+					writer.add_node(idx_dict['loc'], exist_var.name)
+					idx_dict['loc'] += 1
+				else:
+					other_exist_vars.append( exist_var )
+
+		inline_decs = []
+		inline_vars = []
+		for rest_dec in rest_decs:
+			if rest_dec.dec_type == ast.DEC_LOCFACT:
+				inline_facts = []
+				for loc_fact in rest_dec.loc_facts:
+					if loc_fact.fact_type == ast.FACT_LOC:
+						fact_idx,_ = self.fact_dir.getFactFromName( loc_fact.fact.name )
+						if writer.add_fact(fact_idx, loc_fact, self.fact_dict[fact_idx]['types'], loc_ids):
+							continue
+					inline_facts.append( loc_fact )
+				if len(inline_facts) > 0:
+					inline_decs.append( ast.LocFactDec(inline_facts) )
+					inline_vars += inspect.free_vars( inline_facts )
+			else:
+				inline_decs.append( rest_dec )
+				inline_vars += inspect.free_vars( rest_dec.builtin_exp )
+
+		# Location variables still referred to by inlined codes
+		exist_codes = []
+		for loc_name in sorted( set( map(lambda v: v.name, inline_vars) ) & set( loc_ids.keys() ) ):
+			exist_codes.append( "int %s = %s;" % (mk_cpp_var_name(loc_name),loc_ids[loc_name]) )
+		if len(other_exist_vars) > 0:
+			exist_codes.append( self.generate_exec_stmt(ast.ExistDec(other_exist_vars), inspect, cpp_type_coerce, idx_dict) )
+
+		rest_codes = []
+		for inline_dec in inline_decs:
+			rest_codes.append( self.generate_exec_stmt(inline_dec, inspect, cpp_type_coerce, idx_dict) )
+
+		fact_file_name = "%s_%s.facts" % (self.prog.prog_name,idx)
+		writer.write( fact_file_name )
+		self.fact_file_names[idx] = fact_file_name
+
+		exec_codes = template('''
+			void execute_{| idx |}(string filename, string fact_file_name) {
+				{| ensem_name |} en = {| ensem_name |}();
+				FactFile facts(fact_file_name);
+				facts.reg_nodes(en);
+
+				{| '\\n'.join( exist_codes ) |}
+
+				en.init();
+				en.load_facts(facts);
+				facts.close();
+
+				{| '\\n'.join( rest_codes ) |}
+
+				en.run_stat(filename);
+				en.close();
+			}
+		''')
+
+		return compact( compile_template( exec_codes, idx=idx, ensem_name=ensem_name, exist_codes=exist_codes
+                                                , rest_codes=rest_codes ) )
+
 	@visit.on( 'dec' )
 	def generate_exec_stmt(self, dec, inspect, cpp_type_coerce, idx_dict):
 		pass
@@ -495,6 +765,7 @@ class CPPCodeGenerator:
 		fact_dec_codes = map(lambda fact_idx: self.generate_fact_decs(ensem_name, fact_idx), self.fact_dict)
 
 		index_dec_codes = self.generate_store_index_decs(ensem_name)
+		column_store_decs = self.generate_column_store_decs(ensem_name)
 		const_pred_id_decs = map(lambda (fact_idx,fact_info): "const static int %s_pred_id = %s;" % (fact_info['var_name'],fact_idx) 
                                         ,self.fact_dict.items() )
 		fact_comm_decs = map(lambda (fact_idx,fact_info): "MSRE_MPICOMM_INSTANCE<%s> %s_comm;" % (fact_info['fact_name'],fact_info['var_name'])
@@ -507,14 +778,22 @@ class CPPCodeGenerator:
 		constructor_codes    = self.generate_constructor( ensem_name )
 		fact_member_codes    = self.generate_fact_members( ensem_name )
 		receive_member_codes = self.generate_receive_member( ensem_name )
+		if self.binary_facts:
+			load_member_codes = self.generate_load_facts_member( ensem_name )
+		else:
+			load_member_codes = ""
 
-		join_exec_member_codes = []
+		join_ordering_members = []
 		for fact_idx,join_orderings in self.prog.pred_rule_compilations.items():
 			for i in range(0,len(join_orderings)):
-				join_ordering = join_orderings[i]
-				join_exec_member_codes.append( self.generate_join_ordering_member( ensem_name, join_ordering, i+1 ) )
+				join_ordering_members.append( (join_orderings[i], i+1) )
+		join_exec_member_codes = self.generate_join_ordering_members( ensem_name, join_ordering_members )
+
+		fact_exec_member_codes = map(lambda fact_idx: self.generate_fact_member(fact_idx, ensem_name=ensem_name), self.fact_dict.keys())
 
-		fact_exec_member_codes = map(lambda fact_idx: self.generate_fact_member(fact_idx), self.fact_dict.keys())
+		if self.split:
+			join_exec_member_codes = self.split_join_ordering_members( join_ordering_members, join_exec_member_codes )
+			fact_exec_member_codes = self.split_fact_members( fact_exec_member_codes )
 
 		spec_code = template('''
 			{| '\\n'.join( extern_imports ) |}
@@ -530,6 +809,8 @@ class CPPCodeGenerator:
 
 				{| index_dec_codes |}
 
+				{| '\\n'.join( column_store_decs ) |}
+
 				{| '\\n'.join( const_pred_id_decs ) |}
 				
 				const mpi::communicator world;
@@ -552,6 +833,8 @@ class CPPCodeGenerator:
 
 				{| receive_member_codes |}
 
+				{| load_member_codes |}
+
 				{| fact_member_codes |}
 
 				{| '\\n'.join( join_exec_member_codes ) |}
@@ -562,11 +845,39 @@ class CPPCodeGenerator:
 		''')
 		
 		return compile_template( spec_code, ensem_name=ensem_name, extern_imports=extern_imports, fact_dec_codes=fact_dec_codes, index_dec_codes=index_dec_codes 
+                                       , column_store_decs=column_store_decs
                                        , const_pred_id_decs=const_pred_id_decs, fact_comm_decs=fact_comm_decs, rule_app_counter_decs=rule_app_counter_decs
                                        , store_dec_codes=store_dec_codes, constructor_codes=constructor_codes, boiler_plate_codes=BOILER_PLATE_CODES 
-                                       , receive_member_codes=receive_member_codes, fact_member_codes=fact_member_codes
+                                       , receive_member_codes=receive_member_codes, load_member_codes=load_member_codes, fact_member_codes=fact_member_codes
                                        , join_exec_member_codes=join_exec_member_codes, fact_exec_member_codes=fact_exec_member_codes)
 
+	# Moves the definitions of the join ordering members to the translation units of their rules, in
+	# order of appearance. Returns the declarations of the members.
+	def split_join_ordering_members(self, join_ordering_members, member_codes):
+		member_decs = []
+		for ((join_ordering,join_idx),member_code) in zip(join_ordering_members, member_codes):
+			unit_name = "rule_%s" % join_ordering.rule.rule.name
+			if unit_name not in self.unit_codes:
+				self.unit_codes[unit_name] = []
+				self.unit_names.append( unit_name )
+			self.unit_codes[unit_name].append( member_code )
+			fact_type = self.fact_dict[join_ordering.fact_idx]['fact_name']
+			member_decs.append( self.generate_member_dec("private: bool", self.join_ordering_member_name(join_ordering, join_idx)
+                                                                    ,"%s* act" % fact_type) )
+		return member_decs
+
+	# Moves the definitions of the fact members to the translation units of their predicates. Returns the
+	# declarations of the members.
+	def split_fact_members(self, member_codes):
+		member_decs = []
+		for (fact_idx,member_code) in zip(self.fact_dict.keys(), member_codes):
+			fact_info = self.fact_dict[fact_idx]
+			unit_name = "pred_%s" % fact_info['var_name']
+			self.unit_codes[unit_name] = [member_code]
+			self.unit_names.append( unit_name )
+			member_decs.append( self.generate_member_dec("private: void", "execute", "%s* %s" % (fact_info['fact_name'],fact_info['var_name'])) )
+		return member_decs
+
 	def generate_fact_decs(self, ensem_name, fact_idx):
 
 		fact_info = self.fact_dict[fact_idx]
@@ -580,6 +891,7 @@ class CPPCodeGenerator:
 		for (arg_name,type_code) in zip(fact_info['arg_names'],fact_info['type_codes']):
 			arg_dec_codes.append( "%s %s;" % (type_code,arg_name) )	
 		arg_dec_codes.append( "bool alive;" )
+		arg_dec_codes.append( "int refs;" )
 		# arg_dec_codes.append( "bool monotone;" )
 
 		# if not fact_info['persistent']:
@@ -593,6 +905,8 @@ class CPPCodeGenerator:
 			init_codes.append( "%s(a%s)" % (arg_name,i) )
 		# if not fact_info['persistent']:
 		init_codes.append( "alive(true)" )
+		# Reference of the goal introducing the fact, released once it is executed
+		init_codes.append( "refs(1)" )
 
 		# constructor_args.append( "bool mono" )
 		# init_codes.append( "monotone(mono)" )
@@ -629,8 +943,23 @@ class CPPCodeGenerator:
 			struct {| fact_name |} : Fact {
 				{| '\\n'.join( arg_dec_codes ) |}
 
-				{| fact_name |}() {}
+				{| fact_name |}() : refs(1) {}
 				{| fact_name |}({| ', '.join( constructor_args ) |}) : {| ', '.join( init_codes ) |} {}
+
+				static FactPool<{| fact_name |}>& pool() {
+					static FactPool<{| fact_name |}> fact_pool("{| src_name |}");
+					return fact_pool;
+				}
+
+				void* operator new(size_t size) { return pool().alloc(size); }
+
+				void operator delete(void* p, size_t size) { pool().free(p, size); }
+
+				void retain() { refs++; }
+
+				void release() {
+					if (--refs == 0) { pool().retire(this); }
+				}
 	
 				{| join_ext_cond(',',type_codes,'tuple<','>') |} args() { return {| join_ext_cond(',',arg_name_codes,'make_tuple(',')') |}; }
 
@@ -653,7 +982,10 @@ class CPPCodeGenerator:
 
 				bool is_alive() { return alive; }
 
-				void execute({| ensem_name |}* ensem) { ensem->execute( this ); }
+				void execute({| ensem_name |}* ensem) {
+					ensem->execute( this );
+					release();
+				}
 
 				{| fact_name |}* identity() { return this; }
 
@@ -690,20 +1022,23 @@ class CPPCodeGenerator:
 			fact_info = self.fact_dict[fact_idx]
 			for idx in range(1,len(store_infos)+1):
 				store_info = store_infos[idx-1]
-				if store_info['sort'] == HASH_LK or store_info['sort'] == LOC_HASH_LK:
+				if store_info['sort'] in [HASH_LK,LOC_HASH_LK,ORD_LK]:
 					if len( store_info['idx'] ) > 1:
-						hash_values = map(lambda i: "(msre::hash(%s)*%s)" % (i['arg_name'],PRIME_NUMBERS[i['idx']]) , store_info['idx'])
+						key_value = "make_tuple(%s)" % ','.join(map(lambda i: i['arg_name'], store_info['idx']))
+					elif len( store_info['idx'] ) == 1:
+						key_value = store_info['idx'][0]['arg_name']
 					else:
-						hash_values = [ store_info['idx'][0]['arg_name'] ]
+						# Ordered store without hash index arguments: a single key.
+						key_value = "0"
 					index_func_code = template('''
-						size_t {| idx_func_name |}({| ', '.join( constr_args ) |}) {
-							return {| ' + '.join( hash_values ) |};
+						{| key_type |} {| idx_func_name |}({| ', '.join( constr_args ) |}) {
+							return {| key_value |};
 						}
 					''')
 					constr_args = map(lambda i: "%s %s" % (i['type_code'],i['arg_name']) ,store_info['idx'])
 					index_func_codes.append(
 						compile_template(index_func_code, idx_func_name=store_info['idx_func'], constr_args=constr_args
-                                                                ,hash_values=hash_values)
+                                                                ,key_type=store_info['key_type'], key_value=key_value)
 					)
 		store_codes = template('''
 			{| '\\n'.join( index_func_codes ) |}
@@ -711,6 +1046,33 @@ class CPPCodeGenerator:
 
 		return compact( compile_template(store_codes, index_func_codes=index_func_codes) )
 
+	def generate_column_store_decs(self, ensem_name):
+
+		column_store_codes = []
+		for fact_idx,store_infos in self.store_dict.items():
+			fact_info = self.fact_dict[fact_idx]
+			if len(filter(lambda store_info: store_info['columnar'], store_infos)) == 0:
+				continue
+			fact_name = fact_info['fact_name']
+			var_name  = fact_info['var_name']
+			type_codes = [ fact_info['loc_type'] ] + fact_info['type_codes']
+			arg_names  = [ fact_info['loc_name'] ] + fact_info['arg_names']
+			column_dec_codes = map(lambda (t,a): "vector<%s> %s;" % (t,a), zip(type_codes,arg_names))
+			column_add_codes = map(lambda a: "%s.push_back( (*%s).%s );" % (a,var_name,a), arg_names)
+			column_store_code = template('''
+				struct {| fact_name |}ColumnStore : ColumnStore<{| fact_name |}> {
+					{| '\\n'.join( column_dec_codes ) |}
+
+					void add({| fact_name |}* {| var_name |}) {
+						{| '\\n'.join( column_add_codes ) |}
+						add_fact( {| var_name |} );
+					}
+				};
+			''')
+			column_store_codes.append( compile_template(column_store_code, fact_name=fact_name, var_name=var_name
+                                                                   ,column_dec_codes=column_dec_codes, column_add_codes=column_add_codes) )
+		return column_store_codes
+
 	def generate_constructor(self, ensem_name):
 				
 		rule_app_counter_codes = map(lambda rule_name: "%s_rule_count = 0;" % rule_name, self.rule_names)
@@ -729,11 +1091,16 @@ class CPPCodeGenerator:
 				''')
 				store_init_codes.append( compile_template(store_init_code, store_name=store_info['name'], fact_name=src_name) )
 				store_logger_codes.append( "set_logger_child( &%s,\"%s Store\" );" % (store_info['name'], fact_name) )	
-				if not has_repr:
+				if has_repr:
+					# Facts are logically deleted through the first store of their predicate (see DeleteHead)
+					store_init_codes.append( "%s.share_live_count( &%s );" % (store_info['name'],self.store_dict[fact_idx][0]['name']) )
+				else:
 					repr_init_code = template("set_repr_component( &{| store_name |} );")
 					repr_init_codes.append( compile_template(repr_init_code, store_name=store_info['name']) )
 					has_repr = True
 
+		pool_init_codes = map(lambda fact_info: "set_pool_component( &%s::pool() );" % fact_info['fact_name'], self.fact_dict.values())
+
 		fact_comm_init_codes_1 = []
 		fact_comm_init_codes_2 = []
 		fact_comm_logger_codes = []
@@ -775,6 +1142,8 @@ class CPPCodeGenerator:
 	
 				set_pretty_component( goals );
 
+				{| '\\n'.join( pool_init_codes ) |}
+
 				{| '\\n'.join( store_init_codes ) |}
 
 				{| '\\n'.join( repr_init_codes ) |}
@@ -804,7 +1173,7 @@ class CPPCodeGenerator:
                                        ,store_init_codes=store_init_codes, fact_comm_init_codes_1=fact_comm_init_codes_1, store_logger_codes=store_logger_codes
                                        ,fact_comm_init_codes_2=fact_comm_init_codes_2 , fact_comm_logger_codes=fact_comm_logger_codes 
                                        ,fact_comm_counter_codes=fact_comm_counter_codes, rule_counter_codes=rule_counter_codes
-                                       ,repr_init_codes=repr_init_codes )
+                                       ,repr_init_codes=repr_init_codes, pool_init_codes=pool_init_codes )
 
 	def generate_fact_members(self, ensem_name):
 
@@ -819,7 +1188,12 @@ class CPPCodeGenerator:
 			var_name  = fact_info['var_name']
 			add_to_store_codes = []
 			for store_info in self.store_dict[fact_idx]:
-				if store_info['has_index']:
+				if store_info['ord_idx'] != None:
+					xs = (store_info['name'],var_name,store_info['idx_func']
+                                             ,','.join(map(lambda idx: "(*%s).%s" % (var_name,idx['arg_name']) ,store_info['idx']))
+                                             ,var_name,store_info['ord_idx']['arg_name'] )
+					add_to_store_codes.append( "%s.add( %s, %s(%s), (*%s).%s );" % xs )
+				elif store_info['has_index']:
 					xs = (store_info['name'],var_name,store_info['idx_func']
                                              ,','.join(map(lambda idx: "(*%s).%s" % (var_name,idx['arg_name']) ,store_info['idx'])) )
 					add_to_store_codes.append( "%s.add( %s, %s(%s) );" % xs )
@@ -900,6 +1274,7 @@ class CPPCodeGenerator:
 
 	def generate_receive_member(self, ensem_name):
 		receive_comm_codes = []
+		flush_comm_codes = []
 		send_codes = []
 		recv_codes = []
 		idx = 1
@@ -918,6 +1293,7 @@ class CPPCodeGenerator:
 					}				
 				''')
 				receive_comm_codes.append( compile_template(receive_comm_code, fact_name=fact_name, var_name=var_name, idx=idx) )
+				flush_comm_codes.append( "%s_comm.flush();" % var_name )
 				idx += 1
 				send_codes.append( "*(%s_comm.get_send_counter())" % var_name );
 				recv_codes.append( "*(%s_comm.get_recv_counter())" % var_name );
@@ -931,16 +1307,59 @@ class CPPCodeGenerator:
 				return received;
 			}
 
+			protected: void flush_sends() {
+				{| '\\n'.join( flush_comm_codes ) |}
+			}
+
 			protected: bool globally_quiescence() {
 				int ns1 [{| num_of_comm |}] = { {| ', '.join( send_codes ) |} };
 				int ns2 [{| num_of_comm |}] = { {| ', '.join( recv_codes ) |} };
 				return all_eq_sum<{| num_of_comm |}>(ns1, ns2);
 			}
 		''')
-		return compile_template(receive_member_codes, receive_comm_codes=receive_comm_codes, num_of_comm=num_of_comm
+		return compile_template(receive_member_codes, receive_comm_codes=receive_comm_codes, flush_comm_codes=flush_comm_codes, num_of_comm=num_of_comm
                                        ,send_codes=send_codes, recv_codes=recv_codes)
 
-	def generate_fact_lhs(self, fact_idx, loc_fact, fact_var_name, head_idx, var_ctxt):
+	def generate_load_facts_member(self, ensem_name):
+		read_funcs = { ast.LOC:"read_int", ast.INT:"read_int", ast.FLOAT:"read_float", ast.CHAR:"read_char"
+		             , ast.BOOL:"read_bool", ast.STRING:"read_string" }
+		load_case_codes = []
+		for fact_idx in self.fact_dict:
+			fact_info = self.fact_dict[fact_idx]
+			if not encodable_types( fact_info['types'] ):
+				continue
+			# Arguments are read into variables first, since the evaluation order of call arguments is unspecified
+			read_codes = []
+			for (arg_type,type_code,arg_name) in zip(fact_info['types'],fact_info['type_codes'],fact_info['arg_names']):
+				read_codes.append( "%s %s = reader.%s();" % (type_code,arg_name,read_funcs[arg_type.name]) )
+			load_case_code = template('''
+				case {| var_name |}_pred_id: {
+					{| '\\n'.join( read_codes ) |}
+					add_{| var_name |}(loc{| join_ext(',', arg_names, prefix=',') |});
+					break;
+				}
+			''')
+			load_case_codes.append( compile_template(load_case_code, var_name=fact_info['var_name'], read_codes=read_codes
+                                                                , arg_names=fact_info['arg_names']) )
+
+		load_member_codes = template('''
+			public: void load_facts(FactFile& facts) {
+				for (int x=0; x < facts.num_locs(); x++) {
+					int loc = facts.loc(x);
+					if (lookup_dir( loc ) != rank) { continue; }
+					FactReader reader = facts.reader(x);
+					while (reader.has_next()) {
+						switch (reader.read_int()) {
+							{| '\\n'.join( load_case_codes ) |}
+							default: throw runtime_error("Unknown predicate in fact file");
+						}
+					}
+				}
+			}
+		''')
+		return compile_template(load_member_codes, load_case_codes=load_case_codes)
+
+	def generate_fact_lhs(self, fact_idx, loc_fact, fact_var_name, head_idx, var_ctxt, column_store=None):
 		fact_info = self.fact_dict[fact_idx]
 		orig_pat_vars  = [mk_cpp_var_name(loc_fact.loc.name)] + map(lambda t: mk_cpp_var_name(t.name), loc_fact.fact.terms)
 
@@ -954,7 +1373,11 @@ class CPPCodeGenerator:
 				mod_pat_vars.append( orig_pat_vars[i])
 
 		arg_decs   = map(lambda (t,v): "%s %s;" % (t,v) , zip([fact_info['loc_type']]+fact_info['type_codes'],mod_pat_vars)) 
-		if len(mod_pat_vars) > 1:
+		if column_store != None:
+			# Arguments are read from the columns of the store, at position fact_var_name
+			arg_names  = [fact_info['loc_name']] + fact_info['arg_names']
+			arg_unpack = ' '.join( map(lambda (v,a): "%s = %s.%s[%s];" % (v,column_store,a,fact_var_name), zip(mod_pat_vars,arg_names)) )
+		elif len(mod_pat_vars) > 1:
 			arg_unpack = "tie(%s) = (*%s).args();" % (','.join(mod_pat_vars),fact_var_name)
 		else:
 			arg_unpack = "%s = (*%s).args();" % (mod_pat_vars[0],fact_var_name)
@@ -964,6 +1387,40 @@ class CPPCodeGenerator:
 		''')
 		return orig_pat_vars,compile_template(fact_lhs_codes, arg_decs=arg_decs, arg_unpack=arg_unpack),idx_var_eq
 
+	# Generates the members of the join orderings (join_ordering,join_idx), in order. With several jobs,
+	# members are generated by forked workers, then registered in order.
+	def generate_join_ordering_members(self, ensem_name, join_ordering_members):
+		if not parallel.is_parallel() or len(join_ordering_members) < 2:
+			return map(lambda (join_ordering,join_idx): self.generate_join_ordering_member(ensem_name, join_ordering, join_idx)
+                                  ,join_ordering_members)
+		member_codes = parallel.fork_map(generate_forked_join_ordering_member, (self,ensem_name,join_ordering_members)
+                                                ,range(0,len(join_ordering_members)))
+		for (join_ordering,join_idx) in join_ordering_members:
+			self.register_join_ordering_member(join_ordering, join_idx)
+		return member_codes
+
+	def join_ordering_member_name(self, join_ordering, join_idx):
+		return "execute_%s_join_ordering_%s" % (self.fact_dict[join_ordering.fact_idx]['var_name'], join_idx)
+
+	def register_join_ordering_member(self, join_ordering, join_idx):
+		fact_idx = join_ordering.fact_idx
+		join_member_name = self.join_ordering_member_name(join_ordering, join_idx)
+		if fact_idx in self.join_ordering_dict:
+			self.join_ordering_dict[fact_idx].append( { 'member_name':join_member_name, 'always_continue':join_ordering.is_active_prop } )
+		else:
+			self.join_ordering_dict[fact_idx] = [{ 'member_name':join_member_name, 'always_continue':join_ordering.is_active_prop }]
+
+	# Head of the definition of a member of the ensemble class. In split mode, members are defined outside
+	# of the class, in the translation unit of their rule or predicate (see generate_member_dec).
+	def generate_member_head(self, ensem_name, access_type, member_name, params):
+		if self.split:
+			return "%s %s::%s(%s)" % (split(access_type,' ')[-1], ensem_name, member_name, params)
+		else:
+			return "%s %s(%s)" % (access_type, member_name, params)
+
+	def generate_member_dec(self, access_type, member_name, params):
+		return "%s %s(%s);" % (access_type, member_name, params)
+
 	def generate_join_ordering_member(self, ensem_name, join_ordering, join_idx):
 
 		fact_idx  = join_ordering.fact_idx
@@ -972,15 +1429,12 @@ class CPPCodeGenerator:
 		fact_var  = fact_info['var_name']
 		arg_types = fact_info['type_codes']
 
-		join_member_name = "execute_%s_join_ordering_%s" % (fact_var, join_idx)
+		join_member_name = self.join_ordering_member_name(join_ordering, join_idx)
 
 		l_args = (join_member_name,"%s","%")
 		logging_code = "LOG_RULE_APP( record((format(\"Attempting occurrence %s on %s\") %s act->pretty()).str(), THIS_SRC) ); " % l_args
 		
-		if fact_idx in self.join_ordering_dict:
-			self.join_ordering_dict[fact_idx].append( { 'member_name':join_member_name, 'always_continue':join_ordering.is_active_prop } )
-		else:
-			self.join_ordering_dict[fact_idx] = [{ 'member_name':join_member_name, 'always_continue':join_ordering.is_active_prop }]
+		self.register_join_ordering_member(join_ordering, join_idx)
 
 		source_text = join_ordering.__repr__()
 
@@ -993,23 +1447,28 @@ class CPPCodeGenerator:
 		# delete_infos = []
 
 		# rest_match_step_codes = self.generate_match_step(rule_spec['match_steps'] ,pat_vars, loc_var, 1, delete_infos, rule_spec)
+		# Temporary variables are numbered per member, so that members do not depend on the ones generated before
+		var_idx = self.var_idx
+		self.var_idx = 0
 		join_ordering_codes = self.generate_join_ordering(join_ordering, join_ordering.getJoinTasks(), {})
+		self.var_idx = var_idx
 
 		join_member_codes = template('''
 			/*
 			{| source_text |}
 			*/
-			private: bool {| join_member_name |}({| fact_type |}* act) {
+			{| member_head |} {
 				{| logging_code |}
 				{| join_ordering_codes |}
 				return true;
 			}
 		''')
 
-		return compile_template( join_member_codes, join_member_name=join_member_name, fact_type=fact_type, source_text=source_text
+		member_head = self.generate_member_head(ensem_name, "private: bool", join_member_name, "%s* act" % fact_type)
+		return compile_template( join_member_codes, member_head=member_head, source_text=source_text
                                        , logging_code=logging_code, join_ordering_codes=join_ordering_codes)
 
-	def generate_fact_member(self, fact_idx, join_ordering_info=None):
+	def generate_fact_member(self, fact_idx, join_ordering_info=None, ensem_name=None):
 		if join_ordering_info == None:
 			fact_info = self.fact_dict[fact_idx]
 			fact_name = fact_info['fact_name']
@@ -1019,11 +1478,12 @@ class CPPCodeGenerator:
 			else:
 				rest_exec_codes = compact( self.generate_fact_member(fact_idx, []) )
 			fact_exec_codes = template('''
-				private: void execute({| fact_name |}* {| var_name |}) {
+				{| member_head |} {
 					{| rest_exec_codes |}
 				}
 			''')
-			return compile_template(fact_exec_codes, fact_name=fact_name, var_name=var_name, rest_exec_codes=rest_exec_codes)
+			member_head = self.generate_member_head(ensem_name, "private: void", "execute", "%s* %s" % (fact_name,var_name))
+			return compile_template(fact_exec_codes, member_head=member_head, rest_exec_codes=rest_exec_codes)
 		else:
 			if len(join_ordering_info) == 0:				
 				fact_info = self.fact_dict[fact_idx]
@@ -1165,6 +1625,12 @@ class CPPCodeGenerator:
                                 , 'source_text'   : mk_join_task_source_text( join_task ) }
 		return template_args,join_ordering_template
 
+	# Bound and relation arguments of an ordered store lookup.
+	def generate_ord_bound_args(self, lookup):
+		ord_rels = { ORD_LEQ:"MSRE_ORD_LEQ", ORD_LT:"MSRE_ORD_LT", ORD_GEQ:"MSRE_ORD_GEQ", ORD_GT:"MSRE_ORD_GT" }
+		context_codes,bound_codes = self.generate_term( lookup.ordBound() )
+		return context_codes,"%s, %s" % (bound_codes,ord_rels[lookup.ordRelation()])
+
 	@visit.when(join.LookupAtom)
 	def generate_join_task(self, join_task, join_head_dict):
 
@@ -1180,8 +1646,12 @@ class CPPCodeGenerator:
 		# idx_vars   = map(mk_cpp_var_name,this_match_step['idx_vars'])
 		idx_vars   = map(lambda iv: mk_cpp_var_name(iv.name), lookup.inputVars(join_task.head))
 
+		bound_context_codes = []
 		if store_info['has_index']:
-			index_func_app = "%s(%s)" % (store_info['idx_func'],','.join(idx_vars))
+			index_func_app = "%s(%s)" % (store_info['idx_func'],','.join(idx_vars[:len(store_info['idx'])]))
+			if store_info['ord_idx'] != None:
+				bound_context_codes,bound_args = self.generate_ord_bound_args(lookup)
+				index_func_app += ", %s" % bound_args
 		else:
 			index_func_app = ""
 
@@ -1193,14 +1663,19 @@ class CPPCodeGenerator:
 		else:
 			get_next_code = "get_next_alive()"
 
-		this_pat_vars,fact_lhs_codes,idx_var_eq = self.generate_fact_lhs(fact_idx, fact_pat, "*%s" % cand_name, cand_idx, all_pat_vars(join_head_dict))
+		if store_info['columnar']:
+			pos_name = "pos_%s" % cand_idx
+			this_pat_vars,fact_lhs_codes,idx_var_eq = self.generate_fact_lhs(fact_idx, fact_pat, pos_name, cand_idx, all_pat_vars(join_head_dict)
+			                                                                ,column_store=store_info['name'])
+		else:
+			this_pat_vars,fact_lhs_codes,idx_var_eq = self.generate_fact_lhs(fact_idx, fact_pat, "*%s" % cand_name, cand_idx, all_pat_vars(join_head_dict))
 		join_head_dict[join_task.head_idx] = { 'fact_idx' : fact_idx
                                                      , 'pat_vars' : this_pat_vars
                                                      , 'fact_var' : cand_name
                                                      , 'head'     : join_task.head
                                                      , 'is_atom'  : True }
 
-		# TODO: Might not be always collision free.
+		# Stores are keyed by exact index values, so candidates never collide.
 		if store_info['collision_free']:
 			report_collision_code = ""
 		else:
@@ -1211,9 +1686,21 @@ class CPPCodeGenerator:
 		l_args = (cand_name,"%s","%","(**%s).pretty()" % cand_name)
 		logging_codes = "LOG_RULE_APP( record((format(\"Candidate for %s found -> %s\") %s %s).str(), THIS_SRC) ); " % l_args
 
-		if not store_info['collision_free']: # len(idx_var_eq) > 0:
+		if store_info['columnar']:
+			# Scans the columns of the store by position
 			join_ordering_template = template('''
 				{| source_text |}
+				for (int pos_{| cand_idx |} = 0; pos_{| cand_idx |} < {| store_name |}.actual_size(); pos_{| cand_idx |}++) {
+					{| fact_lhs_codes |}
+					optional<{| fact_name |}*> {| cand_name |}( {| store_name |}.fact(pos_{| cand_idx |}) );
+					{| logging_codes |}
+					{| rest_tasks_code |}
+				}
+			''')
+		elif not store_info['collision_free']: # len(idx_var_eq) > 0:
+			join_ordering_template = template('''
+				{| source_text |}
+				{| bound_context_codes |}
 				{| iter_type |} candidates_{| cand_idx |} = {| store_name |}.lookup_candidates({| index_func_app |});
 				optional<{| fact_name |}*> {| cand_name |} = candidates_{| cand_idx |}.{| get_next_code |};
 				while({| cand_name |}) {
@@ -1234,6 +1721,7 @@ class CPPCodeGenerator:
 		else:
 			join_ordering_template = template('''
 				{| source_text |}
+				{| bound_context_codes |}
 				{| iter_type |} candidates_{| cand_idx |} = {| store_name |}.lookup_candidates({| index_func_app |});
 				optional<{| fact_name |}*> {| cand_name |} = candidates_{| cand_idx |}.{| get_next_code |};
 				while({| cand_name |}) {
@@ -1255,6 +1743,7 @@ class CPPCodeGenerator:
 		                , 'get_next_code'  : get_next_code
 		                , 'logging_codes'  : logging_codes
 		                , 'report_collision_code' : report_collision_code
+		                , 'bound_context_codes' : '\n'.join( bound_context_codes )
 		                , 'source_text'    : mk_join_task_source_text( join_task ) }
 
 		return template_args,join_ordering_template
@@ -1269,8 +1758,12 @@ class CPPCodeGenerator:
 		cand_idx = join_task.head_idx
 		idx_vars   = map(lambda iv: mk_cpp_var_name(iv.name), lookup.inputVars(join_task.head))
 
+		bound_context_codes = []
 		if store_info['has_index']:
-			index_func_app = "%s(%s)" % (store_info['idx_func'],','.join(idx_vars))
+			index_func_app = "%s(%s)" % (store_info['idx_func'],','.join(idx_vars[:len(store_info['idx'])]))
+			if store_info['ord_idx'] != None:
+				bound_context_codes,bound_args = self.generate_ord_bound_args(lookup)
+				index_func_app += ", %s" % bound_args
 		else:
 			index_func_app = ""
 
@@ -1300,7 +1793,7 @@ class CPPCodeGenerator:
                                                      , 'fact_pat' : fact_pat
                                                      , 'iter_mod' : iter_mod }
 
-		# TODO: Might not be always collision free.
+		# Stores are keyed by exact index values, so candidates never collide.
 		msg_str = "\"Collision on %s found: %s is not a compatiable candidate.\"" % ("%s","%s")
 		l_args = "cand_%s %s (**%s).pretty()" % (cand_idx," % ",cand_name)
 		report_collision_code = "LOG_RULE_APP( record((format(%s) %s %s).str(), THIS_SRC) );" % (msg_str,"%",l_args)
@@ -1309,11 +1802,13 @@ class CPPCodeGenerator:
                                 , 'old_iter_name'  : iter_name
                                 , 'store_name'     : store_info['name']
                                 , 'index_func_app' : index_func_app 
+		                , 'bound_context_codes' : '\n'.join( bound_context_codes )
 		                , 'source_text'    : mk_join_task_source_text( join_task ) }
 
 		if store_info['collision_free']: # len(idx_var_eq) == 0:
 			join_ordering_template = template('''
 				{| source_text |}
+				{| bound_context_codes |}
 				{| old_iter_type |} {| old_iter_name |} = {| store_name |}.lookup_candidates({| index_func_app |});
 				{| rest_tasks_code |}
 			''')
@@ -1336,6 +1831,7 @@ class CPPCodeGenerator:
 
 			join_ordering_template = template('''
 				{| source_text |}
+				{| bound_context_codes |}
 				{| old_iter_type |} {| old_iter_name |} = {| store_name |}.lookup_candidates({| index_func_app |});
 				{| new_iter_type |} {| new_iter_name |};
 				optional<{| fact_name |}*> {| cand_name |} = {| old_iter_name |}.{| get_next_code |};
@@ -2108,6 +2604,11 @@ store( {| body_name |} );
 
 		return context_codes,term_codes
 
+# Generates the member of a join ordering in a forked worker
+def generate_forked_join_ordering_member((generator,ensem_name,join_ordering_members), member_pos):
+	(join_ordering,join_idx) = join_ordering_members[member_pos]
+	return generator.generate_join_ordering_member(ensem_name, join_ordering, join_idx)
+
 class CPPTypeCoercion:
 
 	def __init__(self):
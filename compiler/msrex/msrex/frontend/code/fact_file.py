@@ -0,0 +1,123 @@
+'''
+This file is part of MSR Ensemble (MSRE-X).
+
+MSRE-X is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+MSRE-X is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with MSRE-X. If not, see <http://www.gnu.org/licenses/>.
+
+MSR Ensemble (MSRE-X) Version 0.5, Prototype Alpha
+
+Authors:
+Edmund S. L. Lam      sllam@qatar.cmu.edu
+Iliano Cervesato      iliano@cmu.edu
+
+* This implementation was made possible by an NPRP grant (NPRP 09-667-1-100, Effective Programming 
+for Large Distributed Ensembles) from the Qatar National Research Fund (a member of the Qatar 
+Foundation). The statements made herein are solely the responsibility of the authors.
+'''
+
+import struct
+
+import msrex.frontend.lex_parse.ast as ast
+
+# Binary initial fact files, read by the runtime's FactFile (see runtime/msre/fact_file.h).
+# Facts are grouped by location, so that each rank only reads the locations it owns.
+
+FACT_FILE_MAGIC   = "MSREFACT"
+FACT_FILE_VERSION = 1
+
+# struct codes of fact arguments, by MSRE base type
+ARG_CODES = { ast.LOC:'i', ast.INT:'i', ast.FLOAT:'f', ast.CHAR:'c', ast.BOOL:'b', ast.STRING:'s' }
+
+# Returns true if facts with arguments of the given types can be stored in fact files.
+def encodable_types(arg_types):
+	for arg_type in arg_types:
+		if not isinstance(arg_type, ast.TypeCons) or arg_type.name not in ARG_CODES:
+			return False
+	return True
+
+# Returns the value of a ground fact argument, or None if the argument is not ground. Location
+# variables are mapped to node ids by loc_ids.
+def ground_value(term, type_name, loc_ids):
+	if term.term_type == ast.TERM_LIT:
+		if type_name in [ast.STRING,ast.CHAR] and isinstance(term.literal, str):
+			return term.literal[1:-1]
+		return term.literal
+	elif term.term_type == ast.TERM_VAR:
+		if term.name in loc_ids:
+			return loc_ids[term.name]
+	elif term.term_type == ast.TERM_CONS:
+		if type_name == ast.BOOL and term.name in ['true','false']:
+			return term.name == 'true'
+	return None
+
+class FactFileWriter:
+
+	def __init__(self):
+		self.nodes = []
+		self.loc_facts = {}
+
+	def add_node(self, node_id, alias):
+		self.nodes.append( (node_id, alias) )
+
+	# Adds a fact if it is ground and of encodable types. Returns true if the fact was added.
+	def add_fact(self, pred_idx, loc_fact, arg_types, loc_ids):
+		if loc_fact.priority != None or not encodable_types(arg_types):
+			return False
+		loc = ground_value(loc_fact.loc, ast.LOC, loc_ids)
+		if loc == None:
+			return False
+		args = []
+		for (term,arg_type) in zip(loc_fact.fact.terms, arg_types):
+			value = ground_value(term, arg_type.name, loc_ids)
+			if value == None:
+				return False
+			args.append( (arg_type,value) )
+		record = [struct.pack("=i", pred_idx)]
+		for (arg_type,value) in args:
+			record.append( self.encode_arg(arg_type, value) )
+		if loc not in self.loc_facts:
+			self.loc_facts[loc] = []
+		self.loc_facts[loc].append( ''.join(record) )
+		return True
+
+	def encode_arg(self, arg_type, value):
+		code = ARG_CODES[arg_type.name]
+		if code == 's':
+			return struct.pack("=i", len(value)) + value
+		elif code == 'b':
+			return struct.pack("=b", 1 if value else 0)
+		else:
+			return struct.pack("=%s" % code, value)
+
+	def num_facts(self):
+		return sum( map(len, self.loc_facts.values()) )
+
+	def write(self, file_name):
+		header = [FACT_FILE_MAGIC, struct.pack("=ii", FACT_FILE_VERSION, len(self.nodes))]
+		for (node_id,alias) in self.nodes:
+			header.append( struct.pack("=ii", node_id, len(alias)) + alias )
+		locs = sorted( self.loc_facts.keys() )
+		header.append( struct.pack("=i", len(locs)) )
+		index_size = len(locs) * struct.calcsize("=iiqq")
+		offset = sum( map(len, header) ) + index_size
+		index  = []
+		bodies = []
+		for loc in locs:
+			body = ''.join( self.loc_facts[loc] )
+			index.append( struct.pack("=iiqq", loc, len(self.loc_facts[loc]), offset, len(body)) )
+			bodies.append( body )
+			offset += len(body)
+		output = open(file_name, 'wb')
+		output.write( ''.join(header + index + bodies) )
+		output.close()
+
@@ -0,0 +1,112 @@
+'''
+This file is part of MSR Ensemble (MSRE-X).
+
+MSRE-X is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+MSRE-X is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with MSRE-X. If not, see <http://www.gnu.org/licenses/>.
+
+MSR Ensemble (MSRE-X) Version 0.5, Prototype Alpha
+
+Authors:
+Edmund S. L. Lam      sllam@qatar.cmu.edu
+Iliano Cervesato      iliano@cmu.edu
+
+* This implementation was made possible by an NPRP grant (NPRP 09-667-1-100, Effective Programming 
+for Large Distributed Ensembles) from the Qatar National Research Fund (a member of the Qatar 
+Foundation). The statements made herein are solely the responsibility of the authors.
+'''
+
+import re
+
+# Cardinality estimates of predicate stores, used by the join planner.
+# Estimates are drawn from a prioritized list of sources: the first source that knows
+# about a predicate wins. Sources implement 'estimate(fact_dec)', returning None if unknown.
+
+DEFAULT_STORE_SIZE = 1000
+
+class CardinalitySource:
+	def estimate(self, fact_dec):
+		return None
+
+# Programmer hints, i.e., 'pragma cardinality <pred> <size>.'
+class HintCardinality(CardinalitySource):
+	def __init__(self, hints):
+		self.hints = hints
+	def estimate(self, fact_dec):
+		if fact_dec.name in self.hints:
+			return self.hints[fact_dec.name]
+		else:
+			return None
+
+# Store sizes recorded by a previous run. Accepts the 'Size of <pred> Store: <size>' lines
+# of the runtime statistics log, or plain '<pred> <size>' lines. Where a predicate appears
+# several times (e.g., once per rank), the largest size is used.
+PROFILE_STAT_RE  = re.compile('Size of ([a-zA-Z0-9_]+) Store: ([0-9]+)')
+PROFILE_PLAIN_RE = re.compile('^\s*([a-zA-Z0-9_]+)\s+([0-9]+)\s*$')
+
+class ProfileCardinality(CardinalitySource):
+	def __init__(self, profile_file):
+		self.sizes = {}
+		for line in open(profile_file, 'r'):
+			m = PROFILE_STAT_RE.search(line)
+			if m == None:
+				m = PROFILE_PLAIN_RE.match(line)
+			if m != None:
+				name = m.group(1)
+				size = int(m.group(2))
+				self.sizes[name] = max(size, self.sizes.get(name, 0))
+	def estimate(self, fact_dec):
+		return self.sizes.get(fact_dec.name)
+
+class DefaultCardinality(CardinalitySource):
+	def __init__(self, size=DEFAULT_STORE_SIZE):
+		self.size = size
+	def estimate(self, fact_dec):
+		return self.size
+
+class CardinalityEstimates:
+
+	def __init__(self, fact_dir, hints={}, profile_file=None):
+		self.fact_dir = fact_dir
+		self.sources = []
+		if len(hints) > 0:
+			self.sources.append( HintCardinality(hints) )
+		if profile_file != None:
+			self.sources.append( ProfileCardinality(profile_file) )
+		self.sources.append( DefaultCardinality() )
+		self.cache = {}
+
+	def addSource(self, source, priority=0):
+		self.sources.insert(priority, source)
+		self.cache = {}
+
+	def getSize(self, pred_idx):
+		if pred_idx in self.cache:
+			return self.cache[pred_idx]
+		fact_dec = self.fact_dir.getFactFromIdx( pred_idx )
+		size = DEFAULT_STORE_SIZE
+		for source in self.sources:
+			est = source.estimate( fact_dec )
+			if est != None:
+				size = est
+				break
+		size = max(1.0, float(size))
+		self.cache[pred_idx] = size
+		return size
+
+	def __repr__(self):
+		strs = "========== Cardinality Estimates ==========\n"
+		for pred_idx in self.fact_dir.getIndices():
+			strs += "%s : %s\n" % (self.fact_dir.getFactFromIdx(pred_idx).name, self.getSize(pred_idx))
+		strs += "==========================================="
+		return strs
+
@@ -264,7 +264,7 @@ class DeleteHead(MatchTask):
 
 class JoinOrdering:
 
-	def __init__(self, rule, occ_idx, fact_dir, lookup_tables):
+	def __init__(self, rule, occ_idx, fact_dir, lookup_tables, planner=None):
 
 		inspect = Inspector()
 
@@ -285,6 +285,7 @@ class JoinOrdering:
 		self.occ_head = occ_head
 		self.fact_idx = occ_head.fact_idx
 		self.rule = rule
+		self.registered_lookups = []
 		self.occ_idx = occ_idx
 		self.is_active_prop = False
 		self.is_propagated = True
@@ -319,7 +320,7 @@ class JoinOrdering:
 				self.is_active_prop = True
 
 		# Initiate Matching Context
-		lctxt = LookupContext( fact_dir )
+		lctxt = LookupContext( fact_dir, planner=planner )
 		lctxt.addFactHead(occ_head, boot_strap=boot_strap)
 		map(lambda g: lctxt.addGuard(g), guard_pool)
 
@@ -346,7 +347,7 @@ class JoinOrdering:
 			# Build lookup match task for best lookup partner option
 			lookup_task = LookupAtom(partner_head, head_idx, best_lookup, rule)
 
-			lookup_tables.registerLookup( best_lookup )
+			self.registerLookup( lookup_tables, best_lookup )
 
 			# Update lookup context
 			# lctxt.addFactHead( partner_head )
@@ -380,7 +381,7 @@ class JoinOrdering:
 			lookup = lctxt.lookupOptions(occ_head)[0]
 			lookup_task = LookupAll(occ_head, head_idx, lookup, rule)
 	
-			lookup_tables.registerLookup( lookup )
+			self.registerLookup( lookup_tables, lookup )
 
 			# lctxt.addFactHead( occ_head )
 			lctxt.addVars( lookup_task.output_vars + [occ_head.compre_dom] ) 
@@ -425,7 +426,7 @@ class JoinOrdering:
 			# Build lookup match task for best lookup partner option
 			lookup_task = LookupAll(partner_head, head_idx, best_lookup, rule)
 		
-			lookup_tables.registerLookup( best_lookup )
+			self.registerLookup( lookup_tables, best_lookup )
 
 			# Update lookup context
 			# lctxt.addFactHead( partner_head )
@@ -492,6 +493,11 @@ class JoinOrdering:
 		self.atom_body_tasks = atom_body_tasks
 		self.compre_body_tasks = compre_body_tasks
 
+	# Registers a lookup and remembers it, so that cached join orderings can re-register their lookups.
+	def registerLookup(self, lookup_tables, lookup):
+		lookup_tables.registerLookup( lookup )
+		self.registered_lookups.append( lookup )
+
 	def getName(self):
 		return self.rule.get_name()
 
@@ -0,0 +1,166 @@
+'''
+This file is part of MSR Ensemble (MSRE-X).
+
+MSRE-X is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+MSRE-X is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with MSRE-X. If not, see <http://www.gnu.org/licenses/>.
+
+MSR Ensemble (MSRE-X) Version 0.5, Prototype Alpha
+
+Authors:
+Edmund S. L. Lam      sllam@qatar.cmu.edu
+Iliano Cervesato      iliano@cmu.edu
+
+* This implementation was made possible by an NPRP grant (NPRP 09-667-1-100, Effective Programming 
+for Large Distributed Ensembles) from the Qatar National Research Fund (a member of the Qatar 
+Foundation). The statements made herein are solely the responsibility of the authors.
+'''
+
+import math
+
+from msrex.frontend.analyze.inspectors import Inspector
+
+from msrex.frontend.compile.lookup_context import HASH_LK, MEM_LK, ORD_LK, LOC_HASH_LK, LINEAR_LK
+from msrex.frontend.compile.rule_guards import EQ_GRD
+
+# Cost-based ordering of partner heads.
+# The cost of a join order is the estimated number of candidates enumerated by its lookups:
+# each lookup is probed once per partial match built by the lookups before it. Partial matches
+# grow with the estimated matches of each lookup and shrink with every guard that becomes
+# schedulable. Orders are searched by dynamic programming over subsets of partner heads,
+# falling back to a greedy search when there are more than 'search_limit' partners.
+
+PLANNER_SEARCH_LIMIT = 8
+
+EQ_GUARD_SELECTIVITY = 0.1
+GUARD_SELECTIVITY    = 0.5
+RANGE_SELECTIVITY    = 0.3
+
+COST_TOLERANCE = 1e-9
+
+class PlanState:
+	def __init__(self, cost, rows, var_ctxt, guards, order):
+		self.cost     = cost
+		self.rows     = rows
+		self.var_ctxt = var_ctxt
+		self.guards   = guards
+		self.order    = order
+	def better(self, other):
+		if abs(self.cost - other.cost) > COST_TOLERANCE * max(1.0, abs(self.cost), abs(other.cost)):
+			return self.cost < other.cost
+		return self.order < other.order
+
+class JoinPlanner:
+
+	def __init__(self, fact_dir, estimates, search_limit=PLANNER_SEARCH_LIMIT):
+		self.fact_dir  = fact_dir
+		self.estimates = estimates
+		self.search_limit = search_limit
+		self.inspect = Inspector()
+
+	def bestLookupOption(self, lctxt, new_head_info):
+		memo = {}
+		order = self.bestOrder(lctxt, new_head_info, memo)
+		head_idx = order[0]
+		(_,_,lookup) = self.bestLookup(lctxt, head_idx, new_head_info[head_idx], lctxt.varCtxt(), memo)
+		return (head_idx, lookup)
+
+	def bestOrder(self, lctxt, new_head_info, memo=None):
+		if memo == None:
+			memo = {}
+		head_idxs = sorted(new_head_info.keys())
+		guards = lctxt.eq_grds + lctxt.ord_grds + lctxt.mem_grds + lctxt.non_idx_grds
+		init_state = PlanState(0.0, 1.0, lctxt.varCtxt(), guards, [])
+		if len(head_idxs) > self.search_limit:
+			return self.greedyOrder(lctxt, new_head_info, init_state, memo)
+		best_states = { frozenset([]) : init_state }
+		for _ in head_idxs:
+			next_states = {}
+			for chosen,state in best_states.items():
+				for head_idx in head_idxs:
+					if head_idx not in chosen:
+						new_state = self.extend(lctxt, state, head_idx, new_head_info[head_idx], memo)
+						key = chosen | frozenset([head_idx])
+						if key not in next_states or new_state.better( next_states[key] ):
+							next_states[key] = new_state
+			best_states = next_states
+		return best_states.values()[0].order
+
+	def greedyOrder(self, lctxt, new_head_info, state, memo):
+		head_idxs = sorted(new_head_info.keys())
+		while len(state.order) < len(head_idxs):
+			best_state = None
+			for head_idx in head_idxs:
+				if head_idx not in state.order:
+					new_state = self.extend(lctxt, state, head_idx, new_head_info[head_idx], memo)
+					if best_state == None or new_state.better( best_state ):
+						best_state = new_state
+			state = best_state
+		return state.order
+
+	def extend(self, lctxt, state, head_idx, new_head, memo):
+		(probe,matches,lookup) = self.bestLookup(lctxt, head_idx, new_head, state.var_ctxt, memo)
+		cost = state.cost + state.rows * probe
+		if new_head.is_atom:
+			new_vars = lookup.inputVars(new_head) + lookup.outputVars(new_head)
+			rows = state.rows * matches
+		else:
+			new_vars = lookup.outputVars(new_head)
+			if new_head.compre_dom != None:
+				new_vars = new_vars + [new_head.compre_dom]
+			rows = state.rows
+		var_ctxt = state.var_ctxt | self.inspect.free_var_idxs( new_vars )
+		guards = []
+		for guard in state.guards:
+			if guard in lookup.assoc_guards:
+				continue
+			if guard.scheduleAsGuard( var_ctxt ):
+				rows = rows * guard_selectivity( guard )
+			else:
+				guards.append( guard )
+		return PlanState(cost, rows, var_ctxt, guards, state.order + [head_idx])
+
+	def bestLookup(self, lctxt, head_idx, new_head, var_ctxt, memo):
+		key = (head_idx, frozenset(var_ctxt))
+		if key in memo:
+			return memo[key]
+		best = None
+		for lookup in lctxt.lookupOptions(new_head, var_ctxt=var_ctxt):
+			(probe,matches) = self.lookupCost(lookup)
+			if best == None or (probe,lookup.cost()) < (best[0],best[2].cost()):
+				best = (probe,matches,lookup)
+		memo[key] = best
+		return best
+
+	# Returns (estimated cost of one probe, estimated number of matches)
+	def lookupCost(self, lookup):
+		size  = self.estimates.getSize( lookup.pred_idx )
+		arity = self.fact_dir.getCardinality( lookup.pred_idx )
+		bound_args = len(filter(lambda i: i > 0, lookup.lookupArgIndices()))
+		if arity > 0 and bound_args > 0:
+			matches = size ** (float(max(arity - bound_args,0)) / arity)
+		else:
+			matches = size
+		if lookup.type == LINEAR_LK:
+			return (size, size)
+		elif lookup.type in [HASH_LK, LOC_HASH_LK]:
+			return (max(1.0, matches), matches)
+		else:
+			matches = max(1.0, matches * RANGE_SELECTIVITY)
+			return (math.log(size + 1, 2) + matches, matches)
+
+def guard_selectivity(guard):
+	if guard.type == EQ_GRD:
+		return EQ_GUARD_SELECTIVITY
+	else:
+		return GUARD_SELECTIVITY
+
@@ -48,12 +48,17 @@ ORD_GT  = 'gt'
 INPUT  = '+'
 OUTPUT = '-'
 
+# Schedule order guards as range lookups over ordered stores.
+USE_ORD_LOOKUP = True
+
 class LookupTables:
 
 	def __init__(self, fact_dir):
 		self.fact_dir = fact_dir
 		self.lookup_tables = {}
 		self.linear_table_indices = {}
+		# Linear lookups registered by join tasks (unlike the padded and exported ones)
+		self.joined_linear_indices = {}
 		for fact_idx in fact_dir.getIndices():
 			self.lookup_tables[ fact_idx ] = []
 		
@@ -64,14 +69,20 @@ class LookupTables:
 				new_lookup.setLookupIdx( table_idx )
 				if new_lookup.type == LINEAR_LK:
 					self.linear_table_indices[new_lookup.pred_idx] = table_idx
+					self.joined_linear_indices[new_lookup.pred_idx] = table_idx
 				return table_idx
 			table_idx += 1
 		new_lookup.setLookupIdx( table_idx )
 		self.lookup_tables[new_lookup.pred_idx].append( new_lookup )
 		if new_lookup.type == LINEAR_LK:
 			self.linear_table_indices[new_lookup.pred_idx] = table_idx
+			self.joined_linear_indices[new_lookup.pred_idx] = table_idx
 		return table_idx
 
+	# Returns true iff a join task scans store table_idx of fact_idx with a linear lookup
+	def is_joined_linear_lookup(self, fact_idx, table_idx):
+		return self.joined_linear_indices.get(fact_idx) == table_idx
+
 	def linear_lookup_index(self, fact_idx):
 		# print self.linear_table_indices
 		return self.linear_table_indices[fact_idx]
@@ -116,7 +127,7 @@ class LookupTables:
 
 class LookupContext:
 
-	def __init__(self, fact_dir):
+	def __init__(self, fact_dir, planner=None):
 		self.bs_eq_ctxt = emptyset()
 		self.eq_ctxt  = emptyset()
 		self.mem_grds = []
@@ -125,6 +136,7 @@ class LookupContext:
 		self.non_idx_grds = []
 		self.inspect  = Inspector()
 		self.fact_dir = fact_dir
+		self.planner  = planner
 
 	def __repr__(self):
 		strs  = "======== Lookup Context ========\n"
@@ -212,6 +224,8 @@ class LookupContext:
 		return sch_grds
 
 	def bestLookupOption(self, new_head_info):
+		if self.planner != None:
+			return self.planner.bestLookupOption(self, new_head_info)
 		curr_best_head_idx = -1
 		curr_best_lookup   = None
 		curr_best_cost     = (10000,0,0)
@@ -233,7 +247,9 @@ class LookupContext:
 		self.non_idx_grds = filter(lambda g: g not in rm_grds, self.non_idx_grds)
 
 	# Current implementation ignores Eq guards.
-	def lookupOptions(self, new_head):
+	def lookupOptions(self, new_head, var_ctxt=None):
+		if var_ctxt == None:
+			var_ctxt = self.varCtxt()
 		if new_head.is_atom:
 			loc_fact = new_head.fact
 			head_eq_grds  = []
@@ -248,8 +264,8 @@ class LookupContext:
 
 		lookup_opts = [ LinearLookup(self.fact_dir, loc_fact.fact.name) ]
 		free_vars = self.inspect.free_var_idxs( loc_fact )
-		join_vars = self.varCtxt() & free_vars
-		new_vars  = free_vars - self.varCtxt()
+		join_vars = var_ctxt & free_vars
+		new_vars  = free_vars - var_ctxt
 		
 		# Add a hash lookup if the new head has overlapping variables with the current
 		# variable context.
@@ -257,26 +273,27 @@ class LookupContext:
 			hash_lookup = HashLookup(self.fact_dir, loc_fact, join_vars)
 			lookup_opts.append( hash_lookup )
 
-		# TODO: Mem guard lookup and ord guard lookup omitted for now.
+		# TODO: Mem guard lookup omitted for now.
 		'''
 		# Add member lookup if the head has overlapping variables with a member guard
 		for mem_guard in self.mem_grds + head_mem_grds:
-			index_info = mem_guard.scheduleAsIndex( self.varCtxt() )
+			index_info = mem_guard.scheduleAsIndex( var_ctxt )
 			if index_info != None:
 				input_vars,output_vars,_ = index_info
 				if len(new_vars & output_vars) > 0:
-					mem_lookup = MemLookup(self.fact_dir, loc_fact, mem_guard, self.varCtxt())
+					mem_lookup = MemLookup(self.fact_dir, loc_fact, mem_guard, var_ctxt)
 					lookup_opts.append( mem_lookup )
-
-		# Add order lookup
-		for ord_guard in self.ord_grds + head_ord_grds:
-			index_info = ord_guard.scheduleAsIndex( self.varCtxt() )
-			if index_info != None:
-				input_vars,output_vars,is_left_input = index_info
-				if len(new_vars & output_vars) > 0:
-					ord_lookup = OrdLookup(self.fact_dir, loc_fact, ord_guard, is_left_input, self.varCtxt())
-					lookup_opts.append( ord_lookup )
 		'''
+
+		# Add order lookup if the head binds the free side of an order guard.
+		if USE_ORD_LOOKUP:
+			for ord_guard in self.ord_grds + head_ord_grds:
+				index_info = ord_guard.scheduleAsIndex( var_ctxt )
+				if index_info != None:
+					input_vars,output_vars,is_left_input = index_info
+					if len(new_vars & output_vars) > 0 and output_vars <= free_vars:
+						ord_lookup = OrdLookup(self.fact_dir, loc_fact, ord_guard, is_left_input, var_ctxt)
+						lookup_opts.append( ord_lookup )
 	
 		return sorted(lookup_opts, key=lambda lk: lk.cost())
 
@@ -557,6 +574,7 @@ class OrdLookup(LookupTechnique):
 			guard_args = [INPUT, ord_guard.term2]
 		else:
 			guard_args = [ord_guard.term1, INPUT]
+		self.is_left_input = is_left_input
 		op = '<=' if ord_guard.include_eq else '<'
 		guard_str = '%s %s %s' % ('%s',op,'%s')
 		if has_hash_index:
@@ -568,4 +586,32 @@ class OrdLookup(LookupTechnique):
 	def cost(self):
 		return (self.type,self.degree_freedom,-self.degree_join)
 
+	# Ordered stores are identified by their hash arguments and ordering argument only: lookups bound on either
+	# side of an order guard share a store, and choose the direction of the range at the lookup site.
+	def signature(self):
+		return map(lambda arg: arg if isinstance(arg, str) else ORD_GRD, self.pred_args)
+
+	# Argument position of the fact that orders the store.
+	def ordArgIndex(self):
+		for i in range(0,len(self.pred_args)):
+			if not isinstance(self.pred_args[i], str):
+				return i
+		return None
+
+	# Term that bounds the range of the lookup.
+	def ordBound(self):
+		ord_guard = self.assoc_guards[0]
+		if self.is_left_input:
+			return ord_guard.term1
+		else:
+			return ord_guard.term2
+
+	# Relation of the ordering argument to the bound, i.e., 'arg <rel> bound'
+	def ordRelation(self):
+		ord_guard = self.assoc_guards[0]
+		if self.is_left_input:
+			return ORD_GEQ if ord_guard.include_eq else ORD_GT
+		else:
+			return ORD_LEQ if ord_guard.include_eq else ORD_LT
+
 
@@ -29,25 +29,34 @@ Foundation). The statements made herein are solely the responsibility of the aut
 from msrex.frontend.analyze.inspectors import Inspector
 
 from msrex.frontend.compile.join_ordering import JoinOrdering
+from msrex.frontend.compile.join_planner import JoinPlanner
+from msrex.frontend.compile.cardinality import CardinalityEstimates
+import msrex.frontend.compile.lookup_context as lookup_context
+import msrex.misc.parallel as parallel
 from msrex.frontend.compile.lookup_context import ORD_LEQ, ORD_GEQ, ORD_LT, ORD_GT, LookupContext, LookupTables, LinearLookup, HashLookup, MemLookup, OrdLookup
 
 from collections import defaultdict
 
 class ProgCompilation:
 
-	def __init__(self, ensem_dec, rules, fact_dir, extern_decs, exec_dec, prog_name, source_text="", origin_text=""):
+	def __init__(self, ensem_dec, rules, fact_dir, extern_decs, exec_dec, prog_name, source_text="", origin_text=""
+                    ,estimates=None, cache=None):
 		self.ensem_dec = ensem_dec
 		self.prog_name  = prog_name
 		self.ensem_name = ensem_dec.name
 		self.fact_dir = fact_dir
 		self.lookup_tables = LookupTables( fact_dir )
-		rule_compilations = []
-		for rule in rules:
-			rule_compilations.append( RuleCompilation(rule, fact_dir, self.lookup_tables) )
-		self.rule_compilations = rule_compilations
+		if estimates == None:
+			estimates = CardinalityEstimates( fact_dir )
+		self.estimates = estimates
+		self.planner = JoinPlanner( fact_dir, estimates )
+		self.source_text = source_text
+		self.rule_compilations = self.compileRules(rules, fact_dir, cache)
+		rule_compilations = self.rule_compilations
 		self.lookup_tables.padWithLinearLookup()
 		self.lookup_tables.padWithExportedLookup()
-		self.rules = rules
+		# Cached rule compilations come with their own copies of their rules
+		self.rules = map(lambda rule_comp: rule_comp.rule, rule_compilations)
 		self.fact_dir = fact_dir
 
 		self.pred_rule_compilations = defaultdict(list)
@@ -76,6 +85,48 @@ class ProgCompilation:
 		self.role_dict = role_dict
 
 
+	# Compiles the rules, in order. With several jobs, rules (that are not in the cache) are compiled by
+	# forked workers, each with lookup tables of its own. Their lookups are then registered in the
+	# order of the rules, as for cached rule compilations, so lookup indices are those of a sequential run.
+	def compileRules(self, rules, fact_dir, cache):
+		if not parallel.is_parallel():
+			return map(lambda rule_pos: self.compileRule(rule_pos, rules[rule_pos], fact_dir, cache), range(0,len(rules)))
+		keys = map(lambda rule_pos: self.ruleKey(rule_pos, rules[rule_pos], fact_dir, cache), range(0,len(rules)))
+		rule_comps = map(lambda key: cache.load('rule', key) if key != None else None, keys)
+		uncached = filter(lambda rule_pos: rule_comps[rule_pos] == None, range(0,len(rules)))
+		compiled = parallel.fork_map(compile_forked_rule, (rules,fact_dir,self.planner), uncached)
+		for (rule_pos,rule_comp) in zip(uncached, compiled):
+			rule_comps[rule_pos] = rule_comp
+			if keys[rule_pos] != None:
+				cache.store('rule', keys[rule_pos], rule_comp)
+		for rule_comp in rule_comps:
+			rule_comp.registerLookups( self.lookup_tables )
+		return rule_comps
+
+	# Compiles a rule, or reuses its compilation from the cache if neither the rule, the predicates 
+	# nor the cardinality estimates have changed.
+	def compileRule(self, rule_pos, rule, fact_dir, cache):
+		if cache == None:
+			return RuleCompilation(rule, fact_dir, self.lookup_tables, planner=self.planner)
+		key = self.ruleKey(rule_pos, rule, fact_dir, cache)
+		rule_comp = cache.load('rule', key)
+		if rule_comp != None:
+			rule_comp.registerLookups( self.lookup_tables )
+		else:
+			rule_comp = RuleCompilation(rule, fact_dir, self.lookup_tables, planner=self.planner)
+			cache.store('rule', key, rule_comp)
+		return rule_comp
+
+	def ruleKey(self, rule_pos, rule, fact_dir, cache):
+		if cache == None:
+			return None
+		fact_sig = []
+		for fact_idx in sorted( fact_dir.getIndices() ):
+			fact_dec = fact_dir.getFactFromIdx( fact_idx )
+			fact_sig.append( (fact_idx, fact_dec.name, map(str,fact_dec.arg_types()), fact_dec.persistent, fact_dec.local
+                                         ,fact_dec.monotone, fact_dec.uses_priority, self.estimates.getSize(fact_idx)) )
+		return cache.key( rule_pos, rule.rule.gen_snippet(self.source_text), rule.rule, fact_sig, lookup_context.USE_ORD_LOOKUP )
+
 	def get_source(self):
 		return self.ensem_dec.gen_snippet(self.source_text)
 
@@ -99,11 +150,18 @@ class ProgCompilation:
 
 class RuleCompilation:
 
-	def __init__(self, rule, fact_dir, lookup_tables):
+	def __init__(self, rule, fact_dir, lookup_tables, planner=None):
 		self.rule = rule
 		self.join_orderings = []
 		for occ_idx in rule.occ_heads:
-			self.join_orderings.append( JoinOrdering(rule, occ_idx, fact_dir, lookup_tables) )
-
+			self.join_orderings.append( JoinOrdering(rule, occ_idx, fact_dir, lookup_tables, planner=planner) )
 
+	# Registers the lookups of a (cached) rule compilation, in the order they were first registered.
+	def registerLookups(self, lookup_tables):
+		for join_ordering in self.join_orderings:
+			for lookup in join_ordering.registered_lookups:
+				lookup_tables.registerLookup( lookup )
 
+# Compiles a rule in a forked worker, registering its lookups in lookup tables of its own
+def compile_forked_rule((rules,fact_dir,planner), rule_pos):
+	return RuleCompilation(rules[rule_pos], fact_dir, LookupTables( fact_dir ), planner=planner)
@@ -72,35 +72,93 @@ TYPE_MSET = 'ty_mset'
 
 # Base ASTNode class
 
-class ASTNode:
+# Attributes of AST nodes are kept in slots. Source spans (lex_start,lex_end,hl_start,hl_end) are packed
+# into a single tuple, and lists of error indices and supplementary sources are only allocated once
+# needed. Attributes without a slot, added by the analyses, go to the __dict__ of the node, which is
+# only created on demand.
+
+class ASTNode(object):
+
+	__slots__ = ('span','error_list','supp_src_list','trans_text','inferred_type','free_vars_cache','__dict__')
 	
 	def reg_source_info(self, parse_frag, highlight_idx=0):
 		if parse_frag != None:
-			(line_start,line_end) = parse_frag.linespan(0)
 			(lex_start,lex_end)   = parse_frag.lexspan(0)
 			(highlight_start,highlight_end) = parse_frag.lexspan(highlight_idx)
-			self.lex_start = lex_start
-			self.lex_end   = lex_end + 1
-			self.hl_start  = highlight_start
-			self.hl_end    = highlight_end + 1
-			self.has_source_info = True
-			self.error_idxs = []
+			self.span = (lex_start, lex_end + 1, highlight_start, highlight_end + 1)
 			self.adjust_lex()
 		else:
-			self.has_source_info = False
-			self.error_idxs = []
-		self.has_trans = False
-		self.supp_src = []
+			self.span = None
+		self.error_list = None
+		self.supp_src_list = None
+		self.trans_text = None
 		self.inferred_type = None
 
+	def get_span(self, pos, name):
+		if self.span == None:
+			raise AttributeError("'%s' object has no attribute '%s'" % (self.__class__.__name__,name))
+		return self.span[pos]
+
+	def set_span(self, pos, value):
+		span = list(self.span)
+		span[pos] = value
+		self.span = tuple(span)
+
+	lex_start = property(lambda self: self.get_span(0,'lex_start'), lambda self, v: self.set_span(0,v))
+	lex_end   = property(lambda self: self.get_span(1,'lex_end'), lambda self, v: self.set_span(1,v))
+	hl_start  = property(lambda self: self.get_span(2,'hl_start'), lambda self, v: self.set_span(2,v))
+	hl_end    = property(lambda self: self.get_span(3,'hl_end'), lambda self, v: self.set_span(3,v))
+
+	has_source_info = property(lambda self: self.span != None)
+	has_trans = property(lambda self: self.trans_text != None)
+
+	def get_error_idxs(self):
+		if self.error_list == None:
+			return []
+		return self.error_list
+
+	def set_error_idxs(self, error_idxs):
+		self.error_list = error_idxs
+
+	error_idxs = property(get_error_idxs, set_error_idxs)
+
+	def get_supp_src(self):
+		if self.supp_src_list == None:
+			self.supp_src_list = []
+		return self.supp_src_list
+
+	def set_supp_src(self, supp_src):
+		self.supp_src_list = supp_src
+
+	supp_src = property(get_supp_src, set_supp_src)
+
+	# Inferred SMT types are Z3 references, which cannot be pickled (see msrex.frontend.cache). Cached
+	# free variables (see Inspector.free_vars) are only valid within the epoch they were computed in.
+	def __getstate__(self):
+		state = {}
+		if hasattr(self, '__dict__'):
+			state = self.__dict__.copy()
+		slot_state = {}
+		for slot in slot_names(self.__class__):
+			if hasattr(self, slot):
+				slot_state[slot] = getattr(self, slot)
+		for attr in UNPICKLED_ATTRS:
+			if attr in state:
+				del state[attr]
+			if attr in slot_state:
+				del slot_state[attr]
+		return (state if len(state) > 0 else None, slot_state)
+
 	def is_from_source(self):
 		return self.has_source_info
 
 	def extend_error(self, error_idx):
-		self.error_idxs.append(error_idx)
+		if self.error_list == None:
+			self.error_list = []
+		self.error_list.append(error_idx)
 
 	def has_errors(self):
-		return len(self.error_idxs) > 0
+		return self.error_list != None and len(self.error_list) > 0
 
 	def adjust_lex(self):
 		pass
@@ -116,7 +174,6 @@ class ASTNode:
 
 	def add_trans_snippet(self, trans_text):
 		self.trans_text = trans_text
-		self.has_trans  = True
 
 	def gen_snippet(self, source_text):
 		if not self.has_source_info:
@@ -126,9 +183,22 @@ class ASTNode:
 		else:
 			return self.trans_text
 
+UNPICKLED_ATTRS = ['smt_type','free_vars_cache']
+
+SLOT_NAMES = {}
+
+def slot_names(cls):
+	if cls not in SLOT_NAMES:
+		names = []
+		for c in cls.__mro__:
+			names += filter(lambda n: n != '__dict__', c.__dict__.get('__slots__', ()))
+		SLOT_NAMES[cls] = names
+	return SLOT_NAMES[cls]
+
 # Types
 
 class TypeVar(ASTNode):
+	__slots__ = ('name','type_kind')
 	def __init__(self, name, parse_frag=None):
 		self.name = name
 		self.type_kind = TYPE_VAR 
@@ -142,6 +212,7 @@ class TypeVar(ASTNode):
 		return [self.name]
 
 class TypeCons(ASTNode):
+	__slots__ = ('name','type_kind')
 	def __init__(self, name, parse_frag=None):
 		self.name = name
 		self.type_kind = TYPE_CONS
@@ -155,6 +226,7 @@ class TypeCons(ASTNode):
 		return [self.name]
 
 class TypeApp(ASTNode):
+	__slots__ = ('type1','type2','type_kind')
 	def __init__(self, type1, type2, parse_frag=None):
 		self.type1 = type1
 		self.type2 = type2
@@ -164,6 +236,7 @@ class TypeApp(ASTNode):
 		return "%s(%s %s)" % (TYPE_APP,str(self.type1),str(self.type2))
 
 class TypeArrow(ASTNode):
+	__slots__ = ('type1','type2','type_kind')
 	def __init__(self, type1, type2, parse_frag=None):
 		self.type1 = type1
 		self.type2 = type2
@@ -173,6 +246,7 @@ class TypeArrow(ASTNode):
 		return "%s(%s,%s)" % (TYPE_ARR,str(self.type1),str(self.type2))
 
 class TypeTuple(ASTNode):
+	__slots__ = ('types','type_kind')
 	def __init__(self, types, parse_frag=None):
 		self.types = types
 		self.type_kind = TYPE_TUP
@@ -181,6 +255,7 @@ class TypeTuple(ASTNode):
 		return "%s(%s)" % (TYPE_TUP,','.join(map(str,self.types)))
 
 class TypeMSet(ASTNode):
+	__slots__ = ('type','type_kind')
 	def __init__(self, type, parse_frag=None):
 		self.type = type
 		self.type_kind = TYPE_MSET
@@ -189,6 +264,7 @@ class TypeMSet(ASTNode):
 		return "%s(%s)" % (TYPE_MSET,str(self.type))
 
 class TypeList(ASTNode):
+	__slots__ = ('type','type_kind')
 	def __init__(self, type, parse_frag=None):
 		self.type = type
 		self.type_kind = TYPE_LIST
@@ -197,6 +273,7 @@ class TypeList(ASTNode):
 		return "%s(%s)" % (TYPE_LIST,str(self.type))
 
 class FactType(ASTNode):	
+	__slots__ = ('name','types')
 	def __init__(self, name, types, parse_frag=None):
 		self.name = name
 		self.types = types
@@ -205,6 +282,7 @@ class FactType(ASTNode):
 		return "%s(%s)" % (self.name,','.join(map(str,self.types)))
 
 class ExternType(ASTNode):
+	__slots__ = ('name','types')
 	def __init__(self, name, types, parse_frag=None):
 		self.name = name
 		self.types = types
@@ -228,6 +306,7 @@ DEC_EXPORT  = 'dec_export'
 
 
 class PragmaDec(ASTNode):
+	__slots__ = ('pragma_text','pragma_args')
 	def __init__(self, pragma_text, pragma_args=[], parse_frag=None):
 		self.pragma_text = pragma_text
 		self.pragma_args = pragma_args
@@ -236,6 +315,7 @@ class PragmaDec(ASTNode):
 		return "pragma_dec(%s,%s)" % (self.pragma_text,self.pragma_args)
 
 class EnsemDec(ASTNode):
+	__slots__ = ('dec_type','name','decs')
 	def __init__(self, name, decs, parse_frag=None):
 		self.dec_type = DEC_ENSEM
 		self.name = name
@@ -245,6 +325,7 @@ class EnsemDec(ASTNode):
 		return "ensem_dec(%s,[%s])" % (self.name, ','.join(map(str,self.decs)) )
 
 class ExternDec(ASTNode):
+	__slots__ = ('dec_type','name','type_sigs')
 	def __init__(self, name, type_sigs, parse_frag=None):
 		self.dec_type = DEC_EXTERN
 		self.name = name
@@ -257,6 +338,7 @@ class ExternDec(ASTNode):
 		return "extern_dec(%s,[%s])" % (self.name,','.join(strs))
 
 class ExternTypeSig(ASTNode):
+	__slots__ = ('name','type_sig')
 	def __init__(self, name, type_sig, parse_frag=None):
 		self.name = name
 		self.type_sig = type_sig
@@ -268,6 +350,7 @@ class ExternTypeSig(ASTNode):
 		return "%s :: %s" % (self.name,self.type_sig)
 
 class ExecDec(ASTNode):
+	__slots__ = ('dec_type','name','decs')
 	def __init__(self, name, decs, parse_frag=None):
 		self.dec_type = DEC_EXEC
 		self.name = name
@@ -277,6 +360,7 @@ class ExecDec(ASTNode):
 		return "exec_dec(%s,[%s],[%s])" % ( self.name, ','.join(self.locs), ','.join(map(str,self.decs)) )
 
 class ExistDec(ASTNode):
+	__slots__ = ('dec_type','exist_vars')
 	def __init__(self, exist_vars, parse_frag=None):
 		self.dec_type = DEC_EXIST
 		self.exist_vars = exist_vars
@@ -285,6 +369,7 @@ class ExistDec(ASTNode):
 		return "exist_dec([%s])" % (','.join(self.exist_vars))
 
 class ForallDec(ASTNode):
+	__slots__ = ('dec_type','forall_vars')
 	def __init__(self, forall_vars, parse_frag=None):
 		self.dec_type = DEC_FORALL
 		self.forall_vars = forall_vars
@@ -293,6 +378,7 @@ class ForallDec(ASTNode):
 		return "forall_dec([%s])" % (','.join(self.forall_vars))
 
 class LocFactDec(ASTNode):
+	__slots__ = ('dec_type','loc_facts')
 	def __init__(self, loc_facts, parse_frag=None):
 		self.dec_type = DEC_LOCFACT
 		self.loc_facts = loc_facts
@@ -301,6 +387,7 @@ class LocFactDec(ASTNode):
 		return "loc_fact_dec([%s])" % ( ','.join(self.loc_facts) )
 
 class RoleSigDec(ASTNode):
+	__slots__ = ('name','type')
 	def __init__(self, name, type, parse_frag=None):
 		self.name = name
 		self.type = type
@@ -319,6 +406,7 @@ class RoleSigDec(ASTNode):
 			return [self.type]
 
 class RoleDefDec(ASTNode):
+	__slots__ = ('loc','fact','facts','name','where')
 	def __init__(self, loc, fact, facts, where=[], parse_frag=None): 
 		self.loc  = loc
 		self.fact = fact
@@ -345,6 +433,7 @@ TRIGGER_FACT  = 'trigger'
 ACTUATOR_FACT = 'actuator'
 
 class FactDec(ASTNode):
+	__slots__ = ('dec_type','type','name','modifiers','persistent','local','monotone','uses_priority','fact_role','exported_queries')
 	def __init__(self, modifiers, name, type, fact_role=MATCH_FACT, parse_frag=None):
 		self.dec_type = DEC_FACT
 		self.type = type
@@ -371,6 +460,7 @@ class FactDec(ASTNode):
 			return [self.type]
 
 class FactDecs(ASTNode):
+	__slots__ = ('fact_decs',)
 	def __init__(self, fact_decs, parse_frag=None):
 		self.fact_decs = fact_decs
 		self.reg_source_info(parse_frag)
@@ -382,6 +472,7 @@ TRIGGER_EXPORT = 'trigger'
 ACTUATOR_EXPORT = 'actuator'
 
 class ExportDec(ASTNode):
+	__slots__ = ('dec_type','export_sort','arg')
 	def __init__(self, export_sort, arg, parse_frag=None):
 		self.dec_type = DEC_EXPORT
 		self.export_sort = export_sort
@@ -395,6 +486,7 @@ STORAGE  = 'storage'
 EXTVIEW  = 'extview'
 
 class FactMod(ASTNode):
+	__slots__ = ('name','args')
 	def __init__(self, name, args, parse_frag=None):
 		self.name = name
 		self.args = args
@@ -403,6 +495,7 @@ class FactMod(ASTNode):
 		return "fact_mod(%s,%s)" % (self.name,self.args)
 
 class RuleDec(ASTNode):
+	__slots__ = ('dec_type','name','slhs','plhs','grd','rhs','where','exists')
 	def __init__(self, name, lhs, rhs, where=None, exists=None, parse_frag=None):
 		self.dec_type = DEC_RULE
 		self.name = name
@@ -424,6 +517,7 @@ class RuleDec(ASTNode):
 		return "rule_dec(%s,[%s],[%s],[%s],[%s],[%s],[%s])" % (str(self.name), ','.join( map(str,self.slhs) ), ','.join( map(str,self.plhs) ), ','.join( map(str,self.grd) ), ','.join(map(str,self.exists)), ','.join(map(str,self.rhs)) , ','.join(map(str,self.where)) )
 
 class InitDec(ASTNode):
+	__slots__ = ('locs','fact')
 	def __init__(self, locs, fact_base, parse_frag=None):
 		self.locs = locs
 		self.fact = fact_base
@@ -432,6 +526,7 @@ class InitDec(ASTNode):
 		return "init_dec([%s],%s)" % (','.join(map(lambda l: str(l),self.locs)), self.fact)
 
 class AssignDec(ASTNode):
+	__slots__ = ('dec_type','term_pat','builtin_exp')
 	def __init__(self, term_pat, builtin_exp, parse_frag=None):
 		self.dec_type = DEC_ASSIGN
 		self.term_pat = term_pat
@@ -450,6 +545,7 @@ FACT_LOC_CLUSTER = 'fact_loc_cluster'
 FACT_COMPRE = 'fact_compre'
 
 class FactBase(ASTNode):
+	__slots__ = ('name','terms','fact_type','priority','local','monotone','collision_idx','unique_head')
 	def __init__(self, name, terms, priority=None, parse_frag=None):
 		self.name      = name
 		self.terms     = terms
@@ -462,6 +558,7 @@ class FactBase(ASTNode):
 		return "%s(%s)" % (str(self.name),','.join(map(str,self.terms)))
 
 class FactLoc(ASTNode):
+	__slots__ = ('loc','fact','fact_type','priority')
 	def __init__(self, loc, fact, priority=None, parse_frag=None):
 		self.loc       = loc
 		self.fact      = fact
@@ -472,6 +569,7 @@ class FactLoc(ASTNode):
 		return "[%s]%s" % (str(self.loc),str(self.fact))
 
 class FactLocCluster(ASTNode):
+	__slots__ = ('loc','facts','fact_type','priority')
 	def __init__(self, loc, facts, priority=None, parse_frag=None):
 		self.loc       = loc
 		self.facts     = facts
@@ -490,6 +588,7 @@ COMP_ONE_OR_MORE = 1
 COMP_ANY = 2
 
 class FactCompre(ASTNode):
+	__slots__ = ('facts','comp_ranges','guards','fact_type','priority','compre_mod')
 	def __init__(self, facts, comp_ranges, guards, priority=None, compre_mod=COMP_ANY, parse_frag=None):
 		self.facts = facts
 		self.comp_ranges = comp_ranges
@@ -511,6 +610,7 @@ class FactCompre(ASTNode):
 		return "factcompre(%s|%s|%s)" % (fact_str,comp_range_str,guard_str)
 
 class CompRange(ASTNode):
+	__slots__ = ('term_vars','term_range')
 	def __init__(self, term_vars, term_range, parse_frag=None):
 		self.term_vars  = term_vars
 		self.term_range = term_range
@@ -521,6 +621,7 @@ class CompRange(ASTNode):
 GUARD = 'guard'
 
 class Guard(ASTNode):
+	__slots__ = ('term',)
 	def __init__(self, term, parse_frag=None):
 		self.term = term
 		self.reg_source_info(parse_frag)
@@ -545,6 +646,7 @@ TERM_ENUM_MSET = 'tm_enum_mset'
 TERM_COMPRE = 'tm_compre'
 
 class TermCons(ASTNode):
+	__slots__ = ('name','term_type','type','smt_type')
 	def __init__(self, name, parse_frag=None):
 		self.name = name
 		self.term_type = TERM_CONS
@@ -558,6 +660,7 @@ class TermCons(ASTNode):
 		return (self.name)
 
 class TermVar(ASTNode):
+	__slots__ = ('name','term_type','rule_idx','type','smt_type')
 	def __init__(self, name, parse_frag=None):
 		self.name = name
 		self.term_type = TERM_VAR
@@ -581,6 +684,7 @@ class TermVar(ASTNode):
 			return self.name == other.name
 
 class TermApp(ASTNode):
+	__slots__ = ('term1','term2','term_type','type','smt_type')
 	def __init__(self, term1, term2, parse_frag=None):
 		self.term1 = term1
 		self.term2 = term2
@@ -591,6 +695,7 @@ class TermApp(ASTNode):
 		return "%s(%s)" % (self.term1,self.term2)
 
 class TermTuple(ASTNode):
+	__slots__ = ('terms','term_type','type','smt_type')
 	def __init__(self, terms, parse_frag=None):
 		self.terms = terms
 		self.term_type = TERM_TUPLE
@@ -599,6 +704,7 @@ class TermTuple(ASTNode):
 		return "(%s)" % (','.join(map(str,self.terms)))
 
 class TermList(ASTNode):
+	__slots__ = ('terms','term_type','type','smt_type')
 	def __init__(self, terms, parse_frag=None):
 		self.terms = terms
 		self.term_type = TERM_LIST
@@ -607,6 +713,7 @@ class TermList(ASTNode):
 		return "[%s]" % (','.join(map(str,self.terms)))
 
 class TermListCons(ASTNode):
+	__slots__ = ('term1','term2','term_type','type','smt_type')
 	def __init__(self, term1, term2, parse_frag=None):
 		self.term1 = term1
 		self.term2 = term2
@@ -616,6 +723,7 @@ class TermListCons(ASTNode):
 		return "[%s|%s]" % (self.term1,self.term2)
 
 class TermMSet(ASTNode):
+	__slots__ = ('terms','term_type','type','smt_type')
 	def __init__(self, terms, parse_frag=None):
 		self.terms = terms
 		self.term_type = TERM_MSET
@@ -624,6 +732,7 @@ class TermMSet(ASTNode):
 		return "{%s}" % (','.join(map(str,self.terms)))
 
 class TermEnumMSet(ASTNode):
+	__slots__ = ('texp1','texp2','term_type','type','smt_type')
 	def __init__(self, texp1, texp2, parse_frag=None):
 		self.texp1 = texp1
 		self.texp2 = texp2
@@ -632,6 +741,7 @@ class TermEnumMSet(ASTNode):
 		return "{%s..%s}" % (self.texp1,self.texp2)
 
 class TermCompre(ASTNode):
+	__slots__ = ('term','comp_ranges','guards','term_type','type','smt_type')
 	def __init__(self, term, comp_ranges, guards, parse_frag=None):
 		self.term = term
 		self.comp_ranges = comp_ranges
@@ -650,6 +760,7 @@ class TermCompre(ASTNode):
 		return "{%s|%s. %s}" % (self.term,comp_range_str,guard_str)
 
 class TermBinOp(ASTNode):
+	__slots__ = ('term1','term2','op','term_type','type','smt_type')
 	def __init__(self, term1, binop, term2, parse_frag=None):
 		self.term1 = term1
 		self.term2 = term2
@@ -665,6 +776,7 @@ class TermBinOp(ASTNode):
 		return "%s %s %s" % (str(self.term1),self.op,str(self.term2))
 
 class TermUnaryOp(ASTNode):
+	__slots__ = ('term','op','term_type','type','smt_type')
 	def __init__(self, unaop, term, parse_frag=None):
 		self.term = term
 		self.op = unaop
@@ -674,6 +786,7 @@ class TermUnaryOp(ASTNode):
 		return "%s(%s %s)" % (TERM_UNAOP,self.op,str(self.term))
 
 class TermLit(ASTNode):
+	__slots__ = ('literal','type','term_type','smt_type')
 	def __init__(self, literal, ty, parse_frag=None):
 		self.literal = literal
 		self.type    = TypeCons( ty )
@@ -688,6 +801,7 @@ class TermLit(ASTNode):
 		return (self.literal)
 
 class TermUnderscore(ASTNode):
+	__slots__ = ('term_type','rule_idx','type','smt_type')
 	def __init__(self, parse_frag=None):
 		self.term_type = TERM_UNDERSCORE
 		self.reg_source_info(parse_frag)
@@ -148,3 +148,7 @@ t_CRPAREN  = r'\}'
 t_ASSIGN   = r'='
 
 
+
+# Same error as PLY raises without an error rule. An explicit rule is needed for optimized lexer tables.
+def t_error(t):
+	raise lex.LexError("Illegal character '%s' at index %d" % (t.value[0],t.lexpos), t.value)
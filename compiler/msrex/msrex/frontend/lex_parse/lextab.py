@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('ACTUATOR', 'ARROW', 'AS', 'ASSIGN', 'AT', 'BACK', 'BANG', 'BAR', 'CALLS', 'CHAR', 'CLPAREN', 'COLON', 'COMMA', 'CRPAREN', 'DIV', 'DQUOTE', 'ENSEM', 'EQUAL', 'EXEC', 'EXISTS', 'EXPORT', 'EXTERN', 'FACT', 'FLOAT', 'FORALL', 'GEQ', 'IMPLIES', 'IMPORT', 'IN', 'INIT', 'INT', 'LEQ', 'MINUS', 'MODULE', 'NAME', 'NEQ', 'PLUS', 'PRAGMA', 'PRED', 'PRIORITY', 'QUERY', 'RLPAREN', 'ROLE', 'RRPAREN', 'RULE', 'SLPAREN', 'SRPAREN', 'STOP', 'STRING', 'SUCH', 'THAT', 'TIMES', 'TLPAREN', 'TRIGGER', 'TRPAREN', 'UNDERSCORE', 'UNIDIS', 'VARIABLE', 'WHERE', 'WITH'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_FLOAT>[0-9][0-9]*\\.[0-9][0-9]*)|(?P<t_INT>[0-9][0-9]*)|(?P<t_NAME>[a-z][a-zA-Z0-9_]*)|(?P<t_STRING>\\"[a-zA-Z0-9_+ !%]*\\")|(?P<t_CHAR>\\\'[a-zA-Z0-9_+ ]\\\')|(?P<t_VARIABLE>[A-Z][a-zA-Z0-9_]*)|(?P<t_IMPLIES>\\-\\-o)|(?P<t_ignore_COMMENT>//.*)|(?P<t_ARROW>\\->)|(?P<t_UNIDIS><\\-)|(?P<t_BAR>\\|)|(?P<t_GEQ>>=)|(?P<t_UNDERSCORE>\\_)|(?P<t_CLPAREN>\\{)|(?P<t_MINUS>\\-)|(?P<t_NEQ>!=)|(?P<t_DQUOTE>\\")|(?P<t_PLUS>\\+)|(?P<t_RLPAREN>\\()|(?P<t_LEQ><=)|(?P<t_CRPAREN>\\})|(?P<t_SRPAREN>\\])|(?P<t_EQUAL>==)|(?P<t_BACK>\\\\)|(?P<t_SLPAREN>\\[)|(?P<t_STOP>\\.)|(?P<t_RRPAREN>\\))|(?P<t_TIMES>\\*)|(?P<t_TLPAREN><)|(?P<t_BANG>!)|(?P<t_DIV>/)|(?P<t_ASSIGN>=)|(?P<t_TRPAREN>>)|(?P<t_COMMA>,)|(?P<t_AT>@)|(?P<t_COLON>:)', [None, ('t_FLOAT', 'FLOAT'), ('t_INT', 'INT'), ('t_NAME', 'NAME'), (None, 'STRING'), (None, 'CHAR'), (None, 'VARIABLE'), (None, 'IMPLIES'), (None, None), (None, 'ARROW'), (None, 'UNIDIS'), (None, 'BAR'), (None, 'GEQ'), (None, 'UNDERSCORE'), (None, 'CLPAREN'), (None, 'MINUS'), (None, 'NEQ'), (None, 'DQUOTE'), (None, 'PLUS'), (None, 'RLPAREN'), (None, 'LEQ'), (None, 'CRPAREN'), (None, 'SRPAREN'), (None, 'EQUAL'), (None, 'BACK'), (None, 'SLPAREN'), (None, 'STOP'), (None, 'RRPAREN'), (None, 'TIMES'), (None, 'TLPAREN'), (None, 'BANG'), (None, 'DIV'), (None, 'ASSIGN'), (None, 'TRPAREN'), (None, 'COMMA'), (None, 'AT'), (None, 'COLON')])]}
+_lexstateignore = {'INITIAL': ' \t\n'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
@@ -28,6 +28,8 @@ Foundation). The statements made herein are solely the responsibility of the aut
 from msrex.frontend.lex_parse.lexer import *
 from msrex.frontend.lex_parse.ast import *
 
+import os
+
 import ply.lex
 import ply.yacc as yacc
 
@@ -56,7 +58,9 @@ def p_pragma_declaration(p):
 def p_pragma_name_list(p):
 	'''
 	pragma_name_list : NAME pragma_name_list
+                         | INT pragma_name_list
                          | NAME
+                         | INT
 	'''
 	if len(p) == 3:
 		p[0] = [p[1]] + p[2]
@@ -795,19 +799,53 @@ for n in ast:
 	print str(n)
 '''
 
+# The lexer and LALR parser are built once and reused across parses. They are built from the tables
+# shipped with this package (lextab.py and parsetab.py). In optimized mode, PLY does not check these
+# tables against the grammar, so they must be rebuilt (python -m msrex.frontend.lex_parse.parser)
+# whenever the lexer or the grammar changes.
+
+LEX_TAB   = 'msrex.frontend.lex_parse.lextab'
+PARSE_TAB = 'msrex.frontend.lex_parse.parsetab'
+
+LEXER  = None
+PARSER = None
+
+def get_parser():
+	global LEXER, PARSER
+	if PARSER == None:
+		LEXER  = lex.lex(optimize=1, lextab=LEX_TAB)
+		PARSER = yacc.yacc(optimize=1, tabmodule=PARSE_TAB, debug=False)
+	return (LEXER, PARSER)
+
+# Parses input from position start onwards, so that source spans of the parsed nodes index into input.
+def parse(input, start=0):
+	(lexer,parser) = get_parser()
+	lexer.lineno = 1
+	lexer.input(input)
+	lexer.lexpos = start
+	return parser.parse(None, lexer=lexer, tracking=True)
+
+# Regenerates the shipped lexer and parser tables.
+def build_tables():
+	tab_dir = os.path.dirname( os.path.abspath(__file__) )
+	for tab_name in [LEX_TAB, PARSE_TAB]:
+		for ext in ['py','pyc']:
+			tab_file = os.path.join(tab_dir, "%s.%s" % (tab_name.split('.')[-1],ext))
+			if os.path.exists(tab_file):
+				os.remove(tab_file)
+	global LEXER, PARSER
+	LEXER  = None
+	PARSER = None
+	get_parser()
+
 def run_parser(file):
-	lex.lex()
 	f = open(file)
-	yacc.yacc()
 	input = f.read()
-	# print "\033[41m" + input[94:134] + "\033[0m Ha ha"
-	ast = yacc.parse(input, tracking=True)
-	return (input, ast)
+	return (input, parse(input))
 
-def run_parser_input(input):
-	lex.lex()
-	yacc.yacc()
-	ast = yacc.parse(input, tracking=True)
-	return ast
+def run_parser_input(input, start=0):
+	return parse(input, start=start)
 
+if __name__ == "__main__":
+	build_tables()
 
@@ -0,0 +1,179 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'ACTUATOR ARROW AS ASSIGN AT BACK BANG BAR CALLS CHAR CLPAREN COLON COMMA CRPAREN DIV DQUOTE ENSEM EQUAL EXEC EXISTS EXPORT EXTERN FACT FLOAT FORALL GEQ IMPLIES IMPORT IN INIT INT LEQ MINUS MODULE NAME NEQ PLUS PRAGMA PRED PRIORITY QUERY RLPAREN ROLE RRPAREN RULE SLPAREN SRPAREN STOP STRING SUCH THAT TIMES TLPAREN TRIGGER TRPAREN UNDERSCORE UNIDIS VARIABLE WHERE WITH\n\tdeclarations : declaration declarations\n                     |\n\t\n\tdeclaration : PRAGMA NAME STOP\n                    | PRAGMA NAME pragma_name_list STOP\n\t\n\tpragma_name_list : NAME pragma_name_list\n                         | INT pragma_name_list\n                         | NAME\n                         | INT\n\t\n\tdeclaration : assign_stmt STOP\n\t\n\tdeclaration : ENSEM NAME CLPAREN declarations CRPAREN\n\t\n\tdeclaration : EXTERN mod_name_top extern_list\n                    | MODULE mod_name_top IMPORT extern_list\n\t\n\tmod_name_top : DQUOTE mod_name DQUOTE\n                     | TLPAREN mod_name TRPAREN\n                     | mod_name\n\t\n\tmod_name : NAME DIV mod_name\n                 | NAME STOP mod_name\n                 | NAME\n\t\t | VARIABLE\n\t\n\textern_list : CLPAREN extern_elems CRPAREN \n                    | extern_elem STOP\n\t\n\textern_elems : extern_elem COMMA extern_elems\n                     | extern_elem\n\t\n\textern_elems : extern_elem STOP extern_elems\n                     | extern_elem STOP\n\t\n\textern_elem : NAME COLON COLON type \n\t\n\tdeclaration : PRED NAME COLON COLON fact_sort STOP\n                    | PRED NAME COLON COLON type ARROW fact_sort STOP\n\t\n        declaration : PRED NAME COLON COLON fact_sort WHERE typemodifiers STOP\n\t            | PRED NAME COLON COLON type ARROW fact_sort WHERE typemodifiers STOP\n\t\n\tfact_sort : FACT\n\t\n\tfact_sort : TRIGGER\n\t\n\tfact_sort : ACTUATOR\n\t\n\tdeclaration : EXPORT QUERY fact STOP\n\t\n\tdeclaration : EXEC NAME CLPAREN declarations CRPAREN\n\t\n\tdeclaration : EXISTS var_list STOP\n\t\n\tdeclaration : FORALL var_list STOP\n\t\n\tdeclaration : rule_rhs STOP\n\t\n\tloc_name_list : NAME COMMA loc_name_list\n                      | NAME\n\t\n\tdeclaration : ROLE NAME COLON COLON type STOP\n\t\n\tdeclaration : ROLE SLPAREN location SRPAREN fact ASSIGN rule_rhs STOP\n                    | ROLE SLPAREN location SRPAREN fact ASSIGN rule_rhs WHERE assign_stmts STOP\n\t\n\tdeclaration : INIT var_list AS fact STOP\n\t\n\tdeclaration : RULE NAME COLON COLON rule_lhs IMPLIES exists_dec rule_rhs STOP\n                    | RULE NAME COLON COLON rule_lhs IMPLIES exists_dec rule_rhs WHERE assign_stmts STOP\n\t\n\texists_dec : EXISTS var_list STOP\n                   |\n\t\n\tassign_stmts : assign_stmt COMMA assign_stmts\n\t             | assign_stmt\n\tassign_stmt : term ASSIGN term\n\tvar_list : var_atom COMMA var_list\n\t         | var_atom\n\t\n\tvar_atom : VARIABLE\n\tlocation : VARIABLElocation : NAMElocation : INT\n\trule_lhs : rule_heads\n\t\n\trule_lhs : rule_heads BACK rule_heads\n                 | rule_heads BACK rule_heads BAR guards\n\t\n\trule_lhs : rule_heads BAR guards\n\t\n\trule_heads : lhs_pat COMMA rule_heads\n                   | lhs_pat  \n\t\n\trule_heads : INT\n\t\n\tlhs_pat : loc_fact\n\t\t| fact_comp_pat\n\tlhs_pat : INT\n\trule_rhs : rhs_pat COMMA rule_rhs\n\t         | rhs_pat\n\trule_rhs : INT\n\trhs_pat : loc_fact\n\t        | fact_comp_pat\n\t\n\trhs_pat : loc_fact PRIORITY INT\n\t        | fact_comp_pat PRIORITY INT\n\trhs_pat : INT\n\tfact_comp_pat : CLPAREN loc_fact_list BAR comp_ranges STOP guards CRPAREN comp_option\n                      | CLPAREN loc_fact_list BAR comp_ranges CRPAREN comp_option\n\t\n\tfact_comp_pat : CLPAREN loc_fact_list BAR guards CRPAREN comp_option\n                      | CLPAREN loc_fact_list CRPAREN comp_option\n\t\n\tfact_comp_pat : MINUS CLPAREN loc_fact_list BAR guards CRPAREN\n                      | MINUS CLPAREN loc_fact_list CRPAREN\n\t\n\tcomp_option : PLUS\n                    | \n\t\n\tcomp_ranges : comp_range COMMA comp_ranges\n                    | comp_range\n\t\n\tcomp_range : term UNIDIS term\n                   | term ARROW term\n\t\n\tloc_fact : fact\n                 | SLPAREN location SRPAREN fact\n                 | SLPAREN location SRPAREN RLPAREN fact_list RRPAREN \n\t\n\tfact_list : fact COMMA fact_list\n\t          | fact\n\t\n\tloc_fact_list : loc_fact COMMA loc_fact_list\n\t              | loc_fact\n\t\n\tfact : NAME RLPAREN termargs RRPAREN\n             | NAME RLPAREN RRPAREN \n\t\n\tguards : term COMMA guards\n               | term\n\t\n\ttermargs : term\n\t         | term COMMA termargs\n\t\n\tterm : simp_term\n             | simp_term term\n\t\n\tterm : simp_term term_binop simp_term\n\t     | term_unaryop simp_term\n\t\n\tterm_binop : NEQ\n\t           | EQUAL\n\t           | LEQ\n\t           | GEQ\n\t           | TLPAREN\n\t           | TRPAREN\n\t           | IN\n\t           | PLUS\n\t           | MINUS\n\t           | TIMES\n\t           | DIV\n\t           | COLON\n\t\n\tterm_unaryop : MINUS\n\t\n\tsimp_term : RLPAREN termargs RRPAREN\n\t          | RLPAREN RRPAREN\n\t\n\tsimp_term : SLPAREN termargs SRPAREN\n\t          | SLPAREN SRPAREN\n\t\n\tsimp_term : SLPAREN term BAR term SRPAREN\n\t\n\tsimp_term : CLPAREN termargs CRPAREN\n\t          | CLPAREN CRPAREN\n\t\n\tsimp_term : CLPAREN term BAR comp_ranges STOP guards CRPAREN\n                  | CLPAREN term BAR comp_ranges CRPAREN\n\t\n\tsimp_term : CLPAREN term STOP STOP term CRPAREN\n\tsimp_term : RLPAREN term RRPARENsimp_term : UNDERSCOREsimp_term : NAMEsimp_term : VARIABLEsimp_term : FLOATsimp_term : INTsimp_term : STRINGsimp_term : CHAR\n\ttypemodifiers : typemodifier\n\t              | typemodifiers COMMA typemodifier\n\t\n\ttypemodifier : NAME\n\t\n\ttypeargs : type\n\t         | type COMMA typeargs\n\t\n\ttype : singletype\n\t     | singletype type\n\tsingletype : type ARROW typesingletype : RLPAREN typeargs RRPARENsingletype : CLPAREN type CRPARENsingletype : SLPAREN type SRPARENsingletype : RLPAREN type RRPARENsingletype : NAMEsingletype : VARIABLE'
+    
+_lr_action_items = {'TLPAREN':([5,7,9,17,21,22,24,26,27,33,39,43,48,49,60,61,63,64,105,111,112,124,192,207,235,261,],[-135,-129,53,-134,88,53,-131,-130,-133,-132,-124,-133,-130,-119,-121,-131,-130,-133,-123,-118,-128,-120,-126,-122,-127,-125,]),'BAR':([5,7,17,21,24,26,33,34,37,39,42,43,44,48,49,60,61,62,63,64,66,87,105,109,111,112,124,127,139,144,155,161,162,177,179,186,192,196,198,207,210,211,212,214,215,235,236,238,243,245,261,262,264,266,280,],[-135,-129,-134,-101,-131,-130,-132,-88,-94,-124,106,-133,110,-130,-119,-121,-131,126,-130,-133,-104,-102,-123,-83,-118,-128,-120,180,-103,-96,-93,-79,-82,-89,-81,-95,-126,-83,-83,-122,-63,-66,247,-64,-65,-127,-77,-78,-90,-80,-125,-83,-62,281,-76,]),'ARROW':([5,7,17,21,24,33,39,43,48,49,60,66,87,105,111,112,124,139,158,165,192,207,220,224,226,227,229,235,240,252,253,255,256,261,272,273,274,276,278,287,],[-135,-129,-134,-101,-131,-132,-124,-133,-130,-119,-121,-104,-102,-123,-118,-128,-120,-103,194,194,-126,-122,-148,-149,-141,257,259,-127,259,259,259,259,259,-125,-145,-146,-144,-147,259,259,]),'CLPAREN':([0,3,4,5,7,10,11,12,17,21,23,24,26,27,33,38,39,41,43,45,48,49,51,52,55,56,57,60,61,63,64,68,74,75,76,77,78,79,80,81,82,83,84,85,86,88,89,92,93,95,101,105,106,108,110,111,112,115,116,124,126,132,133,134,135,140,153,159,166,171,172,173,174,175,180,181,185,187,188,190,191,192,193,194,197,199,200,201,202,207,216,217,219,220,221,222,224,226,235,246,247,248,249,250,256,257,258,259,260,261,267,272,273,274,275,276,278,281,284,288,290,291,293,294,295,301,302,303,304,],[3,41,41,-135,-129,41,65,41,-134,41,3,-131,-130,-133,-132,-117,-124,41,-133,41,-130,-119,115,118,-19,-15,-18,-121,-131,-130,-133,-9,134,136,41,-106,-115,-113,-105,-110,-108,-116,-112,-111,-114,-109,-107,41,41,-38,-3,-123,41,41,41,-118,-128,3,-11,-120,41,-37,-36,3,65,118,-4,41,-34,-21,-14,-13,-16,-17,41,136,-12,219,219,41,41,-126,41,41,41,41,-10,219,-20,-122,-44,-35,219,-148,219,219,-149,219,-127,136,41,136,-48,-27,-142,219,-41,219,136,-125,136,-145,-146,-144,219,-147,-143,41,-29,-28,41,-42,-45,41,-47,-30,-43,41,-46,]),'RLPAREN':([0,3,4,5,7,10,11,12,17,21,23,24,26,27,33,38,39,41,43,45,48,49,60,61,63,64,68,76,77,78,79,80,81,82,83,84,85,86,88,89,92,93,95,101,105,106,108,110,111,112,113,115,116,124,125,126,132,133,134,153,159,166,171,180,185,187,188,190,191,192,193,194,197,199,200,201,202,207,216,217,219,220,221,222,224,226,235,247,250,256,257,258,259,261,272,273,274,275,276,278,281,284,288,290,291,293,294,301,302,303,304,],[4,4,4,-135,-129,4,-117,4,-134,4,4,-131,93,-133,-132,-117,-124,4,-133,4,-130,-119,-121,-131,-130,-133,-9,4,-106,-115,-113,-105,-110,-108,-116,-112,-111,-114,-109,-107,4,4,-38,-3,-123,4,4,4,-118,-128,93,4,-11,-120,176,4,-37,-36,4,-4,4,-34,-21,4,-12,222,222,4,4,-126,4,4,4,4,-10,222,-20,-122,-44,-35,222,-148,222,222,-149,222,-127,4,-27,-142,222,-41,222,-125,-145,-146,-144,222,-147,-143,4,-29,-28,4,-42,-45,4,-30,-43,4,-46,]),'CHAR':([0,3,4,5,7,10,11,12,17,21,23,24,26,27,33,38,39,41,43,45,48,49,60,61,63,64,68,76,77,78,79,80,81,82,83,84,85,86,88,89,92,93,95,101,105,106,108,110,111,112,115,116,124,126,132,133,134,153,159,166,171,180,185,190,191,192,193,194,197,199,200,202,207,216,217,235,247,250,258,261,281,284,288,290,291,293,294,301,302,303,304,],[5,5,5,-135,-129,5,-117,5,-134,5,5,-131,-130,-133,-132,-117,-124,5,-133,5,-130,-119,-121,-131,-130,-133,-9,5,-106,-115,-113,-105,-110,-108,-116,-112,-111,-114,-109,-107,5,5,-38,-3,-123,5,5,5,-118,-128,5,-11,-120,5,-37,-36,5,-4,5,-34,-21,5,-12,5,5,-126,5,5,5,5,-10,-20,-122,-44,-35,-127,5,-27,-41,-125,5,-29,-28,5,-42,-45,5,-30,-43,5,-46,]),'COLON':([5,7,17,21,24,26,27,33,39,43,48,49,60,61,63,64,67,94,97,105,111,112,117,124,129,145,147,168,192,207,235,261,],[-135,-129,-134,83,-131,-130,-133,-132,-124,-133,-130,-119,-121,-131,-130,-133,129,145,147,-123,-118,-128,168,-120,181,187,188,201,-126,-122,-127,-125,]),'EXPORT':([0,23,68,95,101,115,116,132,133,134,153,166,171,185,200,202,216,217,250,258,284,288,291,293,301,302,304,],[6,6,-9,-38,-3,6,-11,-37,-36,6,-4,-34,-21,-12,-10,-20,-44,-35,-27,-41,-29,-28,-42,-45,-30,-43,-46,]),'DQUOTE':([9,22,55,57,121,174,175,],[54,54,-19,-18,173,-16,-17,]),'UNDERSCORE':([0,3,4,5,7,10,11,12,17,21,23,24,26,27,33,38,39,41,43,45,48,49,60,61,63,64,68,76,77,78,79,80,81,82,83,84,85,86,88,89,92,93,95,101,105,106,108,110,111,112,115,116,124,126,132,133,134,153,159,166,171,180,185,190,191,192,193,194,197,199,200,202,207,216,217,235,247,250,258,261,281,284,288,290,291,293,294,301,302,303,304,],[7,7,7,-135,-129,7,-117,7,-134,7,7,-131,-130,-133,-132,-117,-124,7,-133,7,-130,-119,-121,-131,-130,-133,-9,7,-106,-115,-113,-105,-110,-108,-116,-112,-111,-114,-109,-107,7,7,-38,-3,-123,7,7,7,-118,-128,7,-11,-120,7,-37,-36,7,-4,7,-34,-21,7,-12,7,7,-126,7,7,7,7,-10,-20,-122,-44,-35,-127,7,-27,-41,-125,7,-29,-28,7,-42,-45,7,-30,-43,7,-46,]),'ENSEM':([0,23,68,95,101,115,116,132,133,134,153,166,171,185,200,202,216,217,250,258,284,288,291,293,301,302,304,],[8,8,-9,-38,-3,8,-11,-37,-36,8,-4,-34,-21,-12,-10,-20,-44,-35,-27,-41,-29,-28,-42,-45,-30,-43,-46,]),'EXTERN':([0,23,68,95,101,115,116,132,133,134,153,166,171,185,200,202,216,217,250,258,284,288,291,293,301,302,304,],[9,9,-9,-38,-3,9,-11,-37,-36,9,-4,-34,-21,-12,-10,-20,-44,-35,-27,-41,-29,-28,-42,-45,-30,-43,-46,]),'DIV':([5,7,17,21,24,26,27,33,39,43,48,49,57,60,61,63,64,105,111,112,124,192,207,235,261,],[-135,-129,-134,78,-131,-130,-133,-132,-124,-133,-130,-119,122,-121,-131,-130,-133,-123,-118,-128,-120,-126,-122,-127,-125,]),'SLPAREN':([0,3,4,5,7,10,11,12,17,21,23,24,26,27,32,33,38,39,41,43,45,48,49,60,61,63,64,65,68,75,76,77,78,79,80,81,82,83,84,85,86,88,89,92,93,95,101,104,105,106,108,110,111,112,115,116,124,126,132,133,134,136,153,159,166,171,180,181,185,187,188,190,191,192,193,194,197,199,200,201,202,207,216,217,219,220,221,222,224,226,235,246,247,248,249,250,256,257,258,259,260,261,267,272,273,274,275,276,278,281,284,288,290,291,293,294,295,301,302,303,304,],[10,10,45,-135,-129,45,-117,45,-134,45,10,-131,-130,-133,98,-132,-117,-124,45,-133,45,-130,-119,-121,-131,-130,-133,128,-9,128,45,-106,-115,-113,-105,-110,-108,-116,-112,-111,-114,-109,-107,45,45,-38,-3,128,-123,45,45,45,-118,-128,10,-11,-120,45,-37,-36,10,128,-4,45,-34,-21,45,128,-12,221,221,45,45,-126,45,45,45,45,-10,221,-20,-122,-44,-35,221,-148,221,221,-149,221,-127,128,45,128,-48,-27,-142,221,-41,221,128,-125,128,-145,-146,-144,221,-147,-143,45,-29,-28,45,-42,-45,45,-47,-30,-43,45,-46,]),'MINUS':([0,3,4,5,7,10,17,21,23,24,26,27,33,39,41,43,45,48,49,60,61,63,64,68,75,92,93,95,101,105,106,108,110,111,112,115,116,124,126,132,133,134,153,159,166,171,180,181,185,190,191,192,193,194,197,199,200,202,207,216,217,235,246,247,248,249,250,258,260,261,267,281,284,288,290,291,293,294,295,301,302,303,304,],[11,38,38,-135,-129,38,-134,79,11,-131,-130,-133,-132,-124,38,-133,38,-130,-119,-121,-131,-130,-133,-9,135,38,38,-38,-3,-123,38,38,38,-118,-128,11,-11,-120,38,-37,-36,11,-4,38,-34,-21,38,135,-12,38,38,-126,38,38,38,38,-10,-20,-122,-44,-35,-127,135,38,135,-48,-27,-41,135,-125,135,38,-29,-28,38,-42,-45,38,-47,-30,-43,38,-46,]),'NEQ':([5,7,17,21,24,26,27,33,39,43,48,49,60,61,63,64,105,111,112,124,192,207,235,261,],[-135,-129,-134,80,-131,-130,-133,-132,-124,-133,-130,-119,-121,-131,-130,-133,-123,-118,-128,-120,-126,-122,-127,-125,]),'TRPAREN':([5,7,17,21,24,26,27,33,39,43,48,49,55,57,60,61,63,64,105,111,112,120,124,174,175,192,207,235,261,],[-135,-129,-134,81,-131,-130,-133,-132,-124,-133,-130,-119,-19,-18,-121,-131,-130,-133,-123,-118,-128,172,-120,-16,-17,-126,-122,-127,-125,]),'CRPAREN':([3,5,7,17,21,23,24,26,33,34,37,39,40,41,42,43,44,48,49,60,66,68,87,91,95,101,105,111,112,115,116,124,127,132,133,134,139,143,144,153,155,156,157,160,163,164,165,166,167,169,170,171,177,184,185,186,192,195,200,202,203,207,208,209,216,217,220,224,226,231,232,233,234,235,237,239,240,241,242,243,250,252,256,258,261,272,273,274,276,278,284,288,291,293,301,302,304,],[39,-135,-129,-134,-101,-2,-131,-130,-132,-88,-94,-124,105,39,-99,-133,109,-130,-119,-121,-104,-9,-102,-1,-38,-3,-123,-118,-128,-2,-11,-120,179,-37,-36,-2,-103,-99,-96,-4,-93,-85,192,-100,196,198,-98,-34,200,202,-23,-21,-89,217,-12,-95,-126,235,-10,-20,-25,-122,-98,245,-44,-35,-148,-149,-141,-84,261,-86,-87,-127,262,-97,-26,-24,-22,-90,-27,272,-142,-41,-125,-145,-146,-144,-147,-143,-29,-28,-42,-45,-30,-43,-46,]),'RULE':([0,23,68,95,101,115,116,132,133,134,153,166,171,185,200,202,216,217,250,258,284,288,291,293,301,302,304,],[13,13,-9,-38,-3,13,-11,-37,-36,13,-4,-34,-21,-12,-10,-20,-44,-35,-27,-41,-29,-28,-42,-45,-30,-43,-46,]),'PRIORITY':([2,31,34,109,144,161,162,177,179,186,196,198,236,238,243,245,262,280,],[36,96,-88,-83,-96,-79,-82,-89,-81,-95,-83,-83,-77,-78,-90,-80,-83,-76,]),'INIT':([0,23,68,95,101,115,116,132,133,134,153,166,171,185,200,202,216,217,250,258,284,288,291,293,301,302,304,],[15,15,-9,-38,-3,15,-11,-37,-36,15,-4,-34,-21,-12,-10,-20,-44,-35,-27,-41,-29,-28,-42,-45,-30,-43,-46,]),'COMMA':([2,5,7,17,20,21,24,26,27,31,33,34,37,39,42,43,47,48,49,60,61,62,63,64,66,69,70,87,103,105,109,111,112,124,137,139,141,143,144,146,156,161,162,165,170,177,179,186,192,196,198,206,207,208,210,211,214,215,220,224,226,233,234,235,236,238,240,243,245,255,256,261,262,269,270,271,272,273,274,276,278,280,287,296,297,299,],[-72,-135,-129,-134,75,-101,-131,-130,-75,-71,-132,-88,104,-124,108,-133,108,-130,-119,-121,-131,108,-130,-133,-104,130,-54,-102,-74,-123,-83,-118,-128,-120,-75,-103,-51,108,-96,-73,190,-79,-82,199,204,-89,-81,-95,-126,-83,-83,244,-122,199,246,-66,-67,-65,-148,-149,-141,-86,-87,-127,-77,-78,-26,-90,-80,275,-142,-125,-83,-138,-136,285,-145,-146,-144,-147,-143,-76,275,-137,285,303,]),'FORALL':([0,23,68,95,101,115,116,132,133,134,153,166,171,185,200,202,216,217,250,258,284,288,291,293,301,302,304,],[16,16,-9,-38,-3,16,-11,-37,-36,16,-4,-34,-21,-12,-10,-20,-44,-35,-27,-41,-29,-28,-42,-45,-30,-43,-46,]),'PLUS':([5,7,17,21,24,26,27,33,39,43,48,49,60,61,63,64,105,109,111,112,124,192,196,198,207,235,261,262,],[-135,-129,-134,84,-131,-130,-133,-132,-124,-133,-130,-119,-121,-131,-130,-133,-123,162,-118,-128,-120,-126,162,162,-122,-127,-125,162,]),'ASSIGN':([5,7,17,21,24,25,26,27,33,39,43,48,49,60,66,87,105,111,112,124,139,144,186,192,207,230,235,261,],[-135,-129,-134,-101,-131,92,-130,-133,-132,-124,-133,-130,-119,-121,-104,-102,-123,-118,-128,-120,-103,-96,-95,-126,-122,260,-127,-125,]),'$end':([0,23,30,68,91,95,101,116,132,133,153,166,171,185,200,202,216,217,250,258,284,288,291,293,301,302,304,],[-2,-2,0,-9,-1,-38,-3,-11,-37,-36,-4,-34,-21,-12,-10,-20,-44,-35,-27,-41,-29,-28,-42,-45,-30,-43,-46,]),'IMPLIES':([5,7,17,21,24,33,34,39,43,48,49,60,66,87,105,109,111,112,124,139,144,161,162,177,179,186,192,196,198,207,208,210,211,212,213,214,215,235,236,238,239,243,245,261,262,264,265,266,280,292,],[-135,-129,-134,-101,-131,-132,-88,-124,-133,-130,-119,-121,-104,-102,-123,-83,-118,-128,-120,-103,-96,-79,-82,-89,-81,-95,-126,-83,-83,-122,-98,-63,-66,-58,249,-64,-65,-127,-77,-78,-97,-90,-80,-125,-83,-62,-61,-59,-76,-60,]),'STRING':([0,3,4,5,7,10,11,12,17,21,23,24,26,27,33,38,39,41,43,45,48,49,60,61,63,64,68,76,77,78,79,80,81,82,83,84,85,86,88,89,92,93,95,101,105,106,108,110,111,112,115,116,124,126,132,133,134,153,159,166,171,180,185,190,191,192,193,194,197,199,200,202,207,216,217,235,247,250,258,261,281,284,288,290,291,293,294,301,302,303,304,],[17,17,17,-135,-129,17,-117,17,-134,17,17,-131,-130,-133,-132,-117,-124,17,-133,17,-130,-119,-121,-131,-130,-133,-9,17,-106,-115,-113,-105,-110,-108,-116,-112,-111,-114,-109,-107,17,17,-38,-3,-123,17,17,17,-118,-128,17,-11,-120,17,-37,-36,17,-4,17,-34,-21,17,-12,17,17,-126,17,17,17,17,-10,-20,-122,-44,-35,-127,17,-27,-41,-125,17,-29,-28,17,-42,-45,17,-30,-43,17,-46,]),'EXISTS':([0,23,68,95,101,115,116,132,133,134,153,166,171,185,200,202,216,217,249,250,258,284,288,291,293,301,302,304,],[18,18,-9,-38,-3,18,-11,-37,-36,18,-4,-34,-21,-12,-10,-20,-44,-35,268,-27,-41,-29,-28,-42,-45,-30,-43,-46,]),'EXEC':([0,23,68,95,101,115,116,132,133,134,153,166,171,185,200,202,216,217,250,258,284,288,291,293,301,302,304,],[19,19,-9,-38,-3,19,-11,-37,-36,19,-4,-34,-21,-12,-10,-20,-44,-35,-27,-41,-29,-28,-42,-45,-30,-43,-46,]),'STOP':([2,5,7,14,17,20,21,24,26,27,29,31,33,34,35,39,42,43,48,49,57,60,66,69,70,72,73,87,99,100,102,103,105,107,109,111,112,114,119,124,137,138,139,141,144,146,152,154,156,157,161,162,163,170,177,179,182,183,186,192,196,198,207,218,220,223,224,225,226,228,229,231,233,234,235,236,238,240,243,245,256,261,262,269,270,271,272,273,274,276,277,278,279,280,282,283,296,297,298,299,300,305,],[-72,-135,-129,68,-134,-69,-101,-131,-130,-70,95,-71,-132,-88,101,-124,107,-133,-130,-119,123,-121,-104,-53,-54,132,133,-102,-8,153,-7,-74,-123,159,-83,-118,-128,166,171,-120,-70,-68,-103,-51,-96,-73,-6,-5,-85,191,-79,-82,197,203,-89,-81,-52,216,-95,-126,-83,-83,-122,250,-148,-32,-149,-33,-141,-31,258,-84,-86,-87,-127,-77,-78,-26,-90,-80,-142,-125,-83,-138,-136,284,-145,-146,-144,-147,288,-143,291,-76,293,295,-137,301,302,-50,304,-49,]),'GEQ':([5,7,17,21,24,26,27,33,39,43,48,49,60,61,63,64,105,111,112,124,192,207,235,261,],[-135,-129,-134,82,-131,-130,-133,-132,-124,-133,-130,-119,-121,-131,-130,-133,-123,-118,-128,-120,-126,-122,-127,-125,]),'MODULE':([0,23,68,95,101,115,116,132,133,134,153,166,171,185,200,202,216,217,250,258,284,288,291,293,301,302,304,],[22,22,-9,-38,-3,22,-11,-37,-36,22,-4,-34,-21,-12,-10,-20,-44,-35,-27,-41,-29,-28,-42,-45,-30,-43,-46,]),'EQUAL':([5,7,17,21,24,26,27,33,39,43,48,49,60,61,63,64,105,111,112,124,192,207,235,261,],[-135,-129,-134,77,-131,-130,-133,-132,-124,-133,-130,-119,-121,-131,-130,-133,-123,-118,-128,-120,-126,-122,-127,-125,]),'UNIDIS':([5,7,17,21,24,33,39,43,48,49,60,66,87,105,111,112,124,139,158,165,192,207,235,261,],[-135,-129,-134,-101,-131,-132,-124,-133,-130,-119,-121,-104,-102,-123,-118,-128,-120,-103,193,193,-126,-122,-127,-125,]),'SRPAREN':([5,7,10,17,21,24,33,39,43,45,48,49,58,59,60,61,62,63,64,66,87,105,111,112,124,139,143,148,149,150,151,160,178,192,207,220,224,226,235,253,256,261,272,273,274,276,278,],[-135,-129,60,-134,-101,-131,-132,-124,-133,60,-130,-119,124,125,-121,-55,-99,-56,-57,-104,-102,-123,-118,-128,-120,-103,-99,-56,-57,189,-55,-100,207,-126,-122,-148,-149,-141,-127,273,-142,-125,-145,-146,-144,-147,-143,]),'TRIGGER':([187,257,],[223,223,]),'PRAGMA':([0,23,68,95,101,115,116,132,133,134,153,166,171,185,200,202,216,217,250,258,284,288,291,293,301,302,304,],[1,1,-9,-38,-3,1,-11,-37,-36,1,-4,-34,-21,-12,-10,-20,-44,-35,-27,-41,-29,-28,-42,-45,-30,-43,-46,]),'IN':([5,7,17,21,24,26,27,33,39,43,48,49,60,61,63,64,105,111,112,124,192,207,235,261,],[-135,-129,-134,85,-131,-130,-133,-132,-124,-133,-130,-119,-121,-131,-130,-133,-123,-118,-128,-120,-126,-122,-127,-125,]),'VARIABLE':([0,3,4,5,7,9,10,11,12,15,16,17,18,21,22,23,24,26,27,33,38,39,41,43,45,48,49,53,54,60,61,63,64,68,76,77,78,79,80,81,82,83,84,85,86,88,89,92,93,95,98,101,105,106,108,110,111,112,115,116,122,123,124,126,128,130,132,133,134,153,159,166,171,180,185,187,188,190,191,192,193,194,197,199,200,201,202,207,216,217,219,220,221,222,224,226,235,247,250,256,257,258,259,261,268,272,273,274,275,276,278,281,284,288,290,291,293,294,301,302,303,304,],[24,24,24,-135,-129,55,61,-117,24,70,70,-134,70,24,55,24,-131,-130,-133,-132,-117,-124,24,-133,24,-130,-119,55,55,-121,-131,-130,-133,-9,24,-106,-115,-113,-105,-110,-108,-116,-112,-111,-114,-109,-107,24,24,-38,151,-3,-123,24,24,24,-118,-128,24,-11,55,55,-120,24,151,70,-37,-36,24,-4,24,-34,-21,24,-12,224,224,24,24,-126,24,24,24,24,-10,224,-20,-122,-44,-35,224,-148,224,224,-149,224,-127,24,-27,-142,224,-41,224,-125,70,-145,-146,-144,224,-147,-143,24,-29,-28,24,-42,-45,24,-30,-43,24,-46,]),'TIMES':([5,7,17,21,24,26,27,33,39,43,48,49,60,61,63,64,105,111,112,124,192,207,235,261,],[-135,-129,-134,86,-131,-130,-133,-132,-124,-133,-130,-119,-121,-131,-130,-133,-123,-118,-128,-120,-126,-122,-127,-125,]),'WHERE':([2,20,31,34,103,109,137,138,144,146,161,162,177,179,186,196,198,218,223,225,228,236,238,243,245,262,277,279,280,282,],[-72,-69,-71,-88,-74,-83,-70,-68,-96,-73,-79,-82,-89,-81,-95,-83,-83,251,-32,-33,-31,-77,-78,-90,-80,-83,289,290,-76,294,]),'ACTUATOR':([187,257,],[225,225,]),'NAME':([0,1,3,4,5,7,8,9,10,11,12,13,17,19,21,22,23,24,26,27,28,32,33,35,38,39,41,43,45,48,49,50,52,53,54,55,56,57,60,61,63,64,65,68,75,76,77,78,79,80,81,82,83,84,85,86,88,89,92,93,95,98,99,101,102,104,105,106,108,110,111,112,115,116,118,122,123,124,125,126,128,131,132,133,134,136,140,153,159,166,171,172,173,174,175,176,180,181,185,187,188,189,190,191,192,193,194,197,199,200,201,202,203,204,207,216,217,219,220,221,222,224,226,235,244,246,247,248,249,250,251,256,257,258,259,260,261,267,272,273,274,275,276,278,281,284,285,288,289,290,291,293,294,295,301,302,303,304,],[26,35,26,48,-135,-129,51,57,63,-117,48,67,-134,74,48,57,26,-131,-130,-133,94,97,-132,102,-117,-124,48,-133,48,-130,-119,113,117,57,57,-19,-15,-18,-121,-131,-130,-133,113,-9,113,48,-106,-115,-113,-105,-110,-108,-116,-112,-111,-114,-109,-107,48,48,-38,148,102,-3,102,113,-123,48,48,48,-118,-128,26,-11,117,57,57,-120,113,48,148,113,-37,-36,26,113,117,-4,48,-34,-21,-14,-13,-16,-17,113,48,113,-12,220,220,113,48,48,-126,48,48,48,48,-10,220,-20,117,117,-122,-44,-35,220,-148,220,220,-149,220,-127,113,113,48,113,-48,-27,269,-142,220,-41,220,113,-125,113,-145,-146,-144,220,-147,-143,48,-29,269,-28,269,48,-42,-45,48,-47,-30,-43,48,-46,]),'INT':([0,3,4,5,7,10,11,12,17,21,23,24,26,27,33,35,36,38,39,41,43,45,48,49,60,61,63,64,68,75,76,77,78,79,80,81,82,83,84,85,86,88,89,92,93,95,96,98,99,101,102,105,106,108,110,111,112,115,116,124,126,128,132,133,134,153,159,166,171,180,181,185,190,191,192,193,194,197,199,200,202,207,216,217,235,246,247,248,249,250,258,260,261,267,281,284,288,290,291,293,294,295,301,302,303,304,],[27,43,43,-135,-129,64,-117,43,-134,43,27,-131,-130,-133,-132,99,103,-117,-124,43,-133,43,-130,-119,-121,-131,-130,-133,-9,137,43,-106,-115,-113,-105,-110,-108,-116,-112,-111,-114,-109,-107,43,43,-38,146,149,99,-3,99,-123,43,43,43,-118,-128,27,-11,-120,43,149,-37,-36,27,-4,43,-34,-21,43,214,-12,43,43,-126,43,43,43,43,-10,-20,-122,-44,-35,-127,214,43,214,-48,-27,-41,137,-125,137,43,-29,-28,43,-42,-45,43,-47,-30,-43,43,-46,]),'PRED':([0,23,68,95,101,115,116,132,133,134,153,166,171,185,200,202,216,217,250,258,284,288,291,293,301,302,304,],[28,28,-9,-38,-3,28,-11,-37,-36,28,-4,-34,-21,-12,-10,-20,-44,-35,-27,-41,-29,-28,-42,-45,-30,-43,-46,]),'FLOAT':([0,3,4,5,7,10,11,12,17,21,23,24,26,27,33,38,39,41,43,45,48,49,60,61,63,64,68,76,77,78,79,80,81,82,83,84,85,86,88,89,92,93,95,101,105,106,108,110,111,112,115,116,124,126,132,133,134,153,159,166,171,180,185,190,191,192,193,194,197,199,200,202,207,216,217,235,247,250,258,261,281,284,288,290,291,293,294,301,302,303,304,],[33,33,33,-135,-129,33,-117,33,-134,33,33,-131,-130,-133,-132,-117,-124,33,-133,33,-130,-119,-121,-131,-130,-133,-9,33,-106,-115,-113,-105,-110,-108,-116,-112,-111,-114,-109,-107,33,33,-38,-3,-123,33,33,33,-118,-128,33,-11,-120,33,-37,-36,33,-4,33,-34,-21,33,-12,33,33,-126,33,33,33,33,-10,-20,-122,-44,-35,-127,33,-27,-41,-125,33,-29,-28,33,-42,-45,33,-30,-43,33,-46,]),'AS':([69,70,71,182,],[-53,-54,131,-52,]),'RRPAREN':([4,5,7,17,21,24,33,39,43,46,47,48,49,60,66,87,93,105,111,112,124,139,142,143,144,160,186,192,205,206,207,220,224,226,235,254,255,256,261,263,272,273,274,276,278,286,287,],[49,-135,-129,-134,-101,-131,-132,-124,-133,111,112,-130,-119,-121,-104,-102,144,-123,-118,-128,-120,-103,186,-99,-96,-100,-95,-126,243,-92,-122,-148,-149,-141,-127,274,276,-142,-125,-91,-145,-146,-144,-147,-143,-140,-139,]),'LEQ':([5,7,17,21,24,26,27,33,39,43,48,49,60,61,63,64,105,111,112,124,192,207,235,261,],[-135,-129,-134,89,-131,-130,-133,-132,-124,-133,-130,-119,-121,-131,-130,-133,-123,-118,-128,-120,-126,-122,-127,-125,]),'ROLE':([0,23,68,95,101,115,116,132,133,134,153,166,171,185,200,202,216,217,250,258,284,288,291,293,301,302,304,],[32,32,-9,-38,-3,32,-11,-37,-36,32,-4,-34,-21,-12,-10,-20,-44,-35,-27,-41,-29,-28,-42,-45,-30,-43,-46,]),'IMPORT':([55,56,57,90,172,173,174,175,],[-19,-15,-18,140,-14,-13,-16,-17,]),'QUERY':([6,],[50,]),'BACK':([34,109,144,161,162,177,179,186,196,198,210,211,212,214,215,236,238,243,245,262,264,280,],[-88,-83,-96,-79,-82,-89,-81,-95,-83,-83,-63,-66,248,-64,-65,-77,-78,-90,-80,-83,-62,-76,]),'FACT':([187,257,],[228,228,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'lhs_pat':([181,246,248,],[210,210,210,]),'term_binop':([21,],[76,]),'comp_range':([106,110,190,],[156,156,156,]),'mod_name_top':([9,22,],[52,90,]),'term_unaryop':([0,3,4,10,21,23,41,45,92,93,106,108,110,115,126,134,159,180,190,191,193,194,197,199,247,281,290,294,303,],[12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,]),'pragma_name_list':([35,99,102,],[100,152,154,]),'fact_comp_pat':([0,23,75,115,134,181,246,248,260,267,],[2,2,2,2,2,211,211,211,2,2,]),'rule_heads':([181,246,248,],[212,264,266,]),'exists_dec':([249,],[267,]),'comp_ranges':([106,110,190,],[157,163,231,]),'var_list':([15,16,18,130,268,],[71,72,73,182,283,]),'typeargs':([222,275,],[254,286,]),'extern_elem':([52,118,140,203,204,],[119,170,119,170,170,]),'guards':([110,180,191,197,199,247,281,],[164,209,232,237,239,265,292,]),'assign_stmts':([290,294,303,],[298,300,305,]),'typemodifier':([251,285,289,],[270,296,270,]),'termargs':([3,4,10,41,45,93,108,],[40,46,58,40,58,142,160,]),'assign_stmt':([0,23,115,134,290,294,303,],[14,14,14,14,299,299,299,]),'rule_lhs':([181,],[213,]),'location':([10,98,128,],[59,150,59,]),'mod_name':([9,22,53,54,122,123,],[56,56,120,121,174,175,]),'type':([187,188,201,219,221,222,226,257,259,275,],[227,229,240,252,253,255,256,278,278,287,]),'var_atom':([15,16,18,130,268,],[69,69,69,69,69,]),'extern_elems':([118,203,204,],[169,241,242,]),'rhs_pat':([0,23,75,115,134,260,267,],[20,20,20,20,20,20,20,]),'simp_term':([0,3,4,10,12,21,23,41,45,76,92,93,106,108,110,115,126,134,159,180,190,191,193,194,197,199,247,281,290,294,303,],[21,21,21,21,66,21,21,21,21,139,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,]),'fact_list':([176,244,],[205,263,]),'singletype':([187,188,201,219,221,222,226,257,259,275,],[226,226,226,226,226,226,226,226,226,226,]),'declaration':([0,23,115,134,],[23,23,23,23,]),'fact_sort':([187,257,],[218,277,]),'term':([0,3,4,10,21,23,41,45,92,93,106,108,110,115,126,134,159,180,190,191,193,194,197,199,247,281,290,294,303,],[25,42,47,62,87,25,42,62,141,143,158,143,165,25,178,25,195,208,158,208,233,234,208,208,208,208,25,25,25,]),'extern_list':([52,140,],[116,185,]),'rule_rhs':([0,23,75,115,134,260,267,],[29,29,138,29,29,279,282,]),'declarations':([0,23,115,134,],[30,91,167,184,]),'loc_fact':([0,3,23,65,75,104,115,134,136,181,246,248,260,267,],[31,37,31,37,31,37,31,31,37,215,215,215,31,31,]),'comp_option':([109,196,198,262,],[161,236,238,280,]),'loc_fact_list':([3,65,104,136,],[44,127,155,44,]),'typemodifiers':([251,289,],[271,297,]),'fact':([0,3,23,50,65,75,104,115,125,131,134,136,176,181,189,244,246,248,260,267,],[34,34,34,114,34,34,34,34,177,183,34,34,206,34,230,206,34,34,34,34,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> declarations","S'",1,None,None,None),
+  ('declarations -> declaration declarations','declarations',2,'p_declarations','parser.py',40),
+  ('declarations -> <empty>','declarations',0,'p_declarations','parser.py',41),
+  ('declaration -> PRAGMA NAME STOP','declaration',3,'p_pragma_declaration','parser.py',50),
+  ('declaration -> PRAGMA NAME pragma_name_list STOP','declaration',4,'p_pragma_declaration','parser.py',51),
+  ('pragma_name_list -> NAME pragma_name_list','pragma_name_list',2,'p_pragma_name_list','parser.py',60),
+  ('pragma_name_list -> INT pragma_name_list','pragma_name_list',2,'p_pragma_name_list','parser.py',61),
+  ('pragma_name_list -> NAME','pragma_name_list',1,'p_pragma_name_list','parser.py',62),
+  ('pragma_name_list -> INT','pragma_name_list',1,'p_pragma_name_list','parser.py',63),
+  ('declaration -> assign_stmt STOP','declaration',2,'p_assign_declaration','parser.py',72),
+  ('declaration -> ENSEM NAME CLPAREN declarations CRPAREN','declaration',5,'p_declaration_scope','parser.py',78),
+  ('declaration -> EXTERN mod_name_top extern_list','declaration',3,'p_declaration_extern','parser.py',88),
+  ('declaration -> MODULE mod_name_top IMPORT extern_list','declaration',4,'p_declaration_extern','parser.py',89),
+  ('mod_name_top -> DQUOTE mod_name DQUOTE','mod_name_top',3,'p_mod_name_top','parser.py',98),
+  ('mod_name_top -> TLPAREN mod_name TRPAREN','mod_name_top',3,'p_mod_name_top','parser.py',99),
+  ('mod_name_top -> mod_name','mod_name_top',1,'p_mod_name_top','parser.py',100),
+  ('mod_name -> NAME DIV mod_name','mod_name',3,'p_mod_name','parser.py',109),
+  ('mod_name -> NAME STOP mod_name','mod_name',3,'p_mod_name','parser.py',110),
+  ('mod_name -> NAME','mod_name',1,'p_mod_name','parser.py',111),
+  ('mod_name -> VARIABLE','mod_name',1,'p_mod_name','parser.py',112),
+  ('extern_list -> CLPAREN extern_elems CRPAREN','extern_list',3,'p_extern_list','parser.py',121),
+  ('extern_list -> extern_elem STOP','extern_list',2,'p_extern_list','parser.py',122),
+  ('extern_elems -> extern_elem COMMA extern_elems','extern_elems',3,'p_extern_elems','parser.py',131),
+  ('extern_elems -> extern_elem','extern_elems',1,'p_extern_elems','parser.py',132),
+  ('extern_elems -> extern_elem STOP extern_elems','extern_elems',3,'p_extern_elems_alt','parser.py',141),
+  ('extern_elems -> extern_elem STOP','extern_elems',2,'p_extern_elems_alt','parser.py',142),
+  ('extern_elem -> NAME COLON COLON type','extern_elem',4,'p_extern_elem','parser.py',151),
+  ('declaration -> PRED NAME COLON COLON fact_sort STOP','declaration',6,'p_declaration_fact','parser.py',160),
+  ('declaration -> PRED NAME COLON COLON type ARROW fact_sort STOP','declaration',8,'p_declaration_fact','parser.py',161),
+  ('declaration -> PRED NAME COLON COLON fact_sort WHERE typemodifiers STOP','declaration',8,'p_declaration_fact_with_modifiers','parser.py',173),
+  ('declaration -> PRED NAME COLON COLON type ARROW fact_sort WHERE typemodifiers STOP','declaration',10,'p_declaration_fact_with_modifiers','parser.py',174),
+  ('fact_sort -> FACT','fact_sort',1,'p_match_fact_sort','parser.py',184),
+  ('fact_sort -> TRIGGER','fact_sort',1,'p_trigger_fact_sort','parser.py',190),
+  ('fact_sort -> ACTUATOR','fact_sort',1,'p_actuator_fact_sort','parser.py',196),
+  ('declaration -> EXPORT QUERY fact STOP','declaration',4,'p_export_query','parser.py',204),
+  ('declaration -> EXEC NAME CLPAREN declarations CRPAREN','declaration',5,'p_declaration_exec','parser.py',212),
+  ('declaration -> EXISTS var_list STOP','declaration',3,'p_declaration_exist','parser.py',218),
+  ('declaration -> FORALL var_list STOP','declaration',3,'p_declaration_forall','parser.py',224),
+  ('declaration -> rule_rhs STOP','declaration',2,'p_declaration_loc_facts','parser.py',230),
+  ('loc_name_list -> NAME COMMA loc_name_list','loc_name_list',3,'p_loc_name_list','parser.py',236),
+  ('loc_name_list -> NAME','loc_name_list',1,'p_loc_name_list','parser.py',237),
+  ('declaration -> ROLE NAME COLON COLON type STOP','declaration',6,'p_declaration_role_sig','parser.py',258),
+  ('declaration -> ROLE SLPAREN location SRPAREN fact ASSIGN rule_rhs STOP','declaration',8,'p_declaration_role_def','parser.py',264),
+  ('declaration -> ROLE SLPAREN location SRPAREN fact ASSIGN rule_rhs WHERE assign_stmts STOP','declaration',10,'p_declaration_role_def','parser.py',265),
+  ('declaration -> INIT var_list AS fact STOP','declaration',5,'p_declaration_init_def','parser.py',274),
+  ('declaration -> RULE NAME COLON COLON rule_lhs IMPLIES exists_dec rule_rhs STOP','declaration',9,'p_declaration_rule','parser.py',282),
+  ('declaration -> RULE NAME COLON COLON rule_lhs IMPLIES exists_dec rule_rhs WHERE assign_stmts STOP','declaration',11,'p_declaration_rule','parser.py',283),
+  ('exists_dec -> EXISTS var_list STOP','exists_dec',3,'p_exists_dec','parser.py',292),
+  ('exists_dec -> <empty>','exists_dec',0,'p_exists_dec','parser.py',293),
+  ('assign_stmts -> assign_stmt COMMA assign_stmts','assign_stmts',3,'p_assign_stmts','parser.py',302),
+  ('assign_stmts -> assign_stmt','assign_stmts',1,'p_assign_stmts','parser.py',303),
+  ('assign_stmt -> term ASSIGN term','assign_stmt',3,'p_assign_stmt','parser.py',311),
+  ('var_list -> var_atom COMMA var_list','var_list',3,'p_var_list','parser.py',316),
+  ('var_list -> var_atom','var_list',1,'p_var_list','parser.py',317),
+  ('var_atom -> VARIABLE','var_atom',1,'p_var','parser.py',326),
+  ('location -> VARIABLE','location',1,'p_location_var','parser.py',331),
+  ('location -> NAME','location',1,'p_location_name','parser.py',335),
+  ('location -> INT','location',1,'p_location_lit','parser.py',339),
+  ('rule_lhs -> rule_heads','rule_lhs',1,'p_rule_lhs','parser.py',344),
+  ('rule_lhs -> rule_heads BACK rule_heads','rule_lhs',3,'p_rule_chr_lhs','parser.py',350),
+  ('rule_lhs -> rule_heads BACK rule_heads BAR guards','rule_lhs',5,'p_rule_chr_lhs','parser.py',351),
+  ('rule_lhs -> rule_heads BAR guards','rule_lhs',3,'p_rule_chr_lhs_2','parser.py',360),
+  ('rule_heads -> lhs_pat COMMA rule_heads','rule_heads',3,'p_rule_heads','parser.py',366),
+  ('rule_heads -> lhs_pat','rule_heads',1,'p_rule_heads','parser.py',367),
+  ('rule_heads -> INT','rule_heads',1,'p_rule_heads_one','parser.py',382),
+  ('lhs_pat -> loc_fact','lhs_pat',1,'p_lhs_fact','parser.py',388),
+  ('lhs_pat -> fact_comp_pat','lhs_pat',1,'p_lhs_fact','parser.py',389),
+  ('lhs_pat -> INT','lhs_pat',1,'p_lhs_none','parser.py',394),
+  ('rule_rhs -> rhs_pat COMMA rule_rhs','rule_rhs',3,'p_rule_rhs','parser.py',399),
+  ('rule_rhs -> rhs_pat','rule_rhs',1,'p_rule_rhs','parser.py',400),
+  ('rule_rhs -> INT','rule_rhs',1,'p_rule_rhs_one','parser.py',414),
+  ('rhs_pat -> loc_fact','rhs_pat',1,'p_rhs_fact','parser.py',419),
+  ('rhs_pat -> fact_comp_pat','rhs_pat',1,'p_rhs_fact','parser.py',420),
+  ('rhs_pat -> loc_fact PRIORITY INT','rhs_pat',3,'p_rhs_fact_priority','parser.py',426),
+  ('rhs_pat -> fact_comp_pat PRIORITY INT','rhs_pat',3,'p_rhs_fact_priority','parser.py',427),
+  ('rhs_pat -> INT','rhs_pat',1,'p_rhs_none','parser.py',433),
+  ('fact_comp_pat -> CLPAREN loc_fact_list BAR comp_ranges STOP guards CRPAREN comp_option','fact_comp_pat',8,'p_fact_compre_pat_1','parser.py',439),
+  ('fact_comp_pat -> CLPAREN loc_fact_list BAR comp_ranges CRPAREN comp_option','fact_comp_pat',6,'p_fact_compre_pat_1','parser.py',440),
+  ('fact_comp_pat -> CLPAREN loc_fact_list BAR guards CRPAREN comp_option','fact_comp_pat',6,'p_fact_compre_pat_2','parser.py',450),
+  ('fact_comp_pat -> CLPAREN loc_fact_list CRPAREN comp_option','fact_comp_pat',4,'p_fact_compre_pat_2','parser.py',451),
+  ('fact_comp_pat -> MINUS CLPAREN loc_fact_list BAR guards CRPAREN','fact_comp_pat',6,'p_fact_compre_pat_3','parser.py',461),
+  ('fact_comp_pat -> MINUS CLPAREN loc_fact_list CRPAREN','fact_comp_pat',4,'p_fact_compre_pat_3','parser.py',462),
+  ('comp_option -> PLUS','comp_option',1,'p_comp_option','parser.py',471),
+  ('comp_option -> <empty>','comp_option',0,'p_comp_option','parser.py',472),
+  ('comp_ranges -> comp_range COMMA comp_ranges','comp_ranges',3,'p_comp_ranges','parser.py',481),
+  ('comp_ranges -> comp_range','comp_ranges',1,'p_comp_ranges','parser.py',482),
+  ('comp_range -> term UNIDIS term','comp_range',3,'p_comp_range','parser.py',492),
+  ('comp_range -> term ARROW term','comp_range',3,'p_comp_range','parser.py',493),
+  ('loc_fact -> fact','loc_fact',1,'p_loc_fact','parser.py',499),
+  ('loc_fact -> SLPAREN location SRPAREN fact','loc_fact',4,'p_loc_fact','parser.py',500),
+  ('loc_fact -> SLPAREN location SRPAREN RLPAREN fact_list RRPAREN','loc_fact',6,'p_loc_fact','parser.py',501),
+  ('fact_list -> fact COMMA fact_list','fact_list',3,'p_fact_list','parser.py',512),
+  ('fact_list -> fact','fact_list',1,'p_fact_list','parser.py',513),
+  ('loc_fact_list -> loc_fact COMMA loc_fact_list','loc_fact_list',3,'p_loc_fact_list','parser.py',522),
+  ('loc_fact_list -> loc_fact','loc_fact_list',1,'p_loc_fact_list','parser.py',523),
+  ('fact -> NAME RLPAREN termargs RRPAREN','fact',4,'p_fact','parser.py',532),
+  ('fact -> NAME RLPAREN RRPAREN','fact',3,'p_fact','parser.py',533),
+  ('guards -> term COMMA guards','guards',3,'p_lhs_guard','parser.py',542),
+  ('guards -> term','guards',1,'p_lhs_guard','parser.py',543),
+  ('termargs -> term','termargs',1,'p_termargs','parser.py',552),
+  ('termargs -> term COMMA termargs','termargs',3,'p_termargs','parser.py',553),
+  ('term -> simp_term','term',1,'p_term_std','parser.py',562),
+  ('term -> simp_term term','term',2,'p_term_std','parser.py',563),
+  ('term -> simp_term term_binop simp_term','term',3,'p_term_op','parser.py',572),
+  ('term -> term_unaryop simp_term','term',2,'p_term_op','parser.py',573),
+  ('term_binop -> NEQ','term_binop',1,'p_term_binop','parser.py',582),
+  ('term_binop -> EQUAL','term_binop',1,'p_term_binop','parser.py',583),
+  ('term_binop -> LEQ','term_binop',1,'p_term_binop','parser.py',584),
+  ('term_binop -> GEQ','term_binop',1,'p_term_binop','parser.py',585),
+  ('term_binop -> TLPAREN','term_binop',1,'p_term_binop','parser.py',586),
+  ('term_binop -> TRPAREN','term_binop',1,'p_term_binop','parser.py',587),
+  ('term_binop -> IN','term_binop',1,'p_term_binop','parser.py',588),
+  ('term_binop -> PLUS','term_binop',1,'p_term_binop','parser.py',589),
+  ('term_binop -> MINUS','term_binop',1,'p_term_binop','parser.py',590),
+  ('term_binop -> TIMES','term_binop',1,'p_term_binop','parser.py',591),
+  ('term_binop -> DIV','term_binop',1,'p_term_binop','parser.py',592),
+  ('term_binop -> COLON','term_binop',1,'p_term_binop','parser.py',593),
+  ('term_unaryop -> MINUS','term_unaryop',1,'p_term_unary_op','parser.py',599),
+  ('simp_term -> RLPAREN termargs RRPAREN','simp_term',3,'p_simp_term_tuple','parser.py',605),
+  ('simp_term -> RLPAREN RRPAREN','simp_term',2,'p_simp_term_tuple','parser.py',606),
+  ('simp_term -> SLPAREN termargs SRPAREN','simp_term',3,'p_simp_term_list','parser.py',616),
+  ('simp_term -> SLPAREN SRPAREN','simp_term',2,'p_simp_term_list','parser.py',617),
+  ('simp_term -> SLPAREN term BAR term SRPAREN','simp_term',5,'p_simp_term_listcons','parser.py',626),
+  ('simp_term -> CLPAREN termargs CRPAREN','simp_term',3,'p_simp_term_mset','parser.py',632),
+  ('simp_term -> CLPAREN CRPAREN','simp_term',2,'p_simp_term_mset','parser.py',633),
+  ('simp_term -> CLPAREN term BAR comp_ranges STOP guards CRPAREN','simp_term',7,'p_simp_term_compre_pat_1','parser.py',643),
+  ('simp_term -> CLPAREN term BAR comp_ranges CRPAREN','simp_term',5,'p_simp_term_compre_pat_1','parser.py',644),
+  ('simp_term -> CLPAREN term STOP STOP term CRPAREN','simp_term',6,'p_simp_term_enum_mset','parser.py',654),
+  ('simp_term -> RLPAREN term RRPAREN','simp_term',3,'p_simp_term_brackets','parser.py',659),
+  ('simp_term -> UNDERSCORE','simp_term',1,'p_simp_term_underscore','parser.py',663),
+  ('simp_term -> NAME','simp_term',1,'p_simp_term_cons','parser.py',667),
+  ('simp_term -> VARIABLE','simp_term',1,'p_simp_term_var','parser.py',671),
+  ('simp_term -> FLOAT','simp_term',1,'p_simp_term_float','parser.py',675),
+  ('simp_term -> INT','simp_term',1,'p_simp_term_int','parser.py',679),
+  ('simp_term -> STRING','simp_term',1,'p_simp_term_string','parser.py',683),
+  ('simp_term -> CHAR','simp_term',1,'p_simp_term_char','parser.py',687),
+  ('typemodifiers -> typemodifier','typemodifiers',1,'p_typemodifiers','parser.py',703),
+  ('typemodifiers -> typemodifiers COMMA typemodifier','typemodifiers',3,'p_typemodifiers','parser.py',704),
+  ('typemodifier -> NAME','typemodifier',1,'p_typemodifier','parser.py',713),
+  ('typeargs -> type','typeargs',1,'p_typeargs','parser.py',727),
+  ('typeargs -> type COMMA typeargs','typeargs',3,'p_typeargs','parser.py',728),
+  ('type -> singletype','type',1,'p_type','parser.py',737),
+  ('type -> singletype type','type',2,'p_type','parser.py',738),
+  ('singletype -> type ARROW type','singletype',3,'p_singletype_func','parser.py',746),
+  ('singletype -> RLPAREN typeargs RRPAREN','singletype',3,'p_singletype_tuple','parser.py',750),
+  ('singletype -> CLPAREN type CRPAREN','singletype',3,'p_singletype_mset','parser.py',754),
+  ('singletype -> SLPAREN type SRPAREN','singletype',3,'p_singletype_list','parser.py',759),
+  ('singletype -> RLPAREN type RRPAREN','singletype',3,'p_singletype_brackets','parser.py',763),
+  ('singletype -> NAME','singletype',1,'p_singletype_cons','parser.py',767),
+  ('singletype -> VARIABLE','singletype',1,'p_singletype_var','parser.py',771),
+]
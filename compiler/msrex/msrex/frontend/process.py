@@ -26,6 +26,8 @@ for Large Distributed Ensembles) from the Qatar National Research Fund (a member
 Foundation). The statements made herein are solely the responsibility of the authors.
 '''
 
+import os
+
 from string import split
 
 import msrex.frontend.lex_parse.ast as ast
@@ -39,6 +41,7 @@ from msrex.frontend.analyze.checkers.var_scope_checker import VarScopeChecker
 from msrex.frontend.analyze.checkers.type_checker import TypeChecker
 from msrex.frontend.analyze.checkers.neighbor_restrict_checker import NeighborRestrictChecker
 from msrex.frontend.analyze.extractors.fact_property_extractor import FactPropertyExtractor
+from msrex.frontend.analyze.scheduler import CheckerScheduler
 
 from msrex.frontend.transform.default_location import DefaultLocation
 from msrex.frontend.transform.rule_linearizer import RuleLinearizer
@@ -51,17 +54,46 @@ from msrex.frontend.compile.rules import Rule
 from msrex.frontend.compile.lookup_context import LinearLookup, HashLookup, OrdLookup, MemLookup
 
 from msrex.frontend.compile.prog_compilation import ProgCompilation
+from msrex.frontend.compile.cardinality import CardinalityEstimates
 
 from msrex.frontend.builtin.predicates import BuiltinPred
 
+from msrex.frontend.cache import builtin_preds_signature
+import msrex.frontend.compile.lookup_context as lookup_context
+import msrex.misc.visit as visit
+
 def mk_prog_name( file_name ):
 	return split(file_name, ".")[0]
 
-def process_msre(file_name, source_text=None, origin_text="", builtin_preds=[]):
+def read_profile(profile_file):
+	if profile_file != None and os.path.exists(profile_file):
+		return open(profile_file).read()
+	return ""
+
+# Processes an msre program. If a compilation cache is given, the whole output is looked up in the cache
+# (keyed by the source, builtin predicates and profile), and rule compilations are cached individually.
+# If dump_node_centric is set, codes of the node-centric transformation (if any) are written to a .cmg file.
+def process_msre(file_name, source_text=None, origin_text="", builtin_preds=[], profile_file=None, cache=None
+                ,dump_node_centric=False):
 	if source_text == None:
-		(source_text, decs) = p.run_parser(file_name)
-	else:
-		decs = p.run_parser_input(source_text)
+		source_text = open(file_name).read()
+	cache_key = None
+	if cache != None and not dump_node_centric:
+		cache_key = cache.key( mk_prog_name( file_name ), source_text, origin_text, builtin_preds_signature(builtin_preds)
+                                     , read_profile(profile_file), lookup_context.USE_ORD_LOOKUP )
+		output = cache.load('prog', cache_key)
+		if output != None:
+			return output
+	decs = p.run_parser_input(source_text)
+	output = process_decs(file_name, source_text, decs, origin_text=origin_text, builtin_preds=builtin_preds
+                             ,profile_file=profile_file, cache=cache, dump_node_centric=dump_node_centric)
+	if cache_key != None:
+		output['cache_key'] = cache_key
+		cache.store('prog', cache_key, output)
+	return output
+
+def process_decs(file_name, source_text, decs, origin_text="", builtin_preds=[], profile_file=None, cache=None
+                ,dump_node_centric=False):
 	error_reports, analysis, data = check_validity(decs, source_text, builtin_preds=builtin_preds)
 
 	output = { 'source_text'   : source_text
@@ -74,6 +106,7 @@ def process_msre(file_name, source_text=None, origin_text="", builtin_preds=[]):
 	if len(error_reports) == 0:
 		transformers = [DefaultLocation,RuleLinearizer,AlphaIndexer,LHSCompre]
 		for transformer in transformers:
+			visit.enter_pass( transformer.__name__ )
 			tr = transformer( decs )
 			tr.transform()
 		error_reports, analysis, data = check_validity(decs, source_text, checkers=[NeighborRestrictChecker]
@@ -85,13 +118,16 @@ def process_msre(file_name, source_text=None, origin_text="", builtin_preds=[]):
 		choreographic_transform = Choreographic(decs, source_text)
 		if choreographic_transform.required():
 			choreographic_transform.transform()
-			nc_file_name = "%s_node_centric.cmg" % mk_prog_name( file_name )
-			nc_output_file = open(nc_file_name, 'w')
-			nc_output_file.write( choreographic_transform.getGeneratedCodes() )
-			return process_msre(file_name, source_text=choreographic_transform.getGeneratedCodes()
-                                           ,origin_text=source_text, builtin_preds=builtin_preds)
-
-		prog = process_prog( decs, mk_prog_name( file_name ), data, builtin_preds=builtin_preds, source_text=source_text, origin_text=origin_text)
+			if dump_node_centric:
+				nc_file_name = "%s_node_centric.cmg" % mk_prog_name( file_name )
+				nc_output_file = open(nc_file_name, 'w')
+				nc_output_file.write( choreographic_transform.getGeneratedCodes() )
+				nc_output_file.close()
+			return process_node_centric(file_name, choreographic_transform, output, builtin_preds=builtin_preds
+                                                   ,profile_file=profile_file, cache=cache)
+
+		prog = process_prog( decs, mk_prog_name( file_name ), output['data'], builtin_preds=builtin_preds, source_text=source_text
+                                   ,origin_text=origin_text, profile_file=profile_file, cache=cache)
 		output['valid'] = True
 		output['rules'] = prog.rules
 		output['fact_dir'] = prog.fact_dir
@@ -99,27 +135,54 @@ def process_msre(file_name, source_text=None, origin_text="", builtin_preds=[]):
 
 	return output
 
+# Processes the node-centric program of a choreographic transformation. Declarations carried over from the
+# system-centric program are already checked and transformed, so only the synthesized sync declarations
+# go through the checkers and transformers. Properties of facts are extracted again from the whole program.
+def process_node_centric(file_name, choreographic_transform, sc_output, builtin_preds=[], profile_file=None, cache=None):
+	source_text = choreographic_transform.getSourceText()
+	decs        = choreographic_transform.getNodeCentricDecs()
+	sync_decs   = choreographic_transform.getSyncDecs()
+
+	error_reports, analysis, data = check_validity(sync_decs, source_text, checkers=[LHSRestrictChecker,VarScopeChecker,TypeChecker]
+                                                      ,builtin_preds=builtin_preds)
+	output = { 'source_text'   : source_text
+                 , 'decs'          : decs
+                 , 'error_reports' : error_reports
+                 , 'analysis'      : analysis
+                 , 'data'          : sc_output['data']
+                 , 'valid'         : False }
+	if len(error_reports) > 0:
+		return output
+
+	error_reports, analysis, data = check_validity(decs, source_text, checkers=[FactPropertyExtractor], builtin_preds=builtin_preds)
+	output['analysis'] += analysis
+	output['data'] = dict( sc_output['data'].items() + data.items() )
+
+	transformers = [DefaultLocation,RuleLinearizer,AlphaIndexer,LHSCompre]
+	for transformer in transformers:
+		tr = transformer( sync_decs )
+		tr.transform()
+	error_reports, analysis, data = check_validity(decs, source_text, checkers=[NeighborRestrictChecker], builtin_preds=builtin_preds)
+	if len(error_reports) > 0:
+		output['error_reports'] += error_reports
+		return output
+
+	prog = process_prog( decs, mk_prog_name( file_name ), output['data'], builtin_preds=builtin_preds, source_text=source_text
+                           ,origin_text=sc_output['source_text'], profile_file=profile_file, cache=cache)
+	output['valid'] = True
+	output['rules'] = prog.rules
+	output['fact_dir'] = prog.fact_dir
+	output['prog']  = prog
+
+	return output
+
 def check_validity(decs, source_text, checkers=[PragmaChecker,LHSRestrictChecker,VarScopeChecker,TypeChecker,FactPropertyExtractor]
                   ,builtin_preds=[]):
-	reports = []
-	analysis = []
-	data = {}
-	for checker in checkers:
-		c = checker(decs,source_text,builtin_preds=builtin_preds)
-		c.check()
-		c.init_build_display_regions()
-		reports += c.get_error_reports()
-		ana = c.get_analysis()
-		if ana != None:
-			analysis.append( ana )
-		ana_data = c.get_analysis_data()
-		if ana_data != None:
-			data[c.get_analysis_name()] = ana_data
-		if len(reports) > 0:
-			break
-	return (reports,analysis,data)
-
-def process_prog( decs, prog_name, data, builtin_preds=[], source_text="",origin_text=""):
+	# Checkers run in order, stopping at the first one that reports errors. With several jobs,
+	# checkers run concurrently, as far as their dependencies allow (see scheduler.py)
+	return CheckerScheduler(checkers, decs, source_text, builtin_preds=builtin_preds).run()
+
+def process_prog( decs, prog_name, data, builtin_preds=[], source_text="",origin_text="", profile_file=None, cache=None):
 	# Currently assumes that there is exactly one ensemble dec and one exec dec for that emsemble.	
 	inspect = Inspector()
 	ensem_dec = inspect.filter_decs(decs, ensem=True)[0]
@@ -130,9 +193,17 @@ def process_prog( decs, prog_name, data, builtin_preds=[], source_text="",origin
 	facts += map(lambda bp: bp.getFactDec(), builtin_preds)
 	fact_dir = FactDirectory( facts )
 
+	visit.enter_pass( "Compilation" )
+
 	rules = process_ensemble( ensem_dec, fact_dir )
+
+	hints = {}
+	if 'pragmas' in data:
+		hints = data['pragmas']['cardinality']
+	estimates = CardinalityEstimates( fact_dir, hints=hints, profile_file=profile_file )
 	
-	prog = ProgCompilation(ensem_dec, rules, fact_dir, externs, exec_dec, prog_name, source_text=source_text, origin_text=origin_text)
+	prog = ProgCompilation(ensem_dec, rules, fact_dir, externs, exec_dec, prog_name, source_text=source_text, origin_text=origin_text
+                              ,estimates=estimates, cache=cache)
 
 	return prog
 
@@ -35,7 +35,7 @@ import random as r
 import subprocess as sp
 
 from msrex.frontend.process import process_msre
-from msrex.frontend.code.code_generator import CPPCodeGenerator
+from msrex.frontend.cache import CompilationCache, generate_cpp
 
 from msrex.misc.msr_logging import init_logger, log_info
 from msrex.misc.template import template
@@ -83,12 +83,14 @@ def is_error(call_stat):
 
 # MSRE Compilation and Execution Pipe Operations.
 
+COMPILATION_CACHE = CompilationCache()
+
 def compile_msre_source(src_name, source):
 	print "Compiling msre program..."
 	try:
 		msr_file_name = mk_msre_name(src_name)
 		t1 = datetime.now()
-		output = process_msre(msr_file_name, source)
+		output = process_msre(msr_file_name, source, cache=COMPILATION_CACHE)
 		t2 = datetime.now()
 		tdelta = t2 - t1
 		if output['valid']:
@@ -107,10 +109,8 @@ def compile_msre_source(src_name, source):
 def generate_cpp_source(src_name, output):
 	print "Generating cpp source..."
 	try:
-		prog = output["prog"]
 		t1 = datetime.now()
-		cppGen = CPPCodeGenerator(prog, prog.fact_dir, output['data'])
-		cppGen.generate()
+		generate_cpp(output, cache=COMPILATION_CACHE)
 		t2 = datetime.now()
 		tdelta = t2 - t1
 		return mk_succ_stat(),tdelta
@@ -25,13 +25,14 @@ for Large Distributed Ensembles) from the Qatar National Research Fund (a member
 Foundation). The statements made herein are solely the responsibility of the authors.
 '''
 
-from msrex.frontend.analyze.inspectors import Inspector
+from msrex.frontend.analyze.inspectors import Inspector, invalidate_free_vars
 
 class Transformer:
 
 	def initialize(self, decs):
 		self.decs = decs
 		self.inspect = Inspector()
+		invalidate_free_vars()
 
 	'''
 	def transform(self):
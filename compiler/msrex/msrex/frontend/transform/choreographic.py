@@ -26,7 +26,10 @@ for Large Distributed Ensembles) from the Qatar National Research Fund (a member
 Foundation). The statements made herein are solely the responsibility of the authors.
 '''
 
+import copy
+
 import msrex.frontend.lex_parse.ast as ast
+import msrex.frontend.lex_parse.parser as p
 import msrex.misc.visit as visit
 
 from msrex.misc.aggregators import subseteq, diff, foldl
@@ -43,7 +46,9 @@ from msrex.frontend.analyze.smt_solver import tyDest
 USE_IN_TRANS_THROTTLE = False;
 
 # This class executes a choreographic transformation of system-centric programs into
-# node-centric ones.
+# node-centric ones. The node-centric program is built directly from the (already checked and transformed)
+# declarations of the system-centric program. Only the synthesized sync declarations are generated as codes:
+# these are appended to the source text and parsed from there, so that they come with their own source spans.
 class Choreographic(Transformer):
 
 	def __init__(self, decs, source_text):
@@ -98,7 +103,107 @@ class Choreographic(Transformer):
 		sync_mods_codes, sync_preds_codes, sync_exports_codes = self.generateSyncPredCodes(sync_pred_infos, sync_template_args)
 
 		role_decs = self.inspect.filter_decs(ensem_dec.decs, rolesig=True, roledef=True)
-		role_codes = map(lambda r: self.generateRoleCode(r, monotone_facts), role_decs)
+
+		if len(sync_pred_infos) > 0:
+			common_sync_rule_codes = ["rule checkTrans :: { [X]%s() } --o 1." % sync_template_args['checkTrans']]
+
+			for fact_name,mono_info in monotone_facts.items():
+				common_sync_rule_codes.append( "rule %sUnlock :: [X]%s(T__), { [X]%s(T__) } --o [X]%s()." % (fact_name,mono_info['unlock'],mono_info['lock'],mono_info['check']) )
+
+			for fact_name,mono_info in monotone_facts.items():
+				common_sync_rule_codes.append( "rule check%s :: { [X]%s() } --o 1." % (fact_name,mono_info['check']) )
+		else:
+			common_sync_rule_codes = []
+
+		sync_decs_codes = [sync_mods_codes] + monotone_predlocks_codes + [sync_preds_codes] + sync_exports_codes
+		self.buildNodeCentricDecs(ensem_dec, execute_dec, rule_decs, prog_rules_codes, sync_decs_codes, common_sync_rule_codes)
+
+		self.top_level_template_args = { 'ensem_name'       : ensem_dec.name
+                                               , 'sync_mods_codes'  : sync_mods_codes
+                                               , 'prog_mods_codes'  : prog_mods_codes
+                                               , 'sync_preds_codes' : sync_preds_codes
+                                               , 'monotone_predlocks_codes' : monotone_predlocks_codes
+                                               , 'prog_preds_codes' : prog_preds_codes
+                                               , 'sync_exports_codes' : sync_exports_codes
+                                               , 'prog_exports_codes' : prog_exports_codes
+                                               , 'prog_rules_codes'   : prog_rules_codes
+                                               , 'common_sync_rule_codes' : common_sync_rule_codes }
+		self.monotone_facts = monotone_facts
+		self.role_decs      = role_decs
+		self.execute_dec    = execute_dec
+		self.node_centric_prog_codes = None
+
+	# Rules that are replaced by their node-centric sync compilation
+	def isSyncCompiled(self, rule_dec):
+		return rule_dec.requires_sync or rule_dec.is_system_centric
+
+	def buildNodeCentricDecs(self, ensem_dec, execute_dec, rule_decs, prog_rules_codes, sync_decs_codes, common_sync_rule_codes):
+		source_text = self.source_text + "\n\n"
+		sync_start  = len(source_text)
+		source_text += "ensem %s {\n" % ensem_dec.name
+		source_text += "\n".join( sync_decs_codes ) + "\n"
+		rule_spans = []
+		for (rule_dec,rule_codes) in zip(rule_decs, prog_rules_codes):
+			if self.isSyncCompiled(rule_dec):
+				rule_start = len(source_text)
+				source_text += rule_codes + "\n\n"
+				rule_spans.append( (rule_dec,(rule_start,len(source_text))) )
+			else:
+				rule_spans.append( (rule_dec,None) )
+		common_start = len(source_text)
+		source_text += "\n".join( common_sync_rule_codes ) + "\n}\n"
+
+		sync_ensem_dec = p.run_parser_input(source_text, start=sync_start)[0]
+		sync_decs = sync_ensem_dec.decs
+		sync_rule_decs = self.inspect.filter_decs(sync_decs, rule=True)
+
+		# Node-centric rules, in the order of the rules they originate from, followed by the common sync rules
+		nc_rule_decs = []
+		for (rule_dec,span) in rule_spans:
+			if span == None:
+				nc_rule_decs.append( rule_dec )
+			else:
+				(rule_start,rule_end) = span
+				nc_rule_decs += filter(lambda r: rule_start <= r.lex_start and r.lex_start < rule_end, sync_rule_decs)
+		nc_rule_decs += filter(lambda r: r.lex_start >= common_start, sync_rule_decs)
+
+		inspect = self.inspect
+		extern_decs = inspect.filter_decs(ensem_dec.decs, extern=True) + inspect.filter_decs(sync_decs, extern=True)
+		fact_decs   = inspect.filter_decs(ensem_dec.decs, fact=True) + inspect.filter_decs(sync_decs, fact=True)
+		role_decs   = inspect.filter_decs(ensem_dec.decs, rolesig=True, roledef=True)
+		export_decs = inspect.filter_decs(ensem_dec.decs, export=True) + inspect.filter_decs(sync_decs, export=True)
+
+		# Ensemble of the synthesized declarations only, with the predicates and externs they depend on
+		check_ensem_dec = copy.copy( sync_ensem_dec )
+		check_ensem_dec.decs = extern_decs + fact_decs + inspect.filter_decs(sync_decs, export=True) + sync_rule_decs
+
+		sync_ensem_dec.decs = extern_decs + fact_decs + role_decs + export_decs + nc_rule_decs
+
+		self.node_centric_source_text = source_text
+		self.node_centric_decs = inspect.filter_decs(self.decs, pragmas=True) + [sync_ensem_dec, execute_dec]
+		self.sync_decs = [check_ensem_dec]
+
+	# Source text of the node-centric program: the source text of the system-centric program, followed by
+	# the codes of the synthesized declarations.
+	def getSourceText(self):
+		return self.node_centric_source_text
+
+	def getNodeCentricDecs(self):
+		return self.node_centric_decs
+
+	# Declarations synthesized by the transformation, which are the only ones left to be checked and transformed.
+	def getSyncDecs(self):
+		return self.sync_decs
+
+	# Codes of the whole node-centric program. Only needed for debugging, hence generated on demand.
+	def getGeneratedCodes(self):
+		if self.node_centric_prog_codes == None:
+			self.node_centric_prog_codes = self.generateNodeCentricCodes()
+		return self.node_centric_prog_codes
+
+	def generateNodeCentricCodes(self):
+		role_codes = map(lambda r: self.generateRoleCode(r, self.monotone_facts), self.role_decs)
+		prog_execute_codes = self.generateExecuteCodes(self.execute_dec, self.monotone_facts)
 
 		node_centric_template = template('''
 		ensem {| ensem_name |} {
@@ -126,37 +231,8 @@ class Choreographic(Transformer):
 		}
 		''')
 
-		if len(sync_pred_infos) > 0:
-			common_sync_rule_codes = ["rule checkTrans :: { [X]%s() } --o 1." % sync_template_args['checkTrans']]
-
-			for fact_name,mono_info in monotone_facts.items():
-				common_sync_rule_codes.append( "rule %sUnlock :: [X]%s(T__), { [X]%s(T__) } --o [X]%s()." % (fact_name,mono_info['unlock'],mono_info['lock'],mono_info['check']) )
-
-			for fact_name,mono_info in monotone_facts.items():
-				common_sync_rule_codes.append( "rule check%s :: { [X]%s() } --o 1." % (fact_name,mono_info['check']) )
-		else:
-			common_sync_rule_codes = []
-
-		prog_execute_codes = self.generateExecuteCodes(execute_dec, monotone_facts)
-
-		
-		top_level_template_args = { 'ensem_name'       : ensem_dec.name
-                                          , 'sync_mods_codes'  : sync_mods_codes
-                                          , 'prog_mods_codes'  : prog_mods_codes
-                                          , 'sync_preds_codes' : sync_preds_codes
-                                          , 'monotone_predlocks_codes' : monotone_predlocks_codes
-                                          , 'prog_preds_codes' : prog_preds_codes
-                                          , 'role_codes' : role_codes
-                                          , 'sync_exports_codes' : sync_exports_codes
-                                          , 'prog_exports_codes' : prog_exports_codes
-                                          , 'prog_rules_codes'   : prog_rules_codes
-                                          , 'common_sync_rule_codes' : common_sync_rule_codes
-                                          , 'prog_execute_codes' : prog_execute_codes }
-
-		self.node_centric_prog_codes = compile_template(node_centric_template, **top_level_template_args)
-
-	def getGeneratedCodes(self):
-		return self.node_centric_prog_codes
+		return compile_template(node_centric_template, role_codes=role_codes, prog_execute_codes=prog_execute_codes
+                                       ,**self.top_level_template_args)
 
 	def generateModuleCode(self, module_dec):
 		return self.source_text[module_dec.lex_start:module_dec.lex_end]
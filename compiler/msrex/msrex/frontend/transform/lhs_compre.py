@@ -33,7 +33,7 @@ from msrex.misc.aggregators import foldl
 import msrex.frontend.lex_parse.ast as ast
 import msrex.misc.visit as visit
 
-from msrex.frontend.analyze.inspectors import Inspector
+from msrex.frontend.analyze.inspectors import Inspector, invalidate_free_vars
 
 from msrex.frontend.analyze.smt_solver import tyInt, tyMSet
 
@@ -63,6 +63,7 @@ class LHSCompre(Transformer):
 			term_range.type     = ast.TypeMSet( term_vars.type )
 			term_range.smt_type = tyMSet( tyInt )
 			compre.comp_ranges  = [ ast.CompRange(term_vars, term_range) ]
+			invalidate_free_vars()
 		if compre.compre_mod == ast.COMP_NONE_EXISTS:
 			term_range = compre.comp_ranges[0].term_range
 			comp_none_exist_grd = ast.TermBinOp( ast.TermApp(ast.TermCons("size"), term_range), "==", ast.TermLit(0, "int"))
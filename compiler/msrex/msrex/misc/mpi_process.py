@@ -26,18 +26,23 @@ Foundation). The statements made herein are solely the responsibility of the aut
 '''
 
 
+import os
 import sys
 import time
+import struct
+import marshal
 
 from uuid import uuid4
+from Queue import Empty
+from collections import deque
+from threading import Thread
 
-from array import array
 from mpi4py import MPI
-from json import dumps, loads
 
 from multiprocessing import Process, Queue
 
 # from msr_ensemble.misc.debug import debug
+from msre.misc.shm_channel import ShmChannel, channel_dir, create_channel, remove_channel, DEFAULT_CAPACITY
 from msre.misc.msr_logging import init_logger, get_logger, log_debug, log_info, log_warn, log_error, log_critical
 
 # This module implements Python multiprocessing within MPI nodes.
@@ -50,36 +55,121 @@ from msre.misc.msr_logging import init_logger, get_logger, log_debug, log_info,
 
 # MPI Asynchronous send and receive
 # 
-# WARNING: These operations are meant only to be used by master process,
-# they are not thread safe! Only one process should ever be access them.
+# WARNING: These operations are meant only to be used by master process.
+# Sends happen in the master loop, receives in a dedicated thread of the master process
+# (see receive_facts_loop), which requires MPI to provide THREAD_MULTIPLE. Otherwise, the
+# master loop polls for received messages itself, and no other thread ever accesses them.
+# Sends never block (see send_facts): in either mode, messages keep being received while
+# sends are pending, so masters sending to each other do not deadlock.
 
 FACT_TAG    = 10
-#BUFFER_SIZE = '\0'*128
-BUFFER_SIZE = '\0'*512
+STOP_TAG    = 11
+BUFFER_SIZE = 512
 
 comm = MPI.COMM_WORLD
 
+# Binary wire format
+#
+# Facts sent to the same MPI rank are batched into a single message: an int32 header with the number
+# of facts, followed by the facts in marshal format (binary, and decoded in C directly from the
+# receive buffer). Facts are dictionaries of basic Python values (numbers, strings, lists, tuples, dicts).
+
+HEADER_STRUCT  = struct.Struct('<i')
+MARSHAL_FORMAT = 2
+
+def encode_facts(facts):
+	return HEADER_STRUCT.pack(len(facts)) + marshal.dumps(facts, MARSHAL_FORMAT)
+
+# Decodes a batch of facts from buf, which can be a str or a buffer over a received message.
+def decode_facts(buf):
+	n = HEADER_STRUCT.unpack_from(buf, 0)[0]
+	facts = marshal.loads(buffer(buf, HEADER_STRUCT.size))
+	if len(facts) != n:
+		raise ValueError("Corrupted fact batch: expected %s facts, got %s" % (n,len(facts)))
+	return facts
+
+# Sends facts to their addressed MPI ranks, in one message per rank, without blocking: two masters sending
+# each other large batches would otherwise both block in their sends. Returns the pending sends, as
+# (request,buffer) pairs, whose buffers must be kept until the request completes (see complete_sends).
 def send_facts(facts):
+	rank_facts = {}
 	for fact in facts:
-		send_fact(fact)
+		rank = fact['rank']
+		if rank in rank_facts:
+			rank_facts[rank].append( fact )
+		else:
+			rank_facts[rank] = [fact]
+	sends = []
+	for rank,fs in rank_facts.items():
+		buf = encode_facts(fs)
+		sends.append( (comm.Isend([buf,MPI.BYTE], dest=rank, tag=FACT_TAG),buf) )
+	return sends
 
 def send_fact(fact):
-	req = comm.Isend([dumps(fact),MPI.CHAR], dest=fact['rank'], tag=FACT_TAG)
-	req.wait()
+	return send_facts([fact])
+
+# Returns the sends that have not completed yet.
+def complete_sends(sends):
+	return filter(lambda (req,_): not req.Test(), sends)
+
+# Receive buffer, reused across messages and grown to fit the largest message probed so far.
+class ReceiveBuffer:
+
+	def __init__(self, size=BUFFER_SIZE):
+		self.buf = bytearray(size)
+
+	def fit(self, size):
+		if len(self.buf) < size:
+			self.buf = bytearray(max(size, 2*len(self.buf)))
+		return self.buf
+
+recv_buffer = ReceiveBuffer()
 
+def receive_probed_facts(status):
+	n = status.Get_count(MPI.BYTE)
+	buf = recv_buffer.fit(n)
+	comm.Recv([buf,n,MPI.BYTE], source=status.Get_source(), tag=FACT_TAG)
+	return decode_facts(buffer(buf, 0, n))
+
+# Blocks until a batch of facts is received, and returns the facts of the batch.
+def receive_facts_mpi():
+	status = MPI.Status()
+	comm.Probe(source=MPI.ANY_SOURCE, tag=FACT_TAG, status=status)
+	return receive_probed_facts(status)
+
+# Returns a future that, when called, returns the facts of the next received batch, or None if
+# there is none yet. The size of the batch is probed first, so facts are never truncated.
 def receive_fact_future_mpi():
-	buf = array('c',BUFFER_SIZE)
-	req = comm.Irecv([buf,MPI.CHAR], source=MPI.ANY_SOURCE, tag=FACT_TAG)
 	status = MPI.Status()
 	def future():
-		(received,_) = req.test(status)
-		if received:
-			n = status.Get_count(MPI.CHAR)
-			return loads(buf[:n].tostring())
+		if comm.Iprobe(source=MPI.ANY_SOURCE, tag=FACT_TAG, status=status):
+			return receive_probed_facts(status)
 		else:
 			return None
 	return future
 
+# Receives batches of facts from MPI and forwards them as delivery requests to the master channel.
+# Runs in a dedicated thread of the master process, blocked in MPI probe until a message arrives.
+# Stops when it receives a message with STOP_TAG (see stop_receive_thread).
+def receive_facts_loop(master_channel):
+	status = MPI.Status()
+	while True:
+		comm.Probe(source=MPI.ANY_SOURCE, tag=MPI.ANY_TAG, status=status)
+		if status.Get_tag() == STOP_TAG:
+			comm.Recv([bytearray(1),1,MPI.BYTE], source=status.Get_source(), tag=STOP_TAG)
+			return
+		facts = receive_probed_facts(status)
+		master_channel.put({ 'task':DELIVER_MSG, 'msgs':facts, 'time':time.time() })
+
+# Returns true iff MPI calls can be made concurrently by the master loop and the receive thread
+def mpi_thread_multiple():
+	return MPI.Query_thread() == MPI.THREAD_MULTIPLE
+
+def stop_receive_thread(rank, recv_thread):
+	req = comm.Isend([bytearray(1),1,MPI.BYTE], dest=rank, tag=STOP_TAG)
+	recv_thread.join()
+	req.wait()
+
 # Auxiliary Functions
 
 CREATE_WORKER = 0
@@ -90,6 +180,116 @@ KILL_SELF     = 2
 def gen_proc_id():
 	return str(uuid4())
 
+# File of the shared memory channel of worker proc_id
+def channel_file(channel_prefix, proc_id):
+	return channel_prefix + proc_id
+
+# Counters of the master process. Latency of a request is the time between a worker (or the MPI receive
+# thread) issuing it, and the master process handling it.
+class MasterStats:
+
+	def __init__(self):
+		self.start_time    = time.time()
+		self.requests      = 0
+		self.batches       = 0
+		self.internal_msgs = 0
+		self.external_msgs = 0
+		self.total_latency = 0.0
+		self.max_latency   = 0.0
+		self.forks         = 0
+		self.reuses        = 0
+		self.total_spawn_latency = 0.0
+		self.max_spawn_latency   = 0.0
+
+	def record_request(self, req, now):
+		self.requests += 1
+		if 'time' in req:
+			latency = now - req['time']
+			self.total_latency += latency
+			self.max_latency = max(self.max_latency, latency)
+
+	def avg_latency(self):
+		return self.total_latency / self.requests if self.requests > 0 else 0.0
+
+	# Spawn latency of a worker is the time between its creation request and its assignment to a pool process
+	def record_spawn(self, latency, forked):
+		if forked:
+			self.forks += 1
+		else:
+			self.reuses += 1
+		self.total_spawn_latency += latency
+		self.max_spawn_latency = max(self.max_spawn_latency, latency)
+
+	def avg_spawn_latency(self):
+		spawns = self.forks + self.reuses
+		return self.total_spawn_latency / spawns if spawns > 0 else 0.0
+
+	# Messages delivered per second
+	def throughput(self):
+		elapsed = time.time() - self.start_time
+		return (self.internal_msgs + self.external_msgs) / elapsed if elapsed > 0 else 0.0
+
+	def __str__(self):
+		return ("%s requests in %s batches, %s internal and %s external messages, latency avg %.6fs max %.6fs, %.1f msgs/s, "
+                        "%s workers spawned (%s forked, %s reused), spawn latency avg %.6fs max %.6fs") % (
+                        self.requests,self.batches,self.internal_msgs,self.external_msgs,self.avg_latency(),self.max_latency,self.throughput()
+                       ,self.forks+self.reuses,self.forks,self.reuses,self.avg_spawn_latency(),self.max_spawn_latency)
+
+# Worker Pool
+# A pool process is a pre-forked OS process that runs the routines of the workers assigned to it by the master
+# process, one at a time. Worker ids are logical: when a worker routine finishes, its pool process becomes idle
+# and can be assigned a new worker. The worker channel of a pool process is reused by all its workers.
+class PoolProcess:
+
+	def __init__(self, master):
+		self.assign_channel = Queue()
+		self.worker_channel = Queue()
+		self.proc_id    = None
+		self.idle_since = time.time()
+		self.proc = Process(target=run_pool_process, args=(master,self) )
+		self.proc.start()
+
+	def assign(self, proc_id):
+		self.proc_id = proc_id
+		self.assign_channel.put( proc_id )
+
+	def release(self):
+		self.proc_id = None
+		self.idle_since = time.time()
+
+	def stop(self):
+		self.assign_channel.put( None )
+
+	def join(self):
+		self.proc.join()
+
+# Worker channel of a worker waiting for a pool process. Messages are kept until the worker is assigned one.
+class PendingChannel:
+
+	def __init__(self):
+		self.msgs = []
+
+	def put(self, msg):
+		self.msgs.append( msg )
+
+# Logger of the pool process, shared by all the workers it runs (see WorkerProcess.initialize)
+pool_logger = None
+
+def run_pool_process(master, pool_proc):
+	global pool_logger
+	pool_name = "pool_%s_%s" % (master.rank, os.getpid())
+	pool_logger = init_logger(pool_name, log_file=(pool_name + ".log") if master.file_logging else None)
+	while True:
+		proc_id = pool_proc.assign_channel.get()
+		if proc_id == None:
+			break
+		work_proc = master.new_worker(master.rank, proc_id, pool_proc.worker_channel, master.master_channel)
+		work_proc.channel_prefix = master.channel_prefix
+		work_proc.routine()
+		work_proc.finished = True
+		work_proc.close_channels()
+		work_proc.kill()
+
 # Master Process
 # The class that represents a master process. A Master process has the following responsibilities:
 #       - Creating new worker processes
@@ -101,6 +301,10 @@ def gen_proc_id():
 # Requests can be either:
 #       - Deliver message request
 #	- Create new worker request
+#	- Worker termination request
+# Messages between workers of the same MPI node do not go through the master process: each worker has
+# a shared memory channel (see shm_channel module), in which co-workers put messages directly. Only when
+# the channel of the addressed worker is full, or does not exist yet, are messages delivered by the master.
 # Workers are addressed by unique id, that is either:
 #       - A uuid (RFC 4122) 
 #       - Rank of the MPI node (For the first worker of each MPI node)
@@ -109,22 +313,41 @@ class MasterProcess:
 
 	# Initialize the master process. Arguments as follows:
 	#   - rank: Rank of the MPI node
-	#   - sleep_length: Base length of each sleep cycle
-        #   - sleep_factor: Base multiplier of each sleep cycle
-        #   - sleep_limit: Number of consecutive sleeps before sleep length saturates 
-	def initialize(self, rank, sleep_length=0.1, sleep_factor=2, sleep_limit=4, init_workers=1, file_logging=False):
+	#   - idle_timeout: Time (in seconds) without requests, after all workers are dead, before the master shuts down
+	#   - batch_size: Maximum number of requests handled in each cycle
+	#   - poll_interval: Time (in seconds) between polls for MPI messages, when MPI does not provide THREAD_MULTIPLE
+	#   - channel_capacity: Size (in bytes) of the shared memory channel of each worker
+	#   - pool_min_size: Number of pool processes forked in advance, and kept even when idle
+	#   - pool_max_size: Maximum number of pool processes (None for no limit). Once reached, new workers wait for a
+	#                    pool process to become idle
+	#   - pool_idle_timeout: Time (in seconds) after which idle pool processes (beyond pool_min_size) are stopped
+	def initialize(self, rank, idle_timeout=1.5, batch_size=64, init_workers=1, file_logging=False, channel_capacity=DEFAULT_CAPACITY
+                      ,pool_min_size=1, pool_max_size=None, pool_idle_timeout=5.0, poll_interval=0.01):
 		
 		self.rank = rank
 		self.master_channel  = Queue()
 		self.worker_procs    = {}
 		self.worker_channels = {}
 
-		self.sleep_length    = sleep_length
-		self.sleep_factor    = sleep_factor
-		self.sleep_limit     = sleep_limit
+		self.idle_timeout  = idle_timeout
+		self.batch_size    = batch_size
+		self.last_activity = time.time()
+		self.stats         = MasterStats()
+
+		self.poll_interval = poll_interval
+		self.recv_thread   = None
+		self.recv_future   = None
+		self.pending_sends = []
+
+		self.channel_prefix   = os.path.join(channel_dir(), "msre_%s_%s_" % (os.getpid(),rank))
+		self.channel_capacity = channel_capacity
 
-		self.curr_sleep_length = sleep_length
-		self.curr_sleep_limit  = sleep_limit
+		self.pool_min_size     = pool_min_size
+		self.pool_max_size     = pool_max_size
+		self.pool_idle_timeout = pool_idle_timeout
+		self.pool_procs        = []
+		self.idle_pool_procs   = []
+		self.pending_workers   = deque()
 
 		self.init_workers = init_workers
 		self.file_logging = file_logging
@@ -136,8 +359,9 @@ class MasterProcess:
 		self.logger = init_logger("master_%s" % rank, log_file=master_log_file)
 
 	# Returns true iff:
-	#   - All worker processes are not alive
-	#   - Sleep limit has been reached
+	#   - Some worker process is alive, or
+	#   - Some MPI send has not completed yet, or
+	#   - The master process has been idle for less than idle_timeout
 	def is_alive(self):
 		'''
 		procs = self.worker_procs
@@ -146,100 +370,200 @@ class MasterProcess:
 			if proc.is_alive():
 				return True
 		'''
-		if len(self.worker_procs) > 0:
+		if len(self.worker_procs) > 0 or len(self.pending_sends) > 0:
 			return True
 
 		# debug("Master %s finds all workers Dead!" % self.rank)
 		log_info(self.logger,"All workers Dead!")
 
-		if self.curr_sleep_limit > 0:
-			return True
+		return time.time() - self.last_activity < self.idle_timeout
+
+	# Blocks until a request is available in the master channel (or idle_timeout expires), and returns
+	# it together with the other requests (up to batch_size) already in the channel.
+	# Without a receive thread, MPI is polled first and the master channel is waited on for poll_interval only.
+	# The same holds while MPI sends are pending, so that they are tested (and complete) while messages from
+	# their destinations keep being received.
+	def next_requests(self):
+		if self.recv_thread == None:
+			self.poll_mpi()
+		if self.recv_thread == None or len(self.pending_sends) > 0:
+			timeout = self.poll_interval
 		else:
-			return False
-
-	# Sleep for specified amount of time. Increments next sleep cycle
-	def sleep(self):
-		log_info(self.logger, "Sleeping: %s" % self.curr_sleep_limit )
-		time.sleep(self.curr_sleep_length)
-		if self.curr_sleep_limit > 0:
-			self.curr_sleep_length *= self.sleep_factor
-			self.curr_sleep_limit -= 1
-
-	# Reset sleep cycle to original base values
-	def reset_sleep(self):
-		self.curr_sleep_length = self.sleep_length
-		self.curr_sleep_limit  = self.sleep_limit
+			timeout = self.idle_timeout
+		try:
+			reqs = [self.master_channel.get(timeout=timeout)]
+		except Empty:
+			return []
+		try:
+			while len(reqs) < self.batch_size:
+				reqs.append( self.master_channel.get_nowait() )
+		except Empty:
+			pass
+		return reqs
+
+	# Forwards the fact batches received from MPI so far to the master channel, as delivery requests.
+	def poll_mpi(self):
+		facts = self.recv_future()
+		while facts != None:
+			self.master_channel.put({ 'task':DELIVER_MSG, 'msgs':facts, 'time':time.time() })
+			facts = self.recv_future()
+
+	# Starts the thread that receives MPI messages, if MPI provides THREAD_MULTIPLE. Otherwise, the master
+	# loop polls MPI (see next_requests).
+	def start_receiving(self):
+		if mpi_thread_multiple():
+			self.recv_thread = Thread(target=receive_facts_loop, args=(self.master_channel,))
+			self.recv_thread.daemon = True
+			self.recv_thread.start()
+		elif self.recv_future == None:
+			log_info(self.logger, "MPI does not provide THREAD_MULTIPLE, polling for messages")
+			self.recv_future = receive_fact_future_mpi()
+
+	def stop_receiving(self):
+		if self.recv_thread != None:
+			stop_receive_thread(self.rank, self.recv_thread)
+			self.recv_thread = None
 
 	# Add to master's own work queue, an order to create a new worker 
 	def create_new_worker(self, proc_id=None):
 		if proc_id == None:
 			proc_id = gen_proc_id()
-		self.master_channel.put({ 'task':CREATE_WORKER, 'proc_id':proc_id })
+		self.master_channel.put({ 'task':CREATE_WORKER, 'proc_id':proc_id, 'time':time.time() })
 		return proc_id
 
-	# Main master process loop. First initializes a number of worker processes (as indicated by init_workers) and
-	# begins to run a loop that manages communications between workers and MPI nodes. In each cycle, it does the following:
-	#    - Does an asynchronous read from MPI interface for any message and forwards it to the addressed worker
-	#    - Reads from request queue (master_channel) and process either a message delivery request, or worker creation
-	#      request.
+	# Main master process loop. First forks the worker pool and initializes a number of worker processes (as indicated
+	# by init_workers), starts receiving messages from the MPI interface into the master's request queue (master_channel), and
+	# begins to run a loop that manages communications between workers and MPI nodes. In each cycle, it blocks until
+	# requests are available in the request queue and processes them in a batch: message delivery requests (from
+	# workers or MPI nodes), worker creation requests and worker termination requests. MPI sends are non-blocking,
+	# and completed sends are released at the end of each cycle.
 	# Loop continues, until liveness condition is no more (see is_alive method for details)
 	def start(self):
 		log_info(self.logger, "Started")
-		master_channel  = self.master_channel
-		worker_channels = self.worker_channels
+
+		for _ in range(0,self.pool_min_size):
+			self.idle_pool_procs.append( self.fork_pool_process() )
 
 		self.create_new_worker(str(self.rank))
 		for _ in range(0,self.init_workers-1):
 			self.create_new_worker()
 
-		done_something = False
-		recv_future = receive_fact_future_mpi()
-		while self.is_alive():
+		self.start_receiving()
 
-			if not master_channel.empty():
-				int_msg = master_channel.get()
-				task_type = int_msg['task']
-				if task_type == DELIVER_MSG:
-					msgs = int_msg['msgs']
-					log_info(self.logger, "Delivering messages %s" % msgs)
-					for data in msgs:
-						if data['rank'] == self.rank:
-							log_info(self.logger, "Internal message, sending to worker %s" % data['proc_id'])
-							worker_channels[data['proc_id']].put( data )
-						else:
-							log_info(self.logger, "External message, sending to MPI rank %s" % data['rank'])
-							send_fact( data )
-				elif task_type == CREATE_WORKER:
-					proc_id = int_msg['proc_id']
-					log_info(self.logger, "Creating worker %s" % proc_id)
-					worker_channel = Queue()
-					worker_channels[proc_id] = worker_channel
-					p = self.new_worker(self.rank, proc_id, worker_channel, master_channel)
-					p.start()
-					self.worker_procs[proc_id] = p
-				elif task_type == KILL_SELF:
-					proc_id = int_msg['proc_id']
-					log_info(self.logger, "Killing worker %s" % proc_id)
-					# self.worker_procs[proc_id].terminate()
-					del self.worker_channels[proc_id]
-					del self.worker_procs[proc_id]
-				done_something = True
-	
-			mpi_msg = recv_future()
-			
-			if mpi_msg != None:
-				worker_channels[mpi_msg['proc_id']].put( mpi_msg )
-				done_something = True
-				recv_future = receive_fact_future_mpi()
-
-			if done_something:
-				done_something = False
-				self.reset_sleep()
-			else:
-				self.sleep()
-		log_info(self.logger,"Shutting Down")
-
-	# Returns a new worker process. This method is to be overwritten 
+		while self.is_alive():
+			reqs = self.next_requests()
+			if len(reqs) > 0:
+				self.handle_requests(reqs)
+				self.last_activity = time.time()
+			self.pending_sends = complete_sends( self.pending_sends )
+			self.stop_idle_pool_processes()
+
+		self.stop_receiving()
+		for proc_id in self.worker_procs:
+			remove_channel( channel_file(self.channel_prefix, proc_id) )
+		for pool_proc in self.pool_procs:
+			pool_proc.stop()
+		for pool_proc in self.pool_procs:
+			pool_proc.join()
+		log_info(self.logger, "Shutting Down: %s", self.stats)
+
+	# Returns the number of busy pool processes and the size of the pool
+	def pool_occupancy(self):
+		return (len(self.pool_procs) - len(self.idle_pool_procs), len(self.pool_procs))
+
+	# Pool processes are never forked while the receive thread is running: it is stopped during the fork.
+	def fork_pool_process(self):
+		receiving = self.recv_thread != None
+		if receiving:
+			self.stop_receiving()
+		pool_proc = PoolProcess(self)
+		self.pool_procs.append( pool_proc )
+		if receiving:
+			self.start_receiving()
+		return pool_proc
+
+	# Assigns worker proc_id to an idle pool process, or a newly forked one if the pool is not full yet.
+	def create_worker(self, proc_id, req_time):
+		log_info(self.logger, "Creating worker %s", proc_id)
+		create_channel( channel_file(self.channel_prefix, proc_id), capacity=self.channel_capacity )
+		if len(self.idle_pool_procs) > 0:
+			self.assign_worker(self.idle_pool_procs.pop(), proc_id, req_time, False)
+		elif self.pool_max_size == None or len(self.pool_procs) < self.pool_max_size:
+			self.assign_worker(self.fork_pool_process(), proc_id, req_time, True)
+		else:
+			log_info(self.logger, "Worker pool is full, worker %s waits for an idle pool process", proc_id)
+			self.worker_channels[proc_id] = PendingChannel()
+			self.worker_procs[proc_id] = None
+			self.pending_workers.append( (proc_id,req_time) )
+
+	def assign_worker(self, pool_proc, proc_id, req_time, forked):
+		if isinstance(self.worker_channels.get(proc_id), PendingChannel):
+			for msg in self.worker_channels[proc_id].msgs:
+				pool_proc.worker_channel.put( msg )
+		self.worker_channels[proc_id] = pool_proc.worker_channel
+		self.worker_procs[proc_id] = pool_proc
+		pool_proc.assign( proc_id )
+		self.stats.record_spawn(time.time() - req_time, forked)
+
+	# Worker proc_id has finished: its pool process is assigned the next waiting worker, or becomes idle.
+	def release_worker(self, proc_id):
+		log_info(self.logger, "Killing worker %s", proc_id)
+		pool_proc = self.worker_procs[proc_id]
+		del self.worker_channels[proc_id]
+		del self.worker_procs[proc_id]
+		remove_channel( channel_file(self.channel_prefix, proc_id) )
+		pool_proc.release()
+		if len(self.pending_workers) > 0:
+			(next_proc_id,req_time) = self.pending_workers.popleft()
+			self.assign_worker(pool_proc, next_proc_id, req_time, False)
+		else:
+			self.idle_pool_procs.append( pool_proc )
+
+	# Stops pool processes that have been idle for longer than pool_idle_timeout, keeping at least pool_min_size of them.
+	# Idle pool processes are reused last in, first out, so the ones idle the longest are at the front.
+	def stop_idle_pool_processes(self):
+		now = time.time()
+		while len(self.pool_procs) > self.pool_min_size and len(self.idle_pool_procs) > 0 \
+                      and now - self.idle_pool_procs[0].idle_since > self.pool_idle_timeout:
+			pool_proc = self.idle_pool_procs.pop(0)
+			self.pool_procs.remove( pool_proc )
+			pool_proc.stop()
+			pool_proc.join()
+
+	# Processes a batch of requests. External messages of the whole batch are sent together, in one MPI message per rank.
+	def handle_requests(self, reqs):
+		worker_channels = self.worker_channels
+		stats = self.stats
+		now = time.time()
+		ext_msgs = []
+		for int_msg in reqs:
+			stats.record_request(int_msg, now)
+			task_type = int_msg['task']
+			if task_type == DELIVER_MSG:
+				msgs = int_msg['msgs']
+				log_info(self.logger, "Delivering messages %s", msgs)
+				for data in msgs:
+					if data['rank'] == self.rank:
+						if data['proc_id'] not in worker_channels:
+							log_info(self.logger, "Internal message to exited worker %s, dropped", data['proc_id'])
+							continue
+						log_info(self.logger, "Internal message, sending to worker %s", data['proc_id'])
+						worker_channels[data['proc_id']].put( data )
+						stats.internal_msgs += 1
+					else:
+						log_info(self.logger, "External message, sending to MPI rank %s", data['rank'])
+						ext_msgs.append( data )
+			elif task_type == CREATE_WORKER:
+				self.create_worker(int_msg['proc_id'], int_msg.get('time', now))
+			elif task_type == KILL_SELF:
+				self.release_worker(int_msg['proc_id'])
+		if len(ext_msgs) > 0:
+			self.pending_sends += send_facts( ext_msgs )
+			stats.external_msgs += len(ext_msgs)
+		stats.batches += 1
+
+	# Returns a new worker process. This method is to be overwritten. Note that it is called by pool
+	# processes, to build the worker they are assigned. 
 	def new_worker(self, rank, proc_id, worker_channel, master_channel):
 		return WorkerProcess(rank, proc_id, worker_channel, master_channel, file_logging=self.file_logging)
 
@@ -255,12 +579,25 @@ class WorkerProcess:
 		self.worker_channel = worker_channel
 		self.master_channel = master_channel
 		self.proc = None
-
-		if file_logging:
-			worker_log_file = "worker_%s_%s.log" % (rank,proc_id)
+		self.finished = False
+
+		# Shared memory channels, set by the master process and opened by the worker process on first use
+		self.channel_prefix = None
+		self.inbox          = None
+		self.peer_channels  = {}
+		self.pending_msgs   = deque()
+		# Number of messages to each co-worker that were delivered by the master process, and not acknowledged yet
+		self.master_routed  = {}
+
+		# Workers run by a pool process use its logger, instead of initializing one each
+		if pool_logger != None:
+			self.logger = pool_logger
 		else:
-			worker_log_file = None
-		self.logger = init_logger("worker_%s_%s" % (rank,proc_id), log_file=worker_log_file)
+			if file_logging:
+				worker_log_file = "worker_%s_%s.log" % (rank,proc_id)
+			else:
+				worker_log_file = None
+			self.logger = init_logger("worker_%s_%s" % (rank,proc_id), log_file=worker_log_file)
 
 	# Start the worker process. This method creates a process (from multiprocessing module)
 	# and runs the method 'routine' of this class.
@@ -268,42 +605,162 @@ class WorkerProcess:
 		self.proc = Process(target=run_worker_routine, args=(self,) )
 		self.proc.start()		
 
-	# Returns true iff process running the worker routine is alive.
+	# Returns true iff process running the worker routine is alive. Workers run by a pool process
+	# have no process of their own, and are alive until their routine finishes.
 	def is_alive(self):
-		log_info(self.logger,"Testing liveness: %s" % (self.proc_id,self.proc.is_alive()))
-		return self.proc.is_alive()
+		if self.proc == None:
+			alive = not self.finished
+		else:
+			alive = self.proc.is_alive()
+		log_info(self.logger,"Testing liveness of %s: %s", self.proc_id, alive)
+		return alive
 
 	def terminate(self):
-		if self.proc.is_alive():
+		if self.proc != None and self.proc.is_alive():
 			self.proc.terminate()
 
-	# Returns true iff the worker message channel is empty
+	def get_inbox(self):
+		if self.inbox == None:
+			self.inbox = ShmChannel( channel_file(self.channel_prefix, self.proc_id) )
+		return self.inbox
+
+	# Returns the messages of the worker channel. The worker channel of a pool process may hold left over
+	# messages of its previous workers: these are discarded.
+	def take_worker_channel_msgs(self):
+		msgs = []
+		while not self.worker_channel.empty():
+			msg = self.worker_channel.get()
+			if msg['proc_id'] == self.proc_id:
+				msgs.append( msg )
+		return msgs
+
+	# Moves the messages of the worker message channels into pending messages, in the order they were sent
+	# by each co-worker. The worker channel is read before the shared memory channel, but its messages come
+	# after: a co-worker only sends through the master process once its earlier messages are in the shared
+	# memory channel, and only sends through the latter again once these are acknowledged (see put_local_msgs).
+	def take_msgs(self):
+		master_msgs = self.take_worker_channel_msgs()
+		if self.channel_prefix != None:
+			self.receive_msgs( self.get_inbox().take() )
+		self.receive_msgs( master_msgs )
+
+	def receive_msgs(self, msgs):
+		acks = {}
+		for msg in msgs:
+			if 'acks' in msg:
+				self.acknowledge(msg['ack_from'], msg['acks'])
+				continue
+			if 'routed_from' in msg:
+				sender = msg.pop('routed_from')
+				acks[sender] = acks.get(sender, 0) + 1
+			self.pending_msgs.append( msg )
+		for sender,count in acks.items():
+			self.send_ack(sender, count)
+
+	# Acknowledges to co-worker sender that count of its messages, delivered by the master process, were received.
+	# Acknowledgements of co-workers that have exited are dropped.
+	def send_ack(self, sender, count):
+		ack = { 'rank':self.rank, 'proc_id':sender, 'acks':count, 'ack_from':self.proc_id }
+		channel = self.get_peer_channel(sender)
+		if channel == None:
+			return
+		if not channel.put([ack]):
+			self.master_channel.put({ 'task':DELIVER_MSG, 'msgs':[ack], 'time':time.time() })
+
+	def acknowledge(self, proc_id, count):
+		if proc_id in self.master_routed:
+			self.master_routed[proc_id] -= count
+			if self.master_routed[proc_id] <= 0:
+				del self.master_routed[proc_id]
+
+	# Returns true iff the worker message channels are empty
 	def has_no_msgs(self):
-		return self.worker_channel.empty()
+		if len(self.pending_msgs) > 0:
+			return False
+		self.take_msgs()
+		return len(self.pending_msgs) == 0
 
-	# Returns a message from the worker message channel, None otherwise.
+	# Returns a message from the worker message channels, None otherwise.
 	def get_msg(self):
-		if not self.has_no_msgs():
-			return self.worker_channel.get()
-		else:
-			return None
+		if len(self.pending_msgs) == 0:
+			self.take_msgs()
+		if len(self.pending_msgs) > 0:
+			return self.pending_msgs.popleft()
+		return None
 
 	# Send a message 'data'. 
 	def send_msg(self, data):
-		self.master_channel.put({ 'task':DELIVER_MSG, 'msgs':[data] })
+		self.send_msgs([data])
 
+	# Send messages 'ds'. Messages to co-workers are put directly into their shared memory channels,
+	# while the rest are delivered by the master process.
 	def send_msgs(self, ds):
-		self.master_channel.put({ 'task':DELIVER_MSG, 'msgs':ds })
+		master_msgs = []
+		local_msgs  = {}
+		for data in ds:
+			if data['rank'] == self.rank and self.channel_prefix != None:
+				if data['proc_id'] in local_msgs:
+					local_msgs[data['proc_id']].append( data )
+				else:
+					local_msgs[data['proc_id']] = [data]
+			else:
+				master_msgs.append( data )
+		for proc_id,msgs in local_msgs.items():
+			if not self.put_local_msgs(proc_id, msgs):
+				master_msgs += self.route_by_master(proc_id, msgs)
+		if len(master_msgs) > 0:
+			self.master_channel.put({ 'task':DELIVER_MSG, 'msgs':master_msgs, 'time':time.time() })
+
+	# Puts messages into the shared memory channel of co-worker proc_id. Returns False if the channel
+	# is full, or does not exist (yet), or if messages to proc_id delivered by the master process are not
+	# acknowledged yet: until then, following messages are delivered by the master process too, so that
+	# they are received in the order they were sent.
+	def put_local_msgs(self, proc_id, msgs):
+		if proc_id in self.master_routed:
+			return False
+		channel = self.get_peer_channel(proc_id)
+		if channel == None:
+			return False
+		return channel.put(msgs)
+
+	# Returns copies of messages to co-worker proc_id, to be delivered by the master process, tagged with
+	# this worker's id, so that proc_id acknowledges them (see receive_msgs).
+	def route_by_master(self, proc_id, msgs):
+		self.master_routed[proc_id] = self.master_routed.get(proc_id, 0) + len(msgs)
+		return map(lambda msg: dict(msg, routed_from=self.proc_id), msgs)
+
+	# Returns the shared memory channel of co-worker proc_id, or None if it does not exist. Channels of
+	# co-workers that have exited are removed by the master process, and are dropped from the cache.
+	def get_peer_channel(self, proc_id):
+		if proc_id in self.peer_channels:
+			channel = self.peer_channels[proc_id]
+			if not channel.is_removed():
+				return channel
+			channel.close()
+			del self.peer_channels[proc_id]
+			return None
+		try:
+			channel = ShmChannel( channel_file(self.channel_prefix, proc_id) )
+		except (OSError,IOError):
+			return None
+		self.peer_channels[proc_id] = channel
+		return channel
+
+	def close_channels(self):
+		if self.inbox != None:
+			self.inbox.close()
+		for channel in self.peer_channels.values():
+			channel.close()
 
 	# Send a request to create a new worker, and return this worker's process id.
 	def create_new_worker(self, proc_id=None):
 		if proc_id == None:
 			proc_id = gen_proc_id()
-		self.master_channel.put({ 'task':CREATE_WORKER, 'proc_id':proc_id })
+		self.master_channel.put({ 'task':CREATE_WORKER, 'proc_id':proc_id, 'time':time.time() })
 		return proc_id
 
 	def kill(self):
-		self.master_channel.put({ 'task':KILL_SELF, 'proc_id':self.proc_id })
+		self.master_channel.put({ 'task':KILL_SELF, 'proc_id':self.proc_id, 'time':time.time() })
 
 	# Main worker routine. This method is to be overwritten
 	def routine(self):
@@ -311,6 +768,7 @@ class WorkerProcess:
 
 def run_worker_routine(work_proc):
 	work_proc.routine()
+	work_proc.close_channels()
 	work_proc.worker_channel.close()
 	work_proc.kill()
 
@@ -26,18 +26,56 @@ Foundation). The statements made herein are solely the responsibility of the aut
 '''
 
 
+import os
 import logging
 import sys
 
 # Specialization of Python logging facilities for MSR
+#
+# Log messages are built only if they are to be logged: messages can be given as a format string
+# plus arguments (formatted by the logging module, only when a record is emitted), or as a callable
+# that returns the message (e.g., a function wrapped with lazy, see lazy module).
+#
+# Messages are only checked against the level of their logger (logger.isEnabledFor), so calls below
+# it cost no more than that check. The global log level (set_log_level, or environment variable
+# MSRE_LOG_LEVEL) is the default level of loggers created by init_logger. Loggers that also log to a
+# file show messages on the console from their level on, and log them to the file from the level of
+# the file on.
 
 logging.basicConfig(format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
-def init_logger(logger_name, default_log_level=logging.DEBUG, log_file=None, log_file_level=logging.DEBUG
+def level_of(level):
+	if isinstance(level, int):
+		return level
+	return logging.getLevelName( level.upper() )
+
+log_level = level_of( os.environ.get('MSRE_LOG_LEVEL', 'WARNING') )
+
+msr_loggers = {}
+
+# Sets the global log level, and the level of all loggers created by init_logger.
+def set_log_level(level):
+	global log_level
+	log_level = level_of(level)
+	for logger in msr_loggers.values():
+		set_logger_level(logger, log_level)
+
+# Sets the level of the messages that logger shows on the console.
+def set_logger_level(logger, level):
+	console = getattr(logger, 'msr_console', None)
+	if console == None:
+		logger.setLevel(level)
+	else:
+		console.setLevel(level)
+		logger.setLevel( min(level, logger.msr_file_level) )
+
+def get_log_level():
+	return log_level
+
+def init_logger(logger_name, default_log_level=None, log_file=None, log_file_level=logging.DEBUG
                ,log_format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'):
 
 	logger = logging.getLogger(logger_name)
-	logger.setLevel(default_log_level)
 
 	if not (log_file == None):
 		ch = logging.FileHandler(log_file)
@@ -45,29 +83,46 @@ def init_logger(logger_name, default_log_level=logging.DEBUG, log_file=None, log
 		fm = logging.Formatter(log_format)
 		ch.setFormatter(fm)
 		logger.addHandler(ch)
-
+		# The logger is enabled down to the level of the file, so it shows console messages itself
+		if getattr(logger, 'msr_console', None) == None:
+			console = logging.StreamHandler()
+			console.setFormatter( logging.Formatter(log_format) )
+			logger.addHandler(console)
+			logger.propagate = False
+			logger.msr_console = console
+		logger.msr_file_level = log_file_level
+
+	set_logger_level(logger, log_level if default_log_level == None else level_of(default_log_level))
+
+	msr_loggers[logger_name] = logger
 	return logger
 
 def get_logger(logger_name):
 	return logging.getLogger(logger_name)
 
-def log_debug(logger, msg):
+def log(logger, level, msg, args):
+	if logger.isEnabledFor(level):
+		if callable(msg):
+			msg = msg()
+		logger.log(level, msg, *args)
+
+def log_debug(logger, msg, *args):
 	if __debug__:
-		logger.debug(msg) 
+		log(logger, logging.DEBUG, msg, args)
 
-def log_info(logger, msg):
+def log_info(logger, msg, *args):
 	if __debug__:
-		logger.info(msg)
+		log(logger, logging.INFO, msg, args)
 
-def log_warn(logger, msg):
+def log_warn(logger, msg, *args):
 	if __debug__:
-		logger.warn(msg)
+		log(logger, logging.WARNING, msg, args)
 
-def log_error(logger, msg):
+def log_error(logger, msg, *args):
 	if __debug__:
-		logger.error(msg)
+		log(logger, logging.ERROR, msg, args)
 
-def log_critical(logger, msg):
+def log_critical(logger, msg, *args):
 	if __debug__:
-		logger.critical(msg)
+		log(logger, logging.CRITICAL, msg, args)
 
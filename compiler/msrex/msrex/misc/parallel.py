@@ -0,0 +1,80 @@
+'''
+This file is part of MSR Ensemble (MSRE-X).
+
+MSRE-X is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+MSRE-X is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with MSRE-X. If not, see <http://www.gnu.org/licenses/>.
+
+MSR Ensemble (MSRE-X) Version 0.5, Prototype Alpha
+
+Authors:
+Edmund S. L. Lam      sllam@qatar.cmu.edu
+Iliano Cervesato      iliano@cmu.edu
+
+* This implementation was made possible by an NPRP grant (NPRP 09-667-1-100, Effective Programming 
+for Large Distributed Ensembles) from the Qatar National Research Fund (a member of the Qatar 
+Foundation). The statements made herein are solely the responsibility of the authors.
+'''
+
+import sys
+import multiprocessing
+
+# Worker processes of the compiler. Workers are forked, so they inherit the state of the compiler
+# (ASTs, solvers, ...) at the time their pool is created, and only tasks and results are pickled.
+# With a single job (the default), the compiler never forks.
+
+JOBS = 1
+
+def set_jobs(jobs):
+	global JOBS
+	JOBS = max(1, jobs)
+
+def get_jobs():
+	return JOBS
+
+def is_parallel():
+	return JOBS > 1
+
+# State shared with the workers of the last forked pool
+FORK_STATE = None
+
+# Forks a pool of (at most) size workers, sharing state with them. Tasks of the pool are pairs (fn,arg),
+# run by call_with_state as fn(state, arg). fn must be a module level function.
+def fork_pool(state, size):
+	global FORK_STATE
+	FORK_STATE = state
+	return multiprocessing.Pool( max(1, min(JOBS, size)) )
+
+def call_with_state(task):
+	(fn,arg) = task
+	return fn(FORK_STATE, arg)
+
+# Recursion limit of workers and of the compiler while it collects their results, which may be
+# deeply nested (e.g., rule compilations)
+RESULT_RECURSION_LIMIT = 20000
+
+# Runs fn(state, arg) for every arg in forked workers. Results are in the order of args.
+def fork_map(fn, state, args):
+	if len(args) == 0:
+		return []
+	limit = sys.getrecursionlimit()
+	sys.setrecursionlimit( max(limit, RESULT_RECURSION_LIMIT) )
+	pool = fork_pool(state, len(args))
+	try:
+		results = pool.map(call_with_state, map(lambda arg: (fn,arg), args), 1)
+		pool.close()
+		return results
+	finally:
+		pool.terminate()
+		pool.join()
+		sys.setrecursionlimit( limit )
+
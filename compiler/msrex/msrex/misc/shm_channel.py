@@ -0,0 +1,150 @@
+'''
+This file is part of MSR Ensemble (MSRE-X).
+
+MSRE-X is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+MSRE-X is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with MSRE-X. If not, see <http://www.gnu.org/licenses/>.
+
+MSR Ensemble (MSRE-X) Version 0.5, Prototype Alpha
+
+Authors:
+Edmund S. L. Lam      sllam@qatar.cmu.edu
+Iliano Cervesato      iliano@cmu.edu
+
+* This implementation was made possible by an NPRP grant (NPRP 09-667-1-100, Effective Programming 
+for Large Distributed Ensembles) from the Qatar National Research Fund (a member of the Qatar 
+Foundation). The statements made herein are solely the responsibility of the authors.
+'''
+
+import os
+import mmap
+import fcntl
+import struct
+import marshal
+import tempfile
+
+# Shared memory channels between processes of the same machine.
+#
+# A channel is a ring buffer in a memory mapped file, which any process can open by file name. Any number
+# of processes can put messages into a channel, while a single process takes them out. Each put writes one
+# record (int32:len followed by a batch of messages in marshal format). Access to the ring is serialized
+# with an exclusive lock (flock) on the file, so every process must open the channel itself, rather than
+# inherit it from its parent process.
+#
+# Layout: int64:head int64:tail char[capacity]:ring
+# head and tail are monotonically increasing positions of the next record to read and the next to write,
+# indexing the ring modulo its capacity.
+
+HEADER_STRUCT = struct.Struct('<qq')
+LEN_STRUCT    = struct.Struct('<i')
+
+MARSHAL_FORMAT = 2
+
+DEFAULT_CAPACITY = 2**20
+
+# Directory of channel files: in memory, if the platform provides one.
+def channel_dir():
+	if os.path.isdir('/dev/shm'):
+		return '/dev/shm'
+	return tempfile.gettempdir()
+
+# Creates the file of a new (empty) channel.
+def create_channel(file_name, capacity=DEFAULT_CAPACITY):
+	fd = os.open(file_name, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0600)
+	try:
+		os.ftruncate(fd, HEADER_STRUCT.size + capacity)
+	finally:
+		os.close(fd)
+
+def remove_channel(file_name):
+	if os.path.exists(file_name):
+		os.unlink(file_name)
+
+class ShmChannel:
+
+	def __init__(self, file_name):
+		self.file_name = file_name
+		self.fd  = os.open(file_name, os.O_RDWR)
+		self.mem = mmap.mmap(self.fd, 0)
+		self.capacity = len(self.mem) - HEADER_STRUCT.size
+
+	def lock(self):
+		fcntl.flock(self.fd, fcntl.LOCK_EX)
+
+	def unlock(self):
+		fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+	def write(self, pos, data):
+		offset = HEADER_STRUCT.size
+		start = pos % self.capacity
+		first = min(len(data), self.capacity - start)
+		self.mem[offset+start:offset+start+first] = data[:first]
+		if first < len(data):
+			self.mem[offset:offset+len(data)-first] = data[first:]
+
+	def read(self, pos, size):
+		offset = HEADER_STRUCT.size
+		start = pos % self.capacity
+		first = min(size, self.capacity - start)
+		data = self.mem[offset+start:offset+start+first]
+		if first < size:
+			data += self.mem[offset:offset+size-first]
+		return data
+
+	# Puts a batch of messages into the channel. Returns False (and puts nothing) if the channel is full.
+	def put(self, msgs):
+		data = marshal.dumps(msgs, MARSHAL_FORMAT)
+		size = LEN_STRUCT.size + len(data)
+		self.lock()
+		try:
+			(head,tail) = HEADER_STRUCT.unpack_from(self.mem, 0)
+			if self.capacity - (tail - head) < size:
+				return False
+			self.write(tail, LEN_STRUCT.pack(len(data)) + data)
+			HEADER_STRUCT.pack_into(self.mem, 0, head, tail + size)
+			return True
+		finally:
+			self.unlock()
+
+	# Takes out all messages in the channel, in the order they were put. Only one process should take
+	# messages out of a channel.
+	def take(self):
+		self.lock()
+		try:
+			(head,tail) = HEADER_STRUCT.unpack_from(self.mem, 0)
+			if head == tail:
+				return []
+			data = self.read(head, tail - head)
+			HEADER_STRUCT.pack_into(self.mem, 0, tail, tail)
+		finally:
+			self.unlock()
+		msgs = []
+		pos = 0
+		while pos < len(data):
+			size = LEN_STRUCT.unpack_from(data, pos)[0]
+			pos += LEN_STRUCT.size
+			msgs += marshal.loads(data[pos:pos+size])
+			pos += size
+		return msgs
+
+	def is_empty(self):
+		(head,tail) = HEADER_STRUCT.unpack_from(self.mem, 0)
+		return head == tail
+
+	# Returns true iff the channel file has been removed (see remove_channel), so nobody takes messages out anymore.
+	def is_removed(self):
+		return os.fstat(self.fd).st_nlink == 0
+
+	def close(self):
+		self.mem.close()
+		os.close(self.fd)
+
@@ -288,31 +288,33 @@ class SMTSolver:
 	def satisfiable(self, constraints):
 		return SAT
 
-def min_unsat_subset(smt_solver, constraints):
-	d = constraints
-	m = []
-	if smt_solver.satisfiable(d) == SAT:
-		return []
-	while smt_solver.satisfiable(m) == SAT:
-		c = m
-		curr_e = None
-		while smt_solver.satisfiable(c) == SAT:
-			# print "inner"
-			# print map(lambda x: str(x),m)
-			dmc = diff(d, c)
-			if len(dmc) > 0:
-				e = dmc[0]
-				c = c + [e]
-				curr_e = e
-			else:
-				return []
-		d = c
-		if curr_e != None:
-			if curr_e not in m:
-				m += [curr_e]
+	# Returns an unsatisfiable subset of the constraints (not necessarily minimal),
+	# or the empty list if the constraints are not unsatisfiable.
+	def unsat_core(self, constraints):
+		if self.satisfiable(constraints) == UNSAT:
+			return constraints
 		else:
 			return []
-	return m
+
+def min_unsat_subset(smt_solver, constraints):
+	core = smt_solver.unsat_core(constraints)
+	if len(core) == 0:
+		return []
+	return quick_xplain(smt_solver, [], False, core)
+
+# QuickXplain: divide-and-conquer minimization of an unsatisfiable core. Returns a minimal subset
+# of constraints that, together with background, is unsatisfiable.
+def quick_xplain(smt_solver, background, has_delta, constraints):
+	if has_delta and smt_solver.satisfiable(background) == UNSAT:
+		return []
+	if len(constraints) == 1:
+		return constraints
+	k  = len(constraints) / 2
+	c1 = constraints[:k]
+	c2 = constraints[k:]
+	d2 = quick_xplain(smt_solver, background + c1, len(c1) > 0, c2)
+	d1 = quick_xplain(smt_solver, background + d2, len(d2) > 0, c1)
+	return d1 + d2
 
 # auxiliary functions
 
@@ -32,10 +32,138 @@ Foundation). The statements made herein are solely the responsibility of the aut
 DEFAULT_OPEN = "\{\|"
 DEFAULT_CLOSE = "\|\}"
 
+OPEN_TOKEN  = "{|"
+CLOSE_TOKEN = "|}"
+
+# Compiled templates are cached, keyed by template text and kwargs names (in iteration order).
+# The cache is flushed once it grows beyond this limit.
+TEMPLATE_CACHE_LIMIT = 1024
+
 import re
-	
+
+TEMPLATE_CACHE = {}
+
 def compile_template(template, topen=DEFAULT_OPEN, tclose=DEFAULT_CLOSE, **kwargs):
+	if topen != DEFAULT_OPEN or tclose != DEFAULT_CLOSE:
+		return compile_template_legacy(template, topen=topen, tclose=tclose, **kwargs)
+	arg_names = tuple(kwargs)
+	key = (template, arg_names)
+	compiled = TEMPLATE_CACHE.get(key)
+	if compiled == None:
+		if len(TEMPLATE_CACHE) >= TEMPLATE_CACHE_LIMIT:
+			TEMPLATE_CACHE.clear()
+		compiled = CompiledTemplate(template, arg_names)
+		TEMPLATE_CACHE[key] = compiled
+	return compiled.render(kwargs)
+
+def clear_template_cache():
+	TEMPLATE_CACHE.clear()
+
+class CompiledTemplate:
+
+	def __init__(self, template, arg_names):
+		self.template = template
+		self.splices  = []
+		self.trailer  = ''
+		for (lit,splice,close_e) in tokenize_template(template):
+			if splice == None:
+				self.trailer = lit
+			else:
+				for arg in arg_names:
+					splice = splice.replace(arg,"kwargs[\'%s\']" % arg)
+				if len(splice) > 0:
+					code = compile(splice.lstrip(' \t'), '<template>', 'eval')
+				else:
+					code = None
+				self.splices.append( (lit,code,close_e) )
+
+	def render(self, kwargs):
+		template = self.template
+		env  = { 'kwargs':kwargs }
+		outs = []
+		tracker   = IndentTracker()
+		last_char = ''
+		for (lit,code,close_e) in self.splices:
+			outs.append( lit )
+			tracker.feed( lit )
+			if len(lit) > 0:
+				last_char = lit[-1]
+			if code != None:
+				splice_res = str(eval(code, globals(), env))
+			else:
+				splice_res = ''
+			num_of_indents = tracker.indent()
+			if num_of_indents > 0:
+				splice_res = splice_res.replace('\n','\n%s' % ('\t' * num_of_indents))
+			outs.append( splice_res )
+			# A splice that forms a new opening delimiter must be rescanned, as the legacy engine would.
+			if OPEN_TOKEN in (last_char + splice_res + template[close_e:close_e+1]):
+				return compile_template_legacy(''.join(outs) + template[close_e:], **kwargs)
+			tracker.feed( splice_res )
+			if len(splice_res) > 0:
+				last_char = splice_res[-1]
+		outs.append( self.trailer )
+		return ''.join(outs)
+
+def tokenize_template(template):
+	# Yields (literal, splice, splice end) for each splice, followed by (trailing literal, None, end).
+	scan_idx = 0
+	while True:
+		open_s = template.find(OPEN_TOKEN, scan_idx)
+		if open_s >= 0:
+			open_e  = open_s + len(OPEN_TOKEN)
+			close_s = template.find(CLOSE_TOKEN, open_e)
+			if close_s >= 0:
+				close_e = close_s + len(CLOSE_TOKEN)
+				yield (template[scan_idx:open_s], template[open_e:close_s], close_e)
+				scan_idx = close_e
+				continue
+		yield (template[scan_idx:], None, len(template))
+		return
+
+NO_TABS    = 0
+IN_TABS    = 1
+AFTER_TABS = 2
+
+class IndentTracker:
+
+	# Tracks the first block of tabs following the last newline of the text fed so far.
+	# This is the indentation that the legacy 'find_indent' would compute, in a single pass.
+
+	def __init__(self):
+		self.seen_newline = False
+		self.tab_state = NO_TABS
+		self.tab_count = 0
+
+	def feed(self, text):
+		nl_idx = text.rfind('\n')
+		if nl_idx >= 0:
+			self.seen_newline = True
+			self.tab_state = NO_TABS
+			self.tab_count = 0
+			text = text[nl_idx+1:]
+		if self.tab_state == AFTER_TABS or not self.seen_newline or len(text) == 0:
+			return
+		if self.tab_state == NO_TABS:
+			tab_idx = text.find('\t')
+			if tab_idx < 0:
+				return
+			text = text[tab_idx:]
+			self.tab_state = IN_TABS
+		run = len(text) - len(text.lstrip('\t'))
+		self.tab_count += run
+		if run < len(text):
+			self.tab_state = AFTER_TABS
+
+	def indent(self):
+		if self.tab_state == NO_TABS:
+			return 0
+		return self.tab_count
 
+# Legacy template engine: rescans the whole template for every splice. Retained for custom
+# delimiters and for splices that generate new delimiters.
+	
+def compile_template_legacy(template, topen=DEFAULT_OPEN, tclose=DEFAULT_CLOSE, **kwargs):
 	open_re  = re.compile(topen)
 	close_re = re.compile(tclose)
 
@@ -156,76 +284,27 @@ def find_nearest_block(raw_str, start_idx, pat_re):
 
 def template(raw_str):
 	proc_str = raw_str.strip(' \n')
-	tab_re   = re.compile('\\t')
-	m = find_nearest_block(proc_str, 0, tab_re)	
-	if m != None:
-		(ms,me,i) = m
-		if ms == 0:
-			for _ in range(0,i):
-				proc_str = dedent(proc_str)
+	num_of_tabs = len(proc_str) - len(proc_str.lstrip('\t'))
+	if num_of_tabs > 0:
+		proc_str = proc_str[num_of_tabs:]
+		proc_str = re.sub('\n\t{1,%s}' % num_of_tabs, '\n', proc_str)
 	return proc_str
 
+EXCESS_NEWLINES_RE = re.compile('\n[\n\t]*\n')
+
 def compact(raw_str):
 	proc_str = raw_str.strip(' \n\t')
-	excess_regions = []
-	e_start = 0
-	e_end = 0
-	while e_start < len(proc_str):
-		if proc_str[e_start] == '\n':
-			e_start += 1
-			e_end = e_start
-			e_count = 0
-			while e_end < len(raw_str) and proc_str[e_end] in ['\n','\t']:
-				if proc_str[e_end] == '\n':
-					e_count += 1
-				e_end += 1
-			while proc_str[e_end] != '\n':
-				e_end -= 1
-			if e_count > 0:
-				excess_regions.append( (e_start,e_end+1) )
-			e_start = e_end
-		e_start += 1
-	if len(excess_regions) > 0:
-		start = 0
-		output = ""
-		for (end,next_start) in excess_regions:
-			output += proc_str[start:end]
-			start = next_start
-		output += proc_str[start:len(proc_str)]
-		return output
-	else:
-		return proc_str		
+	return EXCESS_NEWLINES_RE.sub('\n', proc_str)
 
 def indent(template):
-	curr_idx = 0
-	tab_re = re.compile('\\n')
-	curr_template = '\t' + template
-	while curr_idx < len(curr_template):
-		m = find_nearest(curr_template, curr_idx, tab_re)
-		if m != None:
-			(ms,me) = m
-			curr_template = curr_template[:ms] + '\n\t' + curr_template[me:]
-			curr_idx = me + 1
-		else:
-			break
-	return curr_template
+	return '\t' + template.replace('\n','\n\t')
 
 def dedent(template):
-	curr_idx = 0
-	tab_re = re.compile('\\n\\t')
 	if template[0] == '\t':
 		curr_template = template[1:]
 	else:
 		curr_template = template
-	while curr_idx < len(curr_template):
-		m = find_nearest(curr_template, curr_idx, tab_re)
-		if m != None:
-			(ms,me) = m
-			curr_template = curr_template[:ms] + '\n' + curr_template[me:]
-			curr_idx = me - 1
-		else:
-			break
-	return curr_template
+	return curr_template.replace('\n\t','\n')
 
 def join_ext(sep, strs, prefix="", postfix="", alt=""):
 	if len(strs) > 0:
@@ -3,9 +3,20 @@
 
 # By Curtis Schlak, http://curtis.schlak.com/2012/01/04/python-visitor-pattern-helper.html
 
+# Dispatch resolves the nearest registered class along the MRO of the argument's class, once per
+# class, and caches the chosen target. Arguments of classes with no registered target dispatch to a
+# target that returns [].
+#
+# Visitors are called through a function with the signature of the 'on' declaration, which passes
+# its arguments positionally to the target, without repacking *args/**kw. Dispatchers whose targets
+# differ in arity or defaults from the declaration fall back to the generic Dispatcher.__call__.
+#
+# Dispatches can be profiled: start_profile() counts them per pass, visitor and argument class,
+# until stop_profile(). Passes are labelled with enter_pass.
+
 import inspect
 
-__all__ = ['on', 'when']
+__all__ = ['on', 'when', 'start_profile', 'stop_profile', 'enter_pass']
 
 def on(param_name):
   def f(fn):
@@ -21,34 +32,119 @@ def when(param_type):
     if not isinstance(dispatcher, Dispatcher):
       dispatcher = dispatcher.dispatcher
     dispatcher.add_target(param_type, fn)
-    def ff(*args, **kw):
-      return dispatcher(*args, **kw)
+    ff = dispatcher.make_visitor()
     ff.dispatcher = dispatcher
     return ff
   return f
 
 
+def no_target(*args, **kw):
+  return []
+
+
+DISPATCHERS = []
+
 class Dispatcher(object):
   def __init__(self, param_name, fn):
     frame = inspect.currentframe().f_back.f_back
     top_level = frame.f_locals == frame.f_globals
-    self.param_index = inspect.getargspec(fn).args.index(param_name)
+    self.spec = inspect.getargspec(fn)
+    self.param_index = self.spec.args.index(param_name)
     self.param_name = param_name
+    self.name = fn.func_name
     self.targets = {}
+    self.resolved = {}
+    self.exact = self.spec.varargs == None and self.spec.keywords == None
+    DISPATCHERS.append( self )
 
   def __call__(self, *args, **kw):
-    # for arg in args:
-    # print arg.__class__
-    # print self.param_index
     typ = args[self.param_index].__class__
-    d = self.targets.get(typ)
-    if d is not None:
-      return d(*args, **kw)
-    else:
-      issub = issubclass
-      t = self.targets
-      ks = t.iterkeys()
-      return [t[k](*args, **kw) for k in ks if issub(typ, k)]
+    d = self.resolved.get(typ)
+    if d is None:
+      d = self.resolve(typ)
+    return d(*args, **kw)
+
+  def resolve(self, typ):
+    d = no_target
+    for k in inspect.getmro(typ):
+      if k in self.targets:
+        d = self.targets[k]
+        break
+    if PROFILE != None:
+      d = PROFILE.counted(self, typ, d)
+    self.resolved[typ] = d
+    return d
 
   def add_target(self, typ, target):
+    spec = inspect.getargspec(target)
+    if (len(spec.args),spec.varargs,spec.keywords,spec.defaults) != (len(self.spec.args),self.spec.varargs,self.spec.keywords,self.spec.defaults):
+      self.exact = False
     self.targets[typ] = target
+    self.resolved.clear()
+
+  def make_visitor(self):
+    if not self.exact:
+      def ff(*args, **kw):
+        return self(*args, **kw)
+      return ff
+    args = self.spec.args
+    defaults = self.spec.defaults or ()
+    num_required = len(args) - len(defaults)
+    params = []
+    for i in range(len(args)):
+      if i < num_required:
+        params.append( args[i] )
+      else:
+        params.append( "%s=_defaults[%s]" % (args[i],i - num_required) )
+    param = args[self.param_index]
+    src  = "def %s(%s):\n" % (self.name, ', '.join(params))
+    src += "  return (_get(%s.__class__) or _resolve(%s.__class__))(%s)\n" % (param,param,', '.join(args))
+    env = { '_defaults':defaults, '_get':self.resolved.get, '_resolve':self.resolve }
+    exec src in env
+    return env[self.name]
+
+
+# Profiling
+
+PROFILE = None
+
+class DispatchProfile(object):
+  def __init__(self):
+    self.counts = {}
+    self.pass_name = None
+
+  def counted(self, dispatcher, typ, target):
+    key = (dispatcher.name, typ.__name__)
+    def f(*args, **kw):
+      k = (self.pass_name,) + key
+      self.counts[k] = self.counts.get(k, 0) + 1
+      return target(*args, **kw)
+    return f
+
+  def __repr__(self):
+    strs = "========== Dispatch Profile ==========\n"
+    for (pass_name,name,typ_name),count in sorted(self.counts.items(), key=lambda (k,c): (-c,k)):
+      strs += "%8s  %s: %s(%s)\n" % (count,pass_name,name,typ_name)
+    strs += "======================================"
+    return strs
+
+def reset_dispatchers():
+  for dispatcher in DISPATCHERS:
+    dispatcher.resolved.clear()
+
+def start_profile():
+  global PROFILE
+  PROFILE = DispatchProfile()
+  reset_dispatchers()
+  return PROFILE
+
+def stop_profile():
+  global PROFILE
+  profile = PROFILE
+  PROFILE = None
+  reset_dispatchers()
+  return profile
+
+def enter_pass(pass_name):
+  if PROFILE != None:
+    PROFILE.pass_name = pass_name
@@ -36,7 +36,17 @@ import msrex.misc.smt_utils as smt
 
 import msrex.frontend.lex_parse.ast as ast
 
+# Data sorts of types, keyed by the s-expression of the type. Building list, tuple and
+# multiset sorts creates new z3 datatypes, so we only want to do this once per type.
+DATA_SORT_CACHE = {}
+
 def type_to_data_sort(ty):
+	key = ty.sexpr()
+	if key not in DATA_SORT_CACHE:
+		DATA_SORT_CACHE[key] = mk_data_sort(ty)
+	return DATA_SORT_CACHE[key]
+
+def mk_data_sort(ty):
 	dt_name = datatype_name(ty) 
 	if dt_name == types.TY_LOC:
 		return data.Loc
@@ -183,10 +193,28 @@ class TermTranslator:
 	def trans(self, term):
 		pass
 
+# Z3 solver interface. In incremental mode (the default), a single z3 solver is kept for the
+# lifetime of this object: axioms are asserted once at the base level, and each call only
+# asserts the constraints that are not a prefix already asserted by previous calls, within
+# its own push/pop scope. Internalized constraints are memoized by constraint id.
 class Z3Solver(smt.SMTSolver):
 
-	def __init__(self, axioms=[]):
-		self.initialize(axioms=axioms)
+	def __init__(self, axioms=[], incremental=True):
+		self.initialize(axioms=list(axioms))
+		self.incremental = incremental
+		self.trans_pref  = { 'use_set_eq':False }
+		self.z3_cons = {}
+		self.reset()
+
+	def reset(self):
+		self.z3_solver = None
+		self.scopes    = []
+		self.tracked   = {}
+		self.last_check = None
+
+	def add(self, axiom):
+		self.axioms.append( axiom )
+		self.reset()
 
 	def internalize(self, constraint):
 		ctok = constraint.token
@@ -236,16 +264,71 @@ class Z3Solver(smt.SMTSolver):
 		elif ctok == smt.FORALL_CONS:
 			ic = self.internalize(constraint.c)
 			return z3sc.Forall(constraint.vars, ic)
-		
+
+	# Returns the z3 constraints of a constraint, i.e., its internalized and transformed form.
+	def to_z3(self, constraint):
+		if constraint.id not in self.z3_cons:
+			(tform, tcons, sig) = z3sc.transForm(self.internalize(constraint), self.trans_pref)
+			self.z3_cons[constraint.id] = [tform] + tcons
+		return self.z3_cons[constraint.id]
+
+	def assert_all(self, s, constraints):
+		for cons in constraints:
+			s.add(*self.to_z3(cons))
+
+	# Brings the solver to a state where exactly the axioms and the given constraints are asserted.
+	# Scopes whose constraints still form a prefix of the given constraints are kept, the rest are popped.
+	# If the first popped scope shares a prefix with the remaining constraints, that prefix is re-asserted
+	# in a scope of its own, so that later calls with the same prefix can keep it. The remaining
+	# constraints are then asserted in a new scope.
+	def assert_constraints(self, constraints):
+		if self.z3_solver == None:
+			self.z3_solver = z3.Solver()
+			self.assert_all(self.z3_solver, self.axioms)
+		cons_ids = map(lambda c: c.id, constraints)
+		pos = 0
+		keep = 0
+		for scope in self.scopes:
+			if cons_ids[pos:pos+len(scope)] != scope:
+				break
+			pos  += len(scope)
+			keep += 1
+		if keep < len(self.scopes):
+			scope  = self.scopes[keep]
+			common = 0
+			while common < len(scope) and pos + common < len(cons_ids) and scope[common] == cons_ids[pos + common]:
+				common += 1
+			self.z3_solver.pop( len(self.scopes) - keep )
+			self.scopes = self.scopes[:keep]
+			self.last_check = None
+			if common > 0 and pos + common < len(cons_ids):
+				self.push_scope( constraints[pos:pos+common] )
+				pos += common
+		if pos < len(constraints):
+			self.push_scope( constraints[pos:] )
+		return self.z3_solver
+
+	def push_scope(self, constraints):
+		self.last_check = None
+		self.z3_solver.push()
+		self.assert_all(self.z3_solver, constraints)
+		self.scopes.append( map(lambda c: c.id, constraints) )
+
+	# In incremental mode, the result of the last check is reused as long as the solver state is unchanged,
+	# so that checking constraints, then solving them (e.g., after unsat_core) costs a single solver call.
+	def check(self, constraints):
+		if self.incremental:
+			s = self.assert_constraints(constraints)
+			if self.last_check == None:
+				self.last_check = s.check()
+			return (s, self.last_check)
+		else:
+			s = z3.Solver()
+			self.assert_all(s, self.axioms + constraints)
+		return (s, s.check())
+
 	def satisfiable(self, constraints):
-		s = z3.Solver()
-		trans_pref = { 'use_set_eq':False }
-		# print self.axioms + constraints
-		for cons in map(lambda c: self.internalize(c), self.axioms + constraints):
-			(tform, tcons, sig) = z3sc.transForm(cons, trans_pref)
-			z3constr = [tform] + tcons
-			s.add(*z3constr)
-		res = s.check()
+		(s,res) = self.check(constraints)
 		if res == z3.sat:
 			return smt.SAT
 		elif res == z3.unsat:
@@ -253,14 +336,39 @@ class Z3Solver(smt.SMTSolver):
 		else:
 			return smt.UNKNOWN
 
+	# Assumption literal that tracks a constraint in unsat cores.
+	def tracking_literal(self, constraint):
+		return z3.Bool("track_%s" % constraint.id)
+
+	def unsat_core(self, constraints):
+		if self.incremental:
+			# Constraints are checked within the scopes already pushed, and the core is only computed if
+			# they are unsatisfiable. Tracked constraints are asserted at the base level, as implications
+			# from their assumption literals, so they only take effect in checks that assume them.
+			(_,res) = self.check(constraints)
+			if res != z3.unsat:
+				return []
+			s = self.assert_constraints([])
+			self.last_check = None
+			tracked = self.tracked
+		else:
+			s = z3.Solver()
+			self.assert_all(s, self.axioms)
+			tracked = {}
+		lits = []
+		for cons in constraints:
+			if cons.id not in tracked:
+				lit = self.tracking_literal(cons)
+				s.add( z3.Implies(lit, z3.And(*self.to_z3(cons))) )
+				tracked[cons.id] = lit
+			lits.append( tracked[cons.id] )
+		if s.check(*lits) != z3.unsat:
+			return []
+		core_ids = set( map(lambda lit: str(lit), s.unsat_core()) )
+		return filter(lambda cons: str(tracked[cons.id]) in core_ids, constraints)
+
 	def solve(self, constraints):
-		s = z3.Solver()
-		trans_pref = { 'use_set_eq':False }
-		for cons in map(lambda c: self.internalize(c), self.axioms + constraints):
-			(tform, tcons, sig) = z3sc.transForm(cons, trans_pref)
-			z3constr = [tform] + tcons
-			s.add(*z3constr)
-		res = s.check()
+		(s,res) = self.check(constraints)
 		if res == z3.sat:
 			m = s.model()
 			# print m
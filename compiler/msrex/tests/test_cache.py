@@ -0,0 +1,145 @@
+'''
+This file is part of MSR Ensemble (MSRE-X).
+
+MSRE-X is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+MSRE-X is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with MSRE-X. If not, see <http://www.gnu.org/licenses/>.
+
+MSR Ensemble (MSRE-X) Version 0.5, Prototype Alpha
+
+Authors:
+Edmund S. L. Lam      sllam@qatar.cmu.edu
+Iliano Cervesato      iliano@cmu.edu
+
+* This implementation was made possible by an NPRP grant (NPRP 09-667-1-100, Effective Programming 
+for Large Distributed Ensembles) from the Qatar National Research Fund (a member of the Qatar 
+Foundation). The statements made herein are solely the responsibility of the authors.
+'''
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from msrex.frontend.process import process_msre
+from msrex.frontend.cache import CompilationCache, generate_cpp
+
+ROOT_DIR    = os.path.abspath( os.path.join(os.path.dirname(__file__), '..', '..', '..') )
+SAMPLE_FILE = os.path.join(ROOT_DIR, 'samples', 'ensem_shortpath.msr')
+RUNTIME_DIR = os.path.join(ROOT_DIR, 'runtime')
+
+class CompilationCacheTest(unittest.TestCase):
+
+	def setUp(self):
+		self.tmp_dir = tempfile.mkdtemp()
+		self.cwd = os.getcwd()
+		os.chdir(self.tmp_dir)
+		self.source_text = open(SAMPLE_FILE).read()
+
+	def tearDown(self):
+		os.chdir(self.cwd)
+		shutil.rmtree(self.tmp_dir)
+
+	def new_cache(self):
+		return CompilationCache( os.path.join(self.tmp_dir, 'cache') )
+
+	def compile(self, cache, source_text=None, profile_file=None):
+		if source_text == None:
+			source_text = self.source_text
+		return process_msre('ensem_shortpath.msr', source_text=source_text, profile_file=profile_file, cache=cache)
+
+	def read_files(self, file_names):
+		return map(lambda file_name: (file_name,open(file_name, 'rb').read()), file_names)
+
+	def test_entries(self):
+		cache = self.new_cache()
+		key = cache.key('prog', [1,2])
+		self.assertNotEqual(key, cache.key('prog', [1,3]))
+		self.assertEqual(cache.load('prog', key), None)
+		self.assertTrue(cache.store('prog', key, {'a':[1,2]}))
+		self.assertEqual(cache.load('prog', key), {'a':[1,2]})
+		self.assertEqual((cache.hits,cache.misses), (1,1))
+		# Corrupted entries are misses
+		open(cache.entry_path('prog', key), 'wb').write("not a pickle")
+		self.assertEqual(cache.load('prog', key), None)
+		self.assertEqual((cache.hits,cache.misses), (1,2))
+		# Objects that cannot be pickled are not stored
+		self.assertFalse(cache.store('prog', key, lambda x: x))
+
+	def test_program_hit(self):
+		output = self.compile( self.new_cache() )
+		self.assertTrue(output['valid'])
+		cache = self.new_cache()
+		cached_output = self.compile( cache )
+		self.assertEqual((cache.hits,cache.misses), (1,0))
+		self.assertEqual(map(str, cached_output['prog'].rules), map(str, output['prog'].rules))
+		# Pickled ASTs keep their source spans
+		self.assertEqual(cached_output['prog'].get_source(), output['prog'].get_source())
+
+	def test_program_invalidation(self):
+		cache = self.new_cache()
+		self.compile( cache )
+		misses = cache.misses
+		self.compile( cache, source_text=self.source_text.replace("[L0]edge(L1,7)", "[L0]edge(L1,8)") )
+		self.assertTrue(cache.misses > misses)
+		misses = cache.misses
+		profile_file = os.path.join(self.tmp_dir, 'profile')
+		open(profile_file, 'w').write("path 100000\n")
+		self.compile( cache, profile_file=profile_file )
+		self.assertTrue(cache.misses > misses)
+
+	def test_cpp_hit(self):
+		cache = self.new_cache()
+		output = self.compile( cache )
+		file_names = generate_cpp(output, cache=cache)
+		gen_files = self.read_files(file_names)
+		map(os.remove, file_names)
+		hits = cache.hits
+		self.assertEqual(generate_cpp(output, cache=cache), file_names)
+		self.assertEqual(cache.hits, hits + 1)
+		self.assertEqual(self.read_files(file_names), gen_files)
+		# A program restored from the cache generates the same codes
+		cached_output = self.compile( self.new_cache() )
+		self.assertEqual(self.read_files(generate_cpp(cached_output)), gen_files)
+
+	def test_cpp_invalidation(self):
+		cache = self.new_cache()
+		output = self.compile( cache )
+		generate_cpp(output, cache=cache)
+		misses = cache.misses
+		generate_cpp(output, cache=cache, binary_facts=True)
+		self.assertEqual(cache.misses, misses + 1)
+
+	def test_split_cpp_invalidation(self):
+		include_dir = os.path.join(self.tmp_dir, 'runtime')
+		shutil.copytree(RUNTIME_DIR, include_dir)
+		include_env = os.environ.get('MSRE_INCLUDE')
+		os.environ['MSRE_INCLUDE'] = include_dir
+		try:
+			cache = self.new_cache()
+			output = self.compile( cache )
+			generate_cpp(output, cache=cache, split=True)
+			hits = cache.hits
+			generate_cpp(output, cache=cache, split=True)
+			self.assertEqual(cache.hits, hits + 1)
+			open(os.path.join(include_dir, 'msre', 'store.h'), 'a').write("\n")
+			misses = cache.misses
+			generate_cpp(output, cache=cache, split=True)
+			self.assertEqual(cache.misses, misses + 1)
+		finally:
+			if include_env == None:
+				del os.environ['MSRE_INCLUDE']
+			else:
+				os.environ['MSRE_INCLUDE'] = include_env
+
+if __name__ == '__main__':
+	unittest.main()
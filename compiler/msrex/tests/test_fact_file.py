@@ -0,0 +1,142 @@
+'''
+This file is part of MSR Ensemble (MSRE-X).
+
+MSRE-X is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+MSRE-X is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with MSRE-X. If not, see <http://www.gnu.org/licenses/>.
+
+MSR Ensemble (MSRE-X) Version 0.5, Prototype Alpha
+
+Authors:
+Edmund S. L. Lam      sllam@qatar.cmu.edu
+Iliano Cervesato      iliano@cmu.edu
+
+* This implementation was made possible by an NPRP grant (NPRP 09-667-1-100, Effective Programming 
+for Large Distributed Ensembles) from the Qatar National Research Fund (a member of the Qatar 
+Foundation). The statements made herein are solely the responsibility of the authors.
+'''
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from distutils.spawn import find_executable
+
+from msrex.frontend.lex_parse.parser import run_parser_input
+from msrex.frontend.code.fact_file import FactFileWriter
+
+RUNTIME_DIR = os.path.abspath( os.path.join(os.path.dirname(__file__), '..', '..', '..', 'runtime') )
+
+CXX = os.environ.get('CXX', 'g++')
+
+FACTS_SOURCE = '''
+ensem data {
+	predicate vals :: (loc,int,float,char,bool,string) -> fact.
+}
+execute data {
+	exists L0, L1, X.
+	[L1]vals(L0, 7, 2.5, 'c', true, "hello").
+	[L0]vals(L1, 3, 0.0, 'z', false, "").
+	[L1]vals(L1, 42, 1.5, 'a', false, "world").
+	[X]vals(L0, 1, 1.0, 'a', true, "x").
+	[L0]vals(L1, 2+3, 1.0, 'a', true, "x").
+}
+'''
+
+# Dumps a fact file of 'vals' facts with the runtime's FactFile
+FACT_DUMP_CODES = '''
+#include <iostream>
+#include "msre/fact_file.h"
+
+struct NodeDump {
+	int reg_node_alias(int node_id, string alias) {
+		cout << "node " << node_id << " " << alias << endl;
+		return node_id;
+	}
+	void add_node(int node_id) { }
+};
+
+int main(int argc, char** argv) {
+	FactFile fact_file(argv[1]);
+	NodeDump node_dump;
+	fact_file.reg_nodes(node_dump);
+	for (int x=0; x < fact_file.num_locs(); x++) {
+		cout << "loc " << fact_file.loc(x) << " " << fact_file.num_facts(x) << endl;
+		FactReader reader = fact_file.reader(x);
+		while (reader.has_next()) {
+			int pred_id = reader.read_int();
+			int loc = reader.read_int();
+			int i = reader.read_int();
+			float f = reader.read_float();
+			char c = reader.read_char();
+			bool b = reader.read_bool();
+			string s = reader.read_string();
+			cout << pred_id << " " << loc << " " << i << " " << f << " " << c << " " << b << " [" << s << "]" << endl;
+		}
+	}
+	return 0;
+}
+'''
+
+VALS_PRED_IDX = 5
+
+class FactFileTest(unittest.TestCase):
+
+	def setUp(self):
+		self.tmp_dir = tempfile.mkdtemp()
+		decs = run_parser_input(FACTS_SOURCE)
+		self.fact_dec = decs[0].decs[0]
+		self.exec_decs = decs[1].decs
+
+	def tearDown(self):
+		shutil.rmtree(self.tmp_dir)
+
+	def write_facts(self):
+		writer = FactFileWriter()
+		loc_ids = {}
+		for exist_var in self.exec_decs[0].exist_vars:
+			if exist_var.name != 'X':
+				loc_ids[exist_var.name] = len(loc_ids)
+				writer.add_node(loc_ids[exist_var.name], exist_var.name)
+		added = []
+		for loc_fact_dec in self.exec_decs[1:]:
+			for loc_fact in loc_fact_dec.loc_facts:
+				added.append( writer.add_fact(VALS_PRED_IDX, loc_fact, self.fact_dec.arg_types(), loc_ids) )
+		file_name = os.path.join(self.tmp_dir, 'data.facts')
+		writer.write( file_name )
+		return (writer,added,file_name)
+
+	def test_only_ground_facts_are_added(self):
+		(writer,added,_) = self.write_facts()
+		self.assertEqual(added, [True,True,True,False,False])
+		self.assertEqual(writer.num_facts(), 3)
+
+	@unittest.skipIf(find_executable(CXX) == None, "no C++ compiler")
+	def test_round_trip(self):
+		(_,_,file_name) = self.write_facts()
+		dump_src = os.path.join(self.tmp_dir, 'fact_dump.cpp')
+		dump_exec = os.path.join(self.tmp_dir, 'fact_dump')
+		open(dump_src, 'w').write( FACT_DUMP_CODES )
+		subprocess.check_call([CXX, '-I', RUNTIME_DIR, dump_src, '-o', dump_exec])
+		dump = subprocess.check_output([dump_exec, file_name])
+		self.assertEqual(dump.splitlines(), [ "node 0 L0"
+                                                    , "node 1 L1"
+                                                    , "loc 0 1"
+                                                    , "5 1 3 0 z 0 []"
+                                                    , "loc 1 2"
+                                                    , "5 0 7 2.5 c 1 [hello]"
+                                                    , "5 1 42 1.5 a 0 [world]" ])
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,91 @@
+'''
+This file is part of MSR Ensemble (MSRE-X).
+
+MSRE-X is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+MSRE-X is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with MSRE-X. If not, see <http://www.gnu.org/licenses/>.
+
+MSR Ensemble (MSRE-X) Version 0.5, Prototype Alpha
+
+Authors:
+Edmund S. L. Lam      sllam@qatar.cmu.edu
+Iliano Cervesato      iliano@cmu.edu
+
+* This implementation was made possible by an NPRP grant (NPRP 09-667-1-100, Effective Programming 
+for Large Distributed Ensembles) from the Qatar National Research Fund (a member of the Qatar 
+Foundation). The statements made herein are solely the responsibility of the authors.
+'''
+
+import pickle
+import unittest
+
+import msrex.frontend.lex_parse.ast as ast
+from msrex.frontend.lex_parse.parser import run_parser_input
+from msrex.frontend.analyze.inspectors import Inspector
+from msrex.frontend.transform.base_transformer import Transformer
+
+RULES_SOURCE = '''
+ensem vars {
+	predicate p :: (loc,int,int) -> fact.
+	predicate q :: (loc,int) -> fact.
+	rule r :: [X]p(Y,X,Y) \\ { [X]q(Z) | Z <- Ws. Z > Y } --o [X]q(Y).
+}
+'''
+
+class NoTransform(Transformer):
+	def __init__(self, decs):
+		self.initialize(decs)
+
+def var_names(fvs):
+	return map(lambda fv: fv.name, fvs)
+
+class FreeVarsTest(unittest.TestCase):
+
+	def setUp(self):
+		self.decs = run_parser_input(RULES_SOURCE)
+		rule_dec = self.decs[0].decs[2]
+		self.atom = rule_dec.plhs[0]
+		self.compre = rule_dec.slhs[0]
+		self.inspect = Inspector()
+
+	def test_order_and_duplicates(self):
+		self.assertEqual(var_names(self.inspect.free_vars(self.atom)), ['X','Y','X','Y'])
+		self.assertEqual(var_names(self.inspect.free_vars(self.atom, loc=False)), ['Y','X','Y'])
+		self.assertEqual(var_names(self.inspect.free_vars(self.atom, args=False)), ['X'])
+		self.assertEqual(var_names(self.inspect.free_vars([self.atom,self.atom], args=False)), ['X','X'])
+
+	def test_compre_binders(self):
+		self.assertEqual(sorted(var_names(self.inspect.free_vars(self.compre))), ['Ws','X','Y'])
+		self.assertEqual(sorted(var_names(self.inspect.free_vars(self.compre, compre_binders=True))), ['Ws','X','Y','Z','Z','Z'])
+
+	def test_cached_on_nodes(self):
+		fvs = self.inspect.free_vars(self.atom)
+		self.assertNotEqual(getattr(self.atom, 'free_vars_cache', None), None)
+		self.assertEqual(self.inspect.free_vars(self.atom), fvs)
+		self.assertFalse(self.inspect.free_vars(self.atom) is self.inspect.free_vars(self.atom))
+
+	def test_transformer_invalidates_cache(self):
+		self.assertEqual(var_names(self.inspect.free_vars(self.atom)), ['X','Y','X','Y'])
+		# Rewrite the AST in place, as transformers do
+		self.atom.fact.terms[0] = ast.TermVar('V')
+		NoTransform(self.decs)
+		self.assertEqual(var_names(self.inspect.free_vars(self.atom)), ['X','V','X','Y'])
+		self.assertEqual(var_names(self.inspect.free_vars(self.atom.fact)), ['V','X','Y'])
+
+	def test_cache_not_pickled(self):
+		fvs = self.inspect.free_vars(self.atom)
+		atom = pickle.loads( pickle.dumps(self.atom, pickle.HIGHEST_PROTOCOL) )
+		self.assertEqual(getattr(atom, 'free_vars_cache', None), None)
+		self.assertEqual(var_names(self.inspect.free_vars(atom)), var_names(fvs))
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,90 @@
+'''
+This file is part of MSR Ensemble (MSRE-X).
+
+MSRE-X is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+MSRE-X is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with MSRE-X. If not, see <http://www.gnu.org/licenses/>.
+
+MSR Ensemble (MSRE-X) Version 0.5, Prototype Alpha
+
+Authors:
+Edmund S. L. Lam      sllam@qatar.cmu.edu
+Iliano Cervesato      iliano@cmu.edu
+
+* This implementation was made possible by an NPRP grant (NPRP 09-667-1-100, Effective Programming 
+for Large Distributed Ensembles) from the Qatar National Research Fund (a member of the Qatar 
+Foundation). The statements made herein are solely the responsibility of the authors.
+'''
+
+import os
+import tempfile
+import unittest
+
+from msrex.frontend.process import process_msre
+from msrex.frontend.compile.join_ordering import LookupAtom
+
+# Partners big and small are looked up by the same location and argument, so that only their
+# store sizes tell the cheaper join order apart.
+JOINS_SOURCE = '''
+%s
+ensem joins {
+	predicate req :: (loc,int) -> fact.
+	predicate big :: (loc,int) -> fact.
+	predicate small :: (loc,int) -> fact.
+	rule r :: [X]req(Y,D) \\ [X]big(Y,A), [X]small(Y,B) --o [X]req(Y,A+B).
+}
+execute joins {
+	exists L0.
+	[L0]req(L0,1).
+}
+'''
+
+# Returns the predicates looked up by the join ordering of the rule for an active fact of pred_name, in order
+def partner_order(pred_name, pragmas="", profile_file=None):
+	output = process_msre('joins.msr', source_text=JOINS_SOURCE % pragmas, profile_file=profile_file)
+	fact_dir = output['fact_dir']
+	for rule_comp in output['prog'].rule_compilations:
+		for join_ordering in rule_comp.join_orderings:
+			if fact_dir.getFactFromIdx( join_ordering.fact_idx ).name == pred_name:
+				lookup_tasks = filter(lambda task: isinstance(task, LookupAtom), join_ordering.getMatchTasks())
+				return map(lambda task: fact_dir.getFactFromIdx( task.lookup.pred_idx ).name, lookup_tasks)
+
+class JoinPlannerTest(unittest.TestCase):
+
+	def test_equal_sizes_keep_head_order(self):
+		self.assertEqual(partner_order('req'), ['big','small'])
+
+	def test_smaller_store_is_joined_first(self):
+		self.assertEqual(partner_order('req', "pragma cardinality big 10.\npragma cardinality small 100000."), ['big','small'])
+		self.assertEqual(partner_order('req', "pragma cardinality big 100000.\npragma cardinality small 10."), ['small','big'])
+
+	def test_profile_sizes(self):
+		(fd,profile_file) = tempfile.mkstemp()
+		try:
+			os.write(fd, "Size of big Store: 100000\nSize of small Store: 3\nsmall 10\n")
+			os.close(fd)
+			self.assertEqual(partner_order('req', profile_file=profile_file), ['small','big'])
+			self.assertEqual(partner_order('small', profile_file=profile_file), ['req','big'])
+		finally:
+			os.remove(profile_file)
+
+	def test_hints_override_profile(self):
+		(fd,profile_file) = tempfile.mkstemp()
+		try:
+			os.write(fd, "big 100000\nsmall 10\n")
+			os.close(fd)
+			self.assertEqual(partner_order('req', "pragma cardinality big 1.", profile_file=profile_file), ['big','small'])
+		finally:
+			os.remove(profile_file)
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,87 @@
+'''
+This file is part of MSR Ensemble (MSRE-X).
+
+MSRE-X is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+MSRE-X is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with MSRE-X. If not, see <http://www.gnu.org/licenses/>.
+
+MSR Ensemble (MSRE-X) Version 0.5, Prototype Alpha
+
+Authors:
+Edmund S. L. Lam      sllam@qatar.cmu.edu
+Iliano Cervesato      iliano@cmu.edu
+
+* This implementation was made possible by an NPRP grant (NPRP 09-667-1-100, Effective Programming 
+for Large Distributed Ensembles) from the Qatar National Research Fund (a member of the Qatar 
+Foundation). The statements made herein are solely the responsibility of the authors.
+'''
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+
+import msrex.misc.parallel as parallel
+from msrex.frontend.process import process_msre
+from msrex.frontend.cache import generate_cpp
+
+ROOT_DIR    = os.path.abspath( os.path.join(os.path.dirname(__file__), '..', '..', '..') )
+SAMPLE_FILE = os.path.join(ROOT_DIR, 'samples', 'ensem_shortpath.msr')
+RUNTIME_DIR = os.path.join(ROOT_DIR, 'runtime')
+
+# Seconds to wait for the compilation of the sample
+GENERATE_TIMEOUT = 300
+
+# Generates the split C++ units of the sample with the given number of jobs, and puts their contents
+# by file name in results.
+def generate_sample(jobs, results):
+	out_dir = tempfile.mkdtemp()
+	try:
+		os.chdir(out_dir)
+		parallel.set_jobs(jobs)
+		output = process_msre(os.path.basename(SAMPLE_FILE), source_text=open(SAMPLE_FILE).read())
+		gen_files = generate_cpp(output, split=True)
+		results.put( dict(map(lambda f: (f, open(f, 'rb').read()), gen_files)) )
+	finally:
+		shutil.rmtree(out_dir)
+
+# Fact indices are numbered per compiler process, so each compilation is forked from the same state
+def generate_sample_forked(jobs):
+	results = multiprocessing.Queue()
+	proc = multiprocessing.Process(target=generate_sample, args=(jobs,results))
+	proc.start()
+	gen_files = results.get(True, GENERATE_TIMEOUT)
+	proc.join()
+	return gen_files
+
+class ParallelCodeGenTest(unittest.TestCase):
+
+	def setUp(self):
+		self.include_env = os.environ.get('MSRE_INCLUDE')
+		os.environ['MSRE_INCLUDE'] = RUNTIME_DIR
+
+	def tearDown(self):
+		if self.include_env == None:
+			del os.environ['MSRE_INCLUDE']
+		else:
+			os.environ['MSRE_INCLUDE'] = self.include_env
+
+	def test_jobs_do_not_change_output(self):
+		serial_files = generate_sample_forked(1)
+		parallel_files = generate_sample_forked(4)
+		self.assertEqual(sorted(serial_files.keys()), sorted(parallel_files.keys()))
+		for file_name in serial_files:
+			self.assertEqual(serial_files[file_name], parallel_files[file_name], file_name)
+
+if __name__ == '__main__':
+	unittest.main()
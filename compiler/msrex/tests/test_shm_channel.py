@@ -0,0 +1,114 @@
+'''
+This file is part of MSR Ensemble (MSRE-X).
+
+MSRE-X is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+MSRE-X is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with MSRE-X. If not, see <http://www.gnu.org/licenses/>.
+
+MSR Ensemble (MSRE-X) Version 0.5, Prototype Alpha
+
+Authors:
+Edmund S. L. Lam      sllam@qatar.cmu.edu
+Iliano Cervesato      iliano@cmu.edu
+
+* This implementation was made possible by an NPRP grant (NPRP 09-667-1-100, Effective Programming 
+for Large Distributed Ensembles) from the Qatar National Research Fund (a member of the Qatar 
+Foundation). The statements made herein are solely the responsibility of the authors.
+'''
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+
+from msrex.misc.shm_channel import ShmChannel, create_channel, remove_channel
+
+# Puts msg_count single message batches (producer,seq) into the channel, retrying while it is full
+def produce(file_name, producer, msg_count):
+	channel = ShmChannel(file_name)
+	for seq in range(0,msg_count):
+		while not channel.put([{'producer':producer, 'seq':seq}]):
+			pass
+	channel.close()
+
+class ShmChannelTest(unittest.TestCase):
+
+	def setUp(self):
+		self.tmp_dir = tempfile.mkdtemp()
+		self.file_name = os.path.join(self.tmp_dir, 'channel')
+
+	def tearDown(self):
+		shutil.rmtree(self.tmp_dir)
+
+	def open_channel(self, capacity):
+		create_channel(self.file_name, capacity)
+		channel = ShmChannel(self.file_name)
+		self.addCleanup(channel.close)
+		return channel
+
+	def test_take_in_put_order(self):
+		channel = self.open_channel(128)
+		self.assertTrue(channel.is_empty())
+		self.assertEqual(channel.take(), [])
+		taken = []
+		# Batches of varying sizes, so that records wrap around the ring at different positions
+		for seq in range(0,200):
+			self.assertTrue(channel.put(range(seq, seq + seq % 4)))
+			if seq % 3 == 2:
+				taken += channel.take()
+		taken += channel.take()
+		self.assertTrue(channel.is_empty())
+		self.assertEqual(taken, reduce(lambda xs,seq: xs + range(seq, seq + seq % 4), range(0,200), []))
+
+	def test_full_put_puts_nothing(self):
+		channel = self.open_channel(64)
+		self.assertTrue(channel.put(['a']))
+		# Fits in the empty ring, but not next to 'a'
+		self.assertFalse(channel.put(['x' * 40]))
+		while channel.put(['b']):
+			pass
+		self.assertFalse(channel.put(['c']))
+		msgs = channel.take()
+		self.assertEqual(msgs[0], 'a')
+		self.assertEqual(set(msgs[1:]), set(['b']))
+		self.assertTrue(channel.put(['c']))
+		self.assertEqual(channel.take(), ['c'])
+
+	def test_oversize_put(self):
+		channel = self.open_channel(64)
+		self.assertFalse(channel.put(['x' * 100]))
+		self.assertTrue(channel.is_empty())
+		self.assertTrue(channel.put(['y']))
+		self.assertEqual(channel.take(), ['y'])
+
+	def test_concurrent_producers_keep_their_order(self):
+		channel = self.open_channel(256)
+		msg_count = 500
+		producers = map(lambda producer: multiprocessing.Process(target=produce, args=(self.file_name,producer,msg_count)), range(0,3))
+		map(lambda proc: proc.start(), producers)
+		seqs = { 0:[], 1:[], 2:[] }
+		while sum( map(len, seqs.values()) ) < 3 * msg_count:
+			for msg in channel.take():
+				seqs[msg['producer']].append( msg['seq'] )
+		map(lambda proc: proc.join(), producers)
+		for producer in seqs:
+			self.assertEqual(seqs[producer], range(0,msg_count))
+
+	def test_removed_channel(self):
+		channel = self.open_channel(64)
+		self.assertFalse(channel.is_removed())
+		remove_channel(self.file_name)
+		self.assertTrue(channel.is_removed())
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,150 @@
+'''
+This file is part of MSR Ensemble (MSRE-X).
+
+MSRE-X is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+MSRE-X is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with MSRE-X. If not, see <http://www.gnu.org/licenses/>.
+
+MSR Ensemble (MSRE-X) Version 0.5, Prototype Alpha
+
+Authors:
+Edmund S. L. Lam      sllam@qatar.cmu.edu
+Iliano Cervesato      iliano@cmu.edu
+
+* This implementation was made possible by an NPRP grant (NPRP 09-667-1-100, Effective Programming 
+for Large Distributed Ensembles) from the Qatar National Research Fund (a member of the Qatar 
+Foundation). The statements made herein are solely the responsibility of the authors.
+'''
+
+import unittest
+
+import msrex.misc.visit as visit
+
+class Base(object):
+	pass
+
+class Mid(Base):
+	pass
+
+class Leaf(Mid):
+	pass
+
+class Mixin(object):
+	pass
+
+class MixedLeaf(Mixin, Leaf):
+	pass
+
+class Unrelated(object):
+	pass
+
+class Namer:
+
+	@visit.on('node')
+	def name(self, node, suffix=""):
+		pass
+
+	@visit.when(Base)
+	def name(self, node, suffix=""):
+		return "base" + suffix
+
+	@visit.when(Leaf)
+	def name(self, node, suffix=""):
+		return "leaf" + suffix
+
+	@visit.when(Mixin)
+	def name(self, node, suffix=""):
+		return "mixin" + suffix
+
+# Targets that differ in arity from the declaration, dispatched by the generic Dispatcher.__call__
+class LooseNamer:
+
+	@visit.on('node')
+	def name(self, node):
+		pass
+
+	@visit.when(Base)
+	def name(self, node, suffix="!"):
+		return "base" + suffix
+
+class VisitTest(unittest.TestCase):
+
+	def dispatcher(self):
+		return Namer.__dict__['name'].dispatcher
+
+	def test_nearest_target_along_mro(self):
+		namer = Namer()
+		self.assertEqual(namer.name(Base()), "base")
+		self.assertEqual(namer.name(Mid()), "base")
+		self.assertEqual(namer.name(Leaf(), suffix="?"), "leaf?")
+		self.assertEqual(namer.name(MixedLeaf()), "mixin")
+		self.assertEqual(namer.name(Unrelated()), [])
+
+	def test_cached_targets(self):
+		namer = Namer()
+		for _ in range(0,3):
+			self.assertEqual(namer.name(Mid()), "base")
+			self.assertEqual(namer.name(Leaf()), "leaf")
+		resolved = self.dispatcher().resolved
+		self.assertEqual(resolved[Mid], self.dispatcher().targets[Base])
+		self.assertEqual(resolved[Leaf], self.dispatcher().targets[Leaf])
+
+	def test_subclass_defined_after_dispatch(self):
+		namer = Namer()
+		self.assertEqual(namer.name(Leaf()), "leaf")
+		class LaterLeaf(Leaf):
+			pass
+		class LaterMid(Mid):
+			pass
+		self.assertEqual(namer.name(LaterLeaf()), "leaf")
+		self.assertEqual(namer.name(LaterMid()), "base")
+
+	def test_new_target_invalidates_cache(self):
+		class Shape(object):
+			pass
+		class Square(Shape):
+			pass
+		class ShapeNamer:
+			@visit.on('shape')
+			def name(self, shape):
+				pass
+			@visit.when(Shape)
+			def name(self, shape):
+				return "shape"
+		namer = ShapeNamer()
+		self.assertEqual(namer.name(Square()), "shape")
+		ShapeNamer.__dict__['name'].dispatcher.add_target(Square, lambda self, shape: "square")
+		self.assertEqual(namer.name(Square()), "square")
+		self.assertEqual(namer.name(Shape()), "shape")
+
+	def test_inexact_targets(self):
+		namer = LooseNamer()
+		self.assertEqual(namer.name(Leaf()), "base!")
+		self.assertEqual(namer.name(Unrelated()), [])
+
+	def test_profile(self):
+		namer = Namer()
+		namer.name(Leaf())
+		visit.start_profile()
+		try:
+			visit.enter_pass("test")
+			namer.name(Leaf())
+			namer.name(Mid())
+			namer.name(Mid())
+		finally:
+			profile = visit.stop_profile()
+		self.assertEqual(profile.counts, { ("test","name","Leaf"):1, ("test","name","Mid"):2 })
+		self.assertEqual(namer.name(Mid()), "base")
+		self.assertEqual(profile.counts[("test","name","Mid")], 2)
+
+if __name__ == '__main__':
+	unittest.main()
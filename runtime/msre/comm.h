@@ -1,11 +1,14 @@
 
 #include <list>
+#include <map>
 
 #include <boost/mpi.hpp>
 #include <boost/mpi/status.hpp>
 #include <boost/mpi/collectives.hpp>
 
 #include "boost/tuple/tuple.hpp"
+#include <boost/serialization/list.hpp>
+#include <boost/date_time/posix_time/posix_time.hpp>
 
 #include <sstream>
 #include <boost/format.hpp>
@@ -23,6 +26,23 @@ using namespace boost::tuples;
 #define SLEEP_SIGNAL -3
 #define TERMINAL_SIGNAL -4
 
+// Facts sent to the same rank are buffered and sent as one message, once MSRE_SEND_BATCH_SIZE
+// facts are buffered, once the oldest buffered fact is MSRE_SEND_BATCH_TIME milliseconds old,
+// or at the end of a rewrite step. Ages are only checked every MSRE_SEND_CHECK_INTERVAL sends.
+// Defaults are set in msre_config.h, and below for builds without it.
+
+#ifndef MSRE_SEND_BATCH_SIZE
+#define MSRE_SEND_BATCH_SIZE 64
+#endif
+
+#ifndef MSRE_SEND_BATCH_TIME
+#define MSRE_SEND_BATCH_TIME 5
+#endif
+
+#ifndef MSRE_SEND_CHECK_INTERVAL
+#define MSRE_SEND_CHECK_INTERVAL 16
+#endif
+
 class MPICommAdmin : public LoggerUser {
 
 	protected: const mpi::communicator world;
@@ -208,6 +228,7 @@ class MPIComm : public LoggerUser {
 	virtual void init_send() = 0;
 	virtual void send(int dest, T msg) = 0;
 	virtual void send(T msg) = 0;
+	virtual void flush() = 0;
 	virtual void init_receive() = 0;
 	virtual optional<list<T*> > receive() = 0;
 	virtual int* get_send_counter() = 0;
@@ -220,20 +241,25 @@ class MPICommBasic : public LoggerUser { // : public MPIComm<T> {
 
 	protected: mpi::communicator world;
 
-	protected: T msg;
+	protected: list<T> msgs;
 	protected: mpi::request reqs[2];
 	protected: int fact_tag, max_size;
 	protected: optional<std::pair<mpi::status,mpi::request*> > opt;
 
+	protected: std::map<int,list<T> > send_buffers;
+	protected: std::map<int,posix_time::ptime> send_buffer_starts;
+	protected: posix_time::ptime next_expiry;
+	protected: int sends_since_check;
+
 	protected: int send_counts, recv_counts;
 
 	protected: bool has_admin;
 	protected: MPICommAdmin* admin_comm;
 
-	public: MPICommBasic() { }
+	public: MPICommBasic() : sends_since_check(0) { }
 
 	public: MPICommBasic(int c, int m=100000) 
-                    : fact_tag(c), max_size(m), send_counts(0), recv_counts(0), has_admin(false) { }
+                    : fact_tag(c), max_size(m), sends_since_check(0), send_counts(0), recv_counts(0), has_admin(false) { }
 
 	public: void set_admin_comm(MPICommAdmin* a_comm) {
 		admin_comm = a_comm;
@@ -243,25 +269,68 @@ class MPICommBasic : public LoggerUser { // : public MPIComm<T> {
 	public: void init_send() { }
 
 	public: void send(int dest, T msg) {
-		LOG_NETWORK( record( (format("Sending %s to rank %s") % msg.pretty() % dest).str(), THIS_SRC) );
-		reqs[0] = world.isend(dest, fact_tag, msg);
-		mpi::wait_all(reqs, reqs + 1);
-		LOG_NETWORK( record( (format("Sent %s to rank %s") % msg.pretty() % dest).str(), THIS_SRC) );
-		send_counts++;
-		if( has_admin ) { admin_comm->wake(dest); }
+		LOG_NETWORK( record( (format("Buffering %s for rank %s") % msg.pretty() % dest).str(), THIS_SRC) );
+		list<T>& buffer = send_buffers[dest];
+		buffer.push_back( msg );
+		if (buffer.size() == 1) {
+			posix_time::ptime now = posix_time::microsec_clock::local_time();
+			send_buffer_starts[dest] = now;
+			if (next_expiry.is_not_a_date_time()) {
+				next_expiry = now + posix_time::milliseconds(MSRE_SEND_BATCH_TIME);
+			}
+		}
+		if (buffer.size() >= MSRE_SEND_BATCH_SIZE) {
+			flush(dest);
+		} else if (++sends_since_check >= MSRE_SEND_CHECK_INTERVAL) {
+			flush_expired();
+		}
 	}
 
 	public: void send(T msg) {
-		LOG_NETWORK( record( (format("Sending %s to rank %s") % msg.pretty() % msg.node_id()).str(), THIS_SRC) );
-		reqs[0] = world.isend(msg.node_id(), fact_tag, msg);
+		send(msg.node_id(), msg);
+	}
+
+	// Sends the buffered facts for rank dest as a single message, followed by a single wake.
+	public: void flush(int dest) {
+		list<T>& buffer = send_buffers[dest];
+		if (buffer.empty()) { return; }
+		LOG_NETWORK( record( (format("Sending %s facts to rank %s") % buffer.size() % dest).str(), THIS_SRC) );
+		reqs[0] = world.isend(dest, fact_tag, buffer);
 		mpi::wait_all(reqs, reqs + 1);
-		LOG_NETWORK( record( (format("Sent %s to rank %s") % msg.pretty() % msg.node_id()).str(), THIS_SRC) );
-		send_counts++;
-		if( has_admin ) { admin_comm->wake( msg.node_id() ); }
+		LOG_NETWORK( record( (format("Sent %s facts to rank %s") % buffer.size() % dest).str(), THIS_SRC) );
+		send_counts += buffer.size();
+		buffer.clear();
+		if( has_admin ) { admin_comm->wake(dest); }
+	}
+
+	public: void flush() {
+		for (typename std::map<int,list<T> >::iterator it = send_buffers.begin(); it != send_buffers.end(); it++) {
+			flush(it->first);
+		}
+		next_expiry = posix_time::ptime();
+	}
+
+	// Sends the buffers whose oldest fact has expired. Buffers are only walked once the earliest expiry
+	// time (next_expiry, an estimate that is never later than the actual one) has passed.
+	public: void flush_expired() {
+		sends_since_check = 0;
+		if (next_expiry.is_not_a_date_time()) { return; }
+		posix_time::ptime now = posix_time::microsec_clock::local_time();
+		if (now < next_expiry) { return; }
+		next_expiry = posix_time::ptime();
+		for (typename std::map<int,list<T> >::iterator it = send_buffers.begin(); it != send_buffers.end(); it++) {
+			if (it->second.empty()) { continue; }
+			posix_time::ptime expiry = send_buffer_starts[it->first] + posix_time::milliseconds(MSRE_SEND_BATCH_TIME);
+			if (now >= expiry) {
+				flush(it->first);
+			} else if (next_expiry.is_not_a_date_time() || expiry < next_expiry) {
+				next_expiry = expiry;
+			}
+		}
 	}
 
 	public: void init_receive() {
-		reqs[1] = world.irecv(mpi::any_source, fact_tag, msg);
+		reqs[1] = world.irecv(mpi::any_source, fact_tag, msgs);
 	}
 
 	public: optional<list<T*> > receive() {
@@ -271,13 +340,17 @@ class MPICommBasic : public LoggerUser { // : public MPIComm<T> {
 		if(opt) {
 			list<T*> received;
 			while(opt) {
-				received.push_back(msg.clone());
-				recv_counts++;
-				reqs[1] = world.irecv(mpi::any_source, fact_tag, msg);
-				if(count >= max_size - 1) { break; }
+				int source = (opt->first).source();
+				for (typename list<T>::iterator it = msgs.begin(); it != msgs.end(); it++) {
+					received.push_back(it->clone());
+					recv_counts++;
+					count++;
+				}
+				LOG_NETWORK( record( (format("Received %s facts from rank %s") % msgs.size() % source).str(), THIS_SRC) );
+				msgs.clear();
+				reqs[1] = world.irecv(mpi::any_source, fact_tag, msgs);
+				if(count >= max_size) { break; }
 				opt = mpi::test_any(reqs + 1, reqs + 2);
-				count++;
-				LOG_NETWORK( record( (format("Received %s from rank %s") % msg.pretty() % msg.node_id()).str(), THIS_SRC) );
 			}
 			LOG_NETWORK( record( (format("Received %s facts") % count).str(), THIS_SRC) );
 			return optional<list<T*> >( received )  ;
@@ -291,4 +364,3 @@ class MPICommBasic : public LoggerUser { // : public MPIComm<T> {
 	public: int* get_recv_counter() { return &recv_counts; }
 	
 };
-
@@ -0,0 +1,170 @@
+#ifndef MSRE_FACT_FILE_H
+#define MSRE_FACT_FILE_H
+
+#include <string.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+
+#include <string>
+#include <vector>
+#include <stdexcept>
+
+#include <boost/cstdint.hpp>
+
+using namespace std;
+
+// Binary initial fact files, as written by the MSRE compiler (see msrex/frontend/code/fact_file.py).
+//
+// Layout (native byte order):
+//    "MSREFACT" int32:version
+//    int32:num_nodes  { int32:node_id int32:len char[len]:alias }*
+//    int32:num_locs   { int32:loc int32:num_facts int64:offset int64:size }*
+//    fact records, grouped by location: { int32:pred_id args* }*
+//
+// Arguments are int32 (loc, int), float, char, int8 (bool), or int32:len char[len] (string).
+// The file is memory mapped, so a rank only touches the pages of the locations it owns.
+
+#define MSRE_FACT_FILE_MAGIC "MSREFACT"
+#define MSRE_FACT_FILE_VERSION 1
+
+class FactReader {
+
+	protected: const char* pos;
+	protected: const char* end;
+
+	public: FactReader(const char* p, const char* e) : pos(p), end(e) { }
+
+	public: bool has_next() { return pos < end; }
+
+	protected: void read_bytes(void* dest, size_t size) {
+		if (pos + size > end) { throw runtime_error("Truncated fact record"); }
+		memcpy(dest, pos, size);
+		pos += size;
+	}
+
+	public: int read_int() {
+		int32_t i;
+		read_bytes(&i, sizeof(int32_t));
+		return i;
+	}
+
+	public: int64_t read_long() {
+		int64_t l;
+		read_bytes(&l, sizeof(int64_t));
+		return l;
+	}
+
+	public: float read_float() {
+		float f;
+		read_bytes(&f, sizeof(float));
+		return f;
+	}
+
+	public: char read_char() {
+		char c;
+		read_bytes(&c, sizeof(char));
+		return c;
+	}
+
+	public: bool read_bool() {
+		int8_t b;
+		read_bytes(&b, sizeof(int8_t));
+		return b != 0;
+	}
+
+	public: string read_string() {
+		int len = read_int();
+		if (pos + len > end) { throw runtime_error("Truncated fact record"); }
+		string s(pos, len);
+		pos += len;
+		return s;
+	}
+
+};
+
+class FactFile {
+
+	protected: int fd;
+	protected: char* data;
+	protected: size_t size;
+
+	protected: vector<pair<int,string> > nodes;
+	protected: vector<int> locs;
+	protected: vector<int> loc_counts;
+	protected: vector<pair<int64_t,int64_t> > loc_ranges;
+
+	public: FactFile(string file_name) : fd(-1), data(NULL), size(0) {
+		fd = open(file_name.c_str(), O_RDONLY);
+		if (fd < 0) { throw runtime_error("Cannot open fact file " + file_name); }
+		struct stat st;
+		fstat(fd, &st);
+		size = st.st_size;
+		if (size > 0) {
+			data = (char*) mmap(NULL, size, PROT_READ, MAP_PRIVATE, fd, 0);
+			if (data == MAP_FAILED) {
+				data = NULL;
+				close();
+				throw runtime_error("Cannot map fact file " + file_name);
+			}
+		}
+		read_header(file_name);
+	}
+
+	public: ~FactFile() { close(); }
+
+	protected: void read_header(string file_name) {
+		size_t magic_len = strlen(MSRE_FACT_FILE_MAGIC);
+		if (size < magic_len || memcmp(data, MSRE_FACT_FILE_MAGIC, magic_len) != 0) {
+			throw runtime_error("Not an MSRE fact file: " + file_name);
+		}
+		FactReader reader(data + magic_len, data + size);
+		if (reader.read_int() != MSRE_FACT_FILE_VERSION) {
+			throw runtime_error("Unsupported fact file version: " + file_name);
+		}
+		int num_nodes = reader.read_int();
+		for (int x=0; x < num_nodes; x++) {
+			int node_id  = reader.read_int();
+			string alias = reader.read_string();
+			nodes.push_back( make_pair(node_id, alias) );
+		}
+		int num_locs = reader.read_int();
+		for (int x=0; x < num_locs; x++) {
+			int loc       = reader.read_int();
+			int num_facts = reader.read_int();
+			int64_t offset = reader.read_long();
+			int64_t len    = reader.read_long();
+			if (offset + len > (int64_t) size) { throw runtime_error("Corrupted fact file index: " + file_name); }
+			locs.push_back( loc );
+			loc_counts.push_back( num_facts );
+			loc_ranges.push_back( make_pair(offset, len) );
+		}
+	}
+
+	// Registers the nodes of the fact file with an MSRE node (ensemble)
+	public: template<class N> void reg_nodes(N& node) {
+		for (vector<pair<int,string> >::iterator it = nodes.begin(); it != nodes.end(); it++) {
+			node.add_node( node.reg_node_alias(it->first, it->second) );
+		}
+	}
+
+	public: int num_locs() { return locs.size(); }
+
+	public: int loc(int x) { return locs[x]; }
+
+	public: int num_facts(int x) { return loc_counts[x]; }
+
+	public: FactReader reader(int x) {
+		const char* start = data + loc_ranges[x].first;
+		return FactReader(start, start + loc_ranges[x].second);
+	}
+
+	public: void close() {
+		if (data != NULL) { munmap(data, size); data = NULL; }
+		if (fd >= 0) { ::close(fd); fd = -1; }
+	}
+
+};
+
+#endif /* MSRE_FACT_FILE_H */
@@ -4,7 +4,9 @@
 #include <string.h>
 #include <sstream>
 
+#include <boost/cstdint.hpp>
 #include <boost/tuple/tuple.hpp>
+#include <boost/tuple/tuple_comparison.hpp>
 
 #ifndef MSRE_HASH_SALT
 #define MSRE_HASH_SALT 0
@@ -104,6 +106,56 @@ inline size_t hash(list<T> ls) {
 	return h;
 }
 
+// Hashing of exact store keys (see MultimapStore and OrdMapStore): a store key is the value of the
+// index argument, or the tuple of the values of the index arguments. Unlike the sums of hash above,
+// hash values are strongly mixed (with the finalizer of MurmurHash3), so that keys that differ in
+// few bits, like small integers, spread over all buckets.
+
+inline size_t mix(size_t h) {
+	boost::uint64_t k = h;
+	k ^= k >> 33;
+	k *= 0xff51afd7ed558ccdULL;
+	k ^= k >> 33;
+	k *= 0xc4ceb9fe1a85ec53ULL;
+	k ^= k >> 33;
+	return k;
+}
+
+inline size_t combine(size_t seed, size_t h) {
+	return mix(seed ^ (h + 0x9e3779b97f4a7c15ULL + (seed << 6) + (seed >> 2)));
+}
+
+template <typename T>
+inline size_t key_hash(const T& t) {
+	return mix(hash(t) + MSRE_HASH_SALT);
+}
+
+template <typename T1, typename T2>
+inline size_t key_hash(const tuple<T1,T2>& t) {
+	return combine(key_hash(get<0>(t)), key_hash(get<1>(t)));
+}
+
+template <typename T1, typename T2, typename T3>
+inline size_t key_hash(const tuple<T1,T2,T3>& t) {
+	return combine(combine(key_hash(get<0>(t)), key_hash(get<1>(t))), key_hash(get<2>(t)));
+}
+
+template <typename T1, typename T2, typename T3, typename T4>
+inline size_t key_hash(const tuple<T1,T2,T3,T4>& t) {
+	return combine(combine(combine(key_hash(get<0>(t)), key_hash(get<1>(t))), key_hash(get<2>(t))), key_hash(get<3>(t)));
+}
+
+template <typename T1, typename T2, typename T3, typename T4, typename T5>
+inline size_t key_hash(const tuple<T1,T2,T3,T4,T5>& t) {
+	return combine(combine(combine(combine(key_hash(get<0>(t)), key_hash(get<1>(t))), key_hash(get<2>(t))), key_hash(get<3>(t)))
+                      ,key_hash(get<4>(t)));
+}
+
+struct KeyHash {
+	template <typename K>
+	size_t operator()(const K& k) const { return key_hash(k); }
+};
+
 }
 
 
@@ -89,7 +89,7 @@ using namespace boost;
 
 #define THIS_SRC src(__FILE__,__LINE__)
 
-void print_log_pref() {
+inline void print_log_pref() {
 	cout << "MSRE Logging Enabled: ";
 	#ifdef MSRE_ENABLE_LOG
 		cout << "Yes" << endl;
@@ -129,7 +129,7 @@ void print_log_pref() {
 	#endif /* MSRE_ENABLE_LOG */
 }
 
-string get_time_str() {
+inline string get_time_str() {
 	time_t rawtime;
 	struct tm * timeinfo;
 	char buffer [80];
@@ -154,7 +154,7 @@ struct SourceInfo {
 	}
 };
 
-SourceInfo src(string fname, int line_no) {
+inline SourceInfo src(string fname, int line_no) {
 	return SourceInfo(fname, line_no);
 }
 
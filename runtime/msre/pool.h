@@ -0,0 +1,129 @@
+#ifndef MSRE_POOL_H
+#define MSRE_POOL_H
+
+#include <new>
+#include <list>
+#include <vector>
+
+#include <string>
+#include <sstream>
+
+#include <boost/format.hpp>
+
+#include "misc.h"
+
+using namespace std;
+using namespace boost;
+
+// Per-predicate fact pools. Generated facts are allocated from fixed-size slots, carved out of
+// chunks of MSRE_POOL_CHUNK_SIZE facts, instead of the global heap.
+//
+// A fact is referenced by the goal that introduced it (until it is executed) and by every store
+// of its predicate it was added to (until that store delinks it). Once the last reference is
+// released, the fact is retired. Since join loops may still hold pointers to facts that their
+// iterators just delinked, retired facts only return to the free list on reclaim, which the
+// node calls outside of any rewrite: after purging its stores, and after each bounded rewrite.
+
+#ifndef MSRE_POOL_CHUNK_SIZE
+#define MSRE_POOL_CHUNK_SIZE 1024
+#endif
+
+class Pool : public Pretty {
+
+	protected: string name;
+
+	protected: int allocs;
+	protected: int recycled;
+	protected: int in_use;
+	protected: int peak;
+	protected: int chunks;
+
+	public: Pool(string n) : name(n), allocs(0), recycled(0), in_use(0), peak(0), chunks(0) { }
+
+	public: virtual void reclaim() = 0;
+
+	public: string get_name() { return name; }
+
+	protected: void count_alloc() {
+		allocs++;
+		in_use++;
+		if (in_use > peak) { peak = in_use; }
+	}
+
+	public: string pretty() {
+		stringstream ss;
+		ss << format("Pool of %s: %s allocated (%s recycled), %s in use (peak %s), %s chunk(s)\n")
+		      % name % allocs % recycled % in_use % peak % chunks;
+		return ss.str();
+	}
+
+	public: string pretty_sum() {
+		int sum_allocs   = reduce_sum<int>(allocs);
+		int sum_recycled = reduce_sum<int>(recycled);
+		int sum_peak     = reduce_sum<int>(peak);
+		stringstream ss;
+		ss << format("Sum of all pool of %s: %s allocated (%s recycled), peak %s in use\n")
+		      % name % sum_allocs % sum_recycled % sum_peak;
+		return ss.str();
+	}
+
+};
+
+template<class T>
+class FactPool : public Pool {
+
+	list<char*> chunk_list;
+	char* next_slot;
+	char* chunk_end;
+
+	vector<void*> free_slots;
+	vector<T*> retired;
+
+	public: FactPool(string n) : Pool(n), next_slot(NULL), chunk_end(NULL) { }
+
+	public: ~FactPool() {
+		for (list<char*>::iterator it = chunk_list.begin(); it != chunk_list.end(); it++) {
+			::operator delete(*it);
+		}
+	}
+
+	public: void* alloc(size_t size) {
+		if (size != sizeof(T)) { return ::operator new(size); }
+		count_alloc();
+		if (not free_slots.empty()) {
+			void* slot = free_slots.back();
+			free_slots.pop_back();
+			recycled++;
+			return slot;
+		}
+		if (next_slot == chunk_end) {
+			next_slot = (char*) ::operator new(sizeof(T) * MSRE_POOL_CHUNK_SIZE);
+			chunk_end = next_slot + sizeof(T) * MSRE_POOL_CHUNK_SIZE;
+			chunk_list.push_back( next_slot );
+			chunks++;
+		}
+		void* slot = next_slot;
+		next_slot += sizeof(T);
+		return slot;
+	}
+
+	public: void free(void* slot, size_t size) {
+		if (size != sizeof(T)) { ::operator delete(slot); return; }
+		in_use--;
+		free_slots.push_back( slot );
+	}
+
+	public: void retire(T* fact) {
+		retired.push_back( fact );
+	}
+
+	public: void reclaim() {
+		for (typename vector<T*>::iterator it = retired.begin(); it != retired.end(); it++) {
+			delete *it;
+		}
+		retired.clear();
+	}
+
+};
+
+#endif /* MSRE_POOL_H */
@@ -12,6 +12,7 @@
 #include "logger.h"
 #include "misc.h"
 #include "store.h"
+#include "pool.h"
 #include "fact.h"
 #include "directory.h"
 
@@ -61,6 +62,7 @@ class MSRENode : public LoggerUser, public Pretty, public HTML {
 	protected: list<Pretty*> pretty_components;
 	protected: list<Counter*> counter_components;
 	protected: list<Store*> repr_components;
+	protected: list<Pool*> pool_components;
 
 	protected: bool ran;
 	protected: ptime time_start, time_end;
@@ -75,6 +77,7 @@ class MSRENode : public LoggerUser, public Pretty, public HTML {
 	protected: virtual void rewrite_loop() = 0;
 	protected: virtual bool receive() = 0;
 	protected: virtual bool globally_quiescence() = 0;
+	protected: virtual void flush_sends() { }
 
 	public: string next_exist_id(int seed) {
 		stringstream ss;
@@ -132,9 +135,13 @@ class MSRENode : public LoggerUser, public Pretty, public HTML {
 
 		purge();
 
+		string pool_output = pretty_pools();
+		string pool_sum_output = pretty_pool_sums();
+		output_logger.record_forced( pool_output, (format("Rank %s") % world.rank()).str(), THIS_SRC );
+
 		string active_time_str = (format("Time taken by Rank %s (active): %s") % world.rank() % active_duration).str();
 		output_logger.record_forced( active_time_str, (format("Rank %s") % world.rank()).str(), THIS_SRC );		
-		cout << "Rank " << world.rank() << " Stat:" << endl << output << endl;
+		cout << "Rank " << world.rank() << " Stat:" << endl << output << pool_output << endl;
 
 		world.barrier();
 
@@ -144,7 +151,7 @@ class MSRENode : public LoggerUser, public Pretty, public HTML {
 
 		if (world.rank() == 0) {
 			stringstream ss;
-			ss << sum_output << "Time Taken (including sleep): " << duration << endl;
+			ss << sum_output << pool_sum_output << "Time Taken (including sleep): " << duration << endl;
 
 			ss << "Total Memory usage: " << (total_memory / 1000000.0) << "GB(s)" << endl;
 			output_logger.record_forced( ss.str(), "Rank 0", THIS_SRC );
@@ -216,6 +223,10 @@ class MSRENode : public LoggerUser, public Pretty, public HTML {
 		repr_components.push_back( store );
 	}
 
+	public: void set_pool_component(Pool* pool) {
+		pool_components.push_back( pool );
+	}
+
 	public: void set_pretty_component(Pretty* pretty) {
 		pretty_components.push_back( pretty );
 	}
@@ -295,10 +306,34 @@ class MSRENode : public LoggerUser, public Pretty, public HTML {
 		return ss.str();
 	}
 
+	public: string pretty_pools() {
+		stringstream ss;
+		for(list<Pool*>::iterator it = pool_components.begin(); it != pool_components.end(); it++) {
+			ss << (*it)->pretty();
+		}
+		return ss.str();
+	}
+
+	public: string pretty_pool_sums() {
+		stringstream ss;
+		for(list<Pool*>::iterator it = pool_components.begin(); it != pool_components.end(); it++) {
+			ss << (*it)->pretty_sum();
+		}
+		return ss.str();
+	}
+
 	public: void purge() {
 		for(list<Store*>::iterator it = store_components.begin(); it != store_components.end(); it++) {
 			(*it)->purge();
 		}
+		reclaim_pools();
+	}
+
+	// Returns the facts retired so far to their pools. Only safe between rewrites, when no join loop holds facts.
+	public: void reclaim_pools() {
+		for(list<Pool*>::iterator it = pool_components.begin(); it != pool_components.end(); it++) {
+			(*it)->reclaim();
+		}
 	}
 
 };
@@ -332,6 +367,7 @@ class LocalQuiescenceMSRENode : public MSRENode {
 			start_active_duration();
 			rewrite();
 			end_active_duration();
+			flush_sends();
 			LOG_REWRITE_LOOP( record( "Quiescence reached", THIS_SRC) );
 			// if (not receive(RETRIES, SLEEP_TIME, FACTOR)) { break; }
 			if (not receive()) { 
@@ -368,6 +404,8 @@ class ExpoBackoffMSRENode : public MSRENode {
 			start_active_duration();
 			done_something = rewrite(curr_local_steps); 
 			end_active_duration();
+			reclaim_pools();
+			flush_sends();
 			rewrite_restarts++;
 			LOG_REWRITE_LOOP( record( (format("%s steps completed") % curr_local_steps).str() , THIS_SRC) );
 
@@ -415,6 +453,8 @@ class AdminExpoBackoffMSRENode : public MSRENode {
 			start_active_duration();
 			bool rewritten = rewrite(curr_local_steps); 
 			end_active_duration();
+			reclaim_pools();
+			flush_sends();
 			LOG_REWRITE_LOOP( record( (format("%s steps completed") % curr_local_steps).str() , THIS_SRC) );
 
 			if (not rewritten and not received_msgs) {
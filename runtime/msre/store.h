@@ -2,6 +2,8 @@
 #define MSRE_STORE_H
 
 #include <list>
+#include <map>
+#include <vector>
 
 #include <string>
 #include <sstream>
@@ -22,6 +24,7 @@
 #include <boost/format.hpp>
 #include "misc.h"
 #include "logger.h"
+#include "hash.h"
 
 using namespace std;
 using namespace boost;
@@ -29,6 +32,31 @@ using namespace boost::tuples;
 
 namespace bcont = boost::container;
 
+// Purging of dead facts. Facts are logically deleted (set_dead), and only later erased from store
+// containers, either by iterators passing over them, or by purge. Stores count their entries and
+// live facts, so purge has nothing to do (in constant time) while there are no dead entries. Otherwise:
+//    MSRE_PURGE_THRESHOLD   - compacts the whole store, once dead entries are at least
+//                             MSRE_PURGE_DEAD_RATIO of its entries
+//    MSRE_PURGE_INCREMENTAL - erases the dead entries among the next MSRE_PURGE_SLICE entries
+//                             of the store, resuming where the previous purge stopped
+// Define MSRE_PURGE_POLICY in msre_config.h to select the policy of the generated stores.
+// Stores retain the facts added to them, and release them once delinked (see msre/pool.h).
+
+#define MSRE_PURGE_THRESHOLD   0
+#define MSRE_PURGE_INCREMENTAL 1
+
+#ifndef MSRE_PURGE_POLICY
+#define MSRE_PURGE_POLICY MSRE_PURGE_THRESHOLD
+#endif
+
+#ifndef MSRE_PURGE_DEAD_RATIO
+#define MSRE_PURGE_DEAD_RATIO 0.25
+#endif
+
+#ifndef MSRE_PURGE_SLICE
+#define MSRE_PURGE_SLICE 1024
+#endif
+
 // Abstract Classes
 
 template<class E>
@@ -111,11 +139,13 @@ template<class E>
 class ListIter : public StoreIter<E> {
 
 	list<E*>* store;
+	int* entries;
 	typename list<E*>::iterator start;
 	typename list<E*>::iterator end;
 
-	public: ListIter(list<E*>& st) {
+	public: ListIter(list<E*>& st, int* e = NULL) {
 		store = &st;
+		entries = e;
 		start = st.begin();
 		end   = st.end();
 	}
@@ -151,6 +181,8 @@ class ListIter : public StoreIter<E> {
 				start++;
 				LOG_STORE( record( (format("Delinking %s") % (**temp).pretty()).str() , THIS_SRC) );
 				store->erase( temp );
+				if (entries != NULL) { (*entries)--; }
+				ptr->release();
 				if(start == end) { return optional<E*>(); }
 				ptr = *start;
 			}
@@ -173,27 +205,78 @@ class ListIter : public StoreIter<E> {
 };
 
 
+// Iterates over the facts of a column store by position. Facts appended to the store
+// during the iteration are visited as well.
+
 template<class E>
+class ColumnIter : public StoreIter<E> {
+
+	vector<E*>* store;
+	size_t start;
+
+	public: ColumnIter(vector<E*>& st) {
+		store = &st;
+		start = 0;
+	}
+
+	public: void init_iter() {
+		start = 0;
+	}
+
+	public: bool contains(E* e) {
+		for (size_t x=0; x < (*store).size(); x++) {
+			E* curr = (*store)[x];
+			if (curr->is_alive() && (e->identity() == curr->identity())) {
+				return true;
+			}
+		}
+		return false;
+	}
+
+	public: optional<E*> get_next_alive() {
+		while (start < (*store).size()) {
+			E* ptr = (*store)[start];
+			start++;
+			if (ptr->alive) { return optional<E*>( ptr ); }
+		}
+		return optional<E*>();
+	}
+
+	public: optional<E*> get_next() {
+		if (start < (*store).size()) {
+			E* ptr = (*store)[start];
+			start++;
+			return optional<E*>( ptr );
+		}
+		return optional<E*>();
+	}
+
+};
+
+
+template<class E, class K>
 class MultimapIter : public StoreIter<E> {
 
-	size_t kp;
-	unordered_multimap<size_t,E*>* store;
-	typename unordered_multimap<size_t,E*>::iterator start;
-	typename unordered_multimap<size_t,E*>::iterator end;
+	K kp;
+	unordered_multimap<K,E*,msre::KeyHash>* store;
+	int* entries;
+	typename unordered_multimap<K,E*,msre::KeyHash>::iterator start;
+	typename unordered_multimap<K,E*,msre::KeyHash>::iterator end;
 
-	public: MultimapIter(unordered_multimap<size_t,E*>& st, size_t k) {
+	public: MultimapIter(unordered_multimap<K,E*,msre::KeyHash>& st, K k, int* e = NULL) {
 		store = &st;
 		kp    = k;
-		typename unordered_multimap<size_t,E*>::iterator fst;
-		typename unordered_multimap<size_t,E*>::iterator snd;
+		entries = e;
+		typename unordered_multimap<K,E*,msre::KeyHash>::iterator fst;
+		typename unordered_multimap<K,E*,msre::KeyHash>::iterator snd;
 		tie(fst,snd) = st.equal_range(k);
 		start = fst;
 		end   = snd;
 	}
 
 	public: void init_iter() {
-		typename unordered_multimap<size_t,E*>::iterator fst;
-		typename unordered_multimap<size_t,E*>::iterator snd;
+		typename unordered_multimap<K,E*,msre::KeyHash>::iterator fst;
+		typename unordered_multimap<K,E*,msre::KeyHash>::iterator snd;
 		tie(fst,snd) = (*store).equal_range(kp);
 		start = fst;
 		end   = snd;
@@ -201,8 +284,8 @@ class MultimapIter : public StoreIter<E> {
 
 	public: bool contains(E* e) {
 
-		typename unordered_multimap<size_t,E*>::iterator local_start;
-		typename unordered_multimap<size_t,E*>::iterator local_end;
+		typename unordered_multimap<K,E*,msre::KeyHash>::iterator local_start;
+		typename unordered_multimap<K,E*,msre::KeyHash>::iterator local_end;
 		tie(local_start,local_end) = (*store).equal_range(kp);
 		while(local_start != local_end) {
 			E* curr = *local_start;
@@ -221,10 +304,12 @@ class MultimapIter : public StoreIter<E> {
 			// cout << "Entered MultimapIter Delink" << endl;
 			while(not (ptr->alive)) {
 				// cout << ((*ptr)).pretty() << endl;
-				typename unordered_multimap<size_t,E*>::iterator temp = start;
+				typename unordered_multimap<K,E*,msre::KeyHash>::iterator temp = start;
 				start++;
 				LOG_STORE( record( (format("Delinking %s") % (temp->second)->pretty()).str() , THIS_SRC) );
 				store->erase( temp );
+				if (entries != NULL) { (*entries)--; }
+				ptr->release();
 				if(start == end) { return optional<E*>(); }
 				ptr = start->second;
 			}
@@ -246,15 +331,130 @@ class MultimapIter : public StoreIter<E> {
 
 };
 
+// Range iterator over the facts of an ordered store bucket, visiting only facts whose
+// ordered key lies on the requested side of the bound.
+
+#define MSRE_ORD_LEQ 0
+#define MSRE_ORD_LT  1
+#define MSRE_ORD_GEQ 2
+#define MSRE_ORD_GT  3
+
+template<class E, class K>
+class OrdIter : public StoreIter<E> {
+
+	multimap<K,E*>* store;
+	int* entries;
+	K bound;
+	int ord;
+	typename multimap<K,E*>::iterator start;
+
+	public: OrdIter(multimap<K,E*>& st, K b, int o, int* e = NULL) {
+		store = &st;
+		entries = e;
+		bound = b;
+		ord   = o;
+		init_iter();
+	}
+
+	public: void init_iter() {
+		start = range_begin();
+	}
+
+	private: typename multimap<K,E*>::iterator range_begin() {
+		switch(ord) {
+			case MSRE_ORD_GEQ: return (*store).lower_bound(bound);
+			case MSRE_ORD_GT:  return (*store).upper_bound(bound);
+			default: return (*store).begin();
+		}
+	}
+
+	private: bool in_range(typename multimap<K,E*>::iterator it) {
+		if (it == (*store).end()) { return false; }
+		switch(ord) {
+			case MSRE_ORD_LEQ: return !(bound < it->first);
+			case MSRE_ORD_LT:  return it->first < bound;
+			default: return true;
+		}
+	}
+
+	public: bool contains(E* e) {
+
+		typename multimap<K,E*>::iterator local_start = range_begin();
+		while(in_range(local_start)) {
+			E* curr = local_start->second;
+			if (curr->is_alive() && (e->identity() == curr->identity())) {
+				return true;
+			}
+			local_start++;
+		}
+		return false;
+
+	}
+
+	public: optional<E*> get_next_alive() {
+		while (in_range(start)) {
+			E* ptr = start->second;
+			if (ptr->alive) {
+				start++;
+				return optional<E*>( ptr );
+			}
+			typename multimap<K,E*>::iterator temp = start;
+			start++;
+			LOG_STORE( record( (format("Delinking %s") % (temp->second)->pretty()).str() , THIS_SRC) );
+			store->erase( temp );
+			if (entries != NULL) { (*entries)--; }
+			ptr->release();
+		}
+		return optional<E*>();
+	}
+
+	public: optional<E*> get_next() {
+		if (in_range(start)) {
+			E* ptr = start->second;
+			start++;
+			return optional<E*>( ptr );
+		}
+		return optional<E*>();
+	}
+
+};
+
 // Store class
 
+// Facts are added to every store of their predicate, but logically deleted through one of them only
+// (see share_live_count). Each store counts its own entries, live or dead.
+
 class Store : public Pretty, public HTML {
 
+	protected: int entries;
+	protected: int live;
+	protected: Store* live_counter;
+
+	public: Store() : entries(0), live(0), live_counter(this) { }
+
 	public: virtual void set_name(string n) = 0;
 	public: virtual string get_name() = 0;
 	public: virtual void purge() = 0;
-	public: virtual int size()   = 0;
-	public: virtual int actual_size() = 0;
+
+	// Count live facts with the store s, through which facts of this store are logically deleted.
+	public: void share_live_count(Store* s) { live_counter = s; }
+
+	protected: void count_add() {
+		entries++;
+		if (live_counter == this) { live++; }
+	}
+
+	protected: void count_remove() { live_counter->live--; }
+
+	public: int size() { return live_counter->live; }
+
+	public: int actual_size() { return entries; }
+
+	public: int dead_size() { return entries - size(); }
+
+	protected: bool purge_due() {
+		return dead_size() > 0 && dead_size() >= MSRE_PURGE_DEAD_RATIO * entries;
+	}
 
 	public: int sum_size() {
 		mpi::communicator world;
@@ -280,7 +480,7 @@ class Store : public Pretty, public HTML {
 
 // Store Implementations
 
-template<class E>
+template<class E, int P = MSRE_PURGE_POLICY>
 class ListStore: public Store, public LoggerUser {
 	
 	list<E*> store;
@@ -294,17 +494,20 @@ class ListStore: public Store, public LoggerUser {
 
 	public: void add(E* elem) {
 		store.push_back( elem );
+		count_add();
+		elem->retain();
 		LOG_STORE( record( (format("Stored new fact %s") % elem->pretty()).str(), THIS_SRC) );
 	}
 
 	public: void remove(E* elem) {
 		// elem->alive = false;
+		if (elem->alive) { count_remove(); }
 		elem->set_dead();
 		LOG_STORE( record( (format("Logically deleted %s") % elem->pretty()).str(), THIS_SRC) );
 	}
 
 	public: ListIter<E> lookup_candidates() {
-		ListIter<E> it = ListIter<E>( store );
+		ListIter<E> it = ListIter<E>( store, &entries );
 		LOG_STORE(
 			it.set_logger(logger);
 			stringstream ss;
@@ -316,6 +519,14 @@ class ListStore: public Store, public LoggerUser {
 	}
 
 	public: void purge() {
+		if (P == MSRE_PURGE_INCREMENTAL) {
+			if (dead_size() > 0) { purge_slice(); }
+		} else if (purge_due()) {
+			compact();
+		}
+	}
+
+	public: void compact() {
 		typename list<E*>::iterator start = store.begin();
 		LOG_STORE( 
 			record( "Purging dead facts", THIS_SRC);
@@ -325,7 +536,9 @@ class ListStore: public Store, public LoggerUser {
 			if( not (**start).alive ) { 
 				typename list<E*>::iterator temp = start;
 				start++;
+				(*temp)->release();
 				store.erase( temp );
+				entries--;
 				LOG_STORE( count++; );
 			} else {
 				start++;
@@ -334,18 +547,30 @@ class ListStore: public Store, public LoggerUser {
 		LOG_STORE( record( (format("Delinked %s facts.") % count).str() , THIS_SRC) );
 	}
 
-	public: int actual_size() {
-		return store.size();
-	}
-
-	public: int size() {
+	// Erases the dead entries among the first MSRE_PURGE_SLICE entries, and moves the live ones to the back,
+	// so that the next slice starts where this one stopped.
+	public: void purge_slice() {
 		typename list<E*>::iterator start = store.begin();
-		int count = 0;
-		while(start != store.end()) {
-			if( (**start).alive ) { count++; }
-			start++;
+		LOG_STORE( 
+			record( "Purging dead facts", THIS_SRC);
+			int count = 0; 
+		);
+		int scanned = 0;
+		while(start != store.end() && scanned < MSRE_PURGE_SLICE) {
+			if( not (**start).alive ) { 
+				typename list<E*>::iterator temp = start;
+				start++;
+				(*temp)->release();
+				store.erase( temp );
+				entries--;
+				LOG_STORE( count++; );
+			} else {
+				start++;
+			}
+			scanned++;
 		}
-		return count;
+		store.splice( store.end(), store, store.begin(), start );
+		LOG_STORE( record( (format("Delinked %s facts.") % count).str() , THIS_SRC) );
 	}
 
 	public: string pretty() {
@@ -387,31 +612,111 @@ class ListStore: public Store, public LoggerUser {
 };
 
 
+// Column store, for persistent facts: besides the facts themselves, the store keeps one contiguous
+// column per fact argument, filled by the add member of the generated subclass, which then calls
+// add_fact. Join tasks scan the columns by position. Persistent facts are never deleted, so there
+// is nothing to purge.
+
 template<class E>
+class ColumnStore: public Store, public LoggerUser {
+
+	protected: vector<E*> facts;
+	string name;
+
+	public: ColumnStore() { }
+
+	public: void set_name(string n) { name = n; }
+
+	public: string get_name() { return name; }
+
+	protected: void add_fact(E* elem) {
+		facts.push_back( elem );
+		count_add();
+		elem->retain();
+		LOG_STORE( record( (format("Stored new fact %s") % elem->pretty()).str(), THIS_SRC) );
+	}
+
+	public: E* fact(int x) { return facts[x]; }
+
+	public: ColumnIter<E> lookup_candidates() {
+		ColumnIter<E> it = ColumnIter<E>( facts );
+		LOG_STORE(
+			it.set_logger(logger);
+			stringstream ss;
+			uuids::uuid uuid = uuids::random_generator()();
+			ss << logging_context << "->Iter" << uuid ;
+			it.set_logging_context(ss.str());
+		);
+		return it;
+	}
+
+	public: void purge() { }
+
+	public: string pretty() {
+		stringstream ss;
+		ss << format("------------------- %s -------------------\n") % name ;
+		for (size_t x=0; x < facts.size(); x++) {
+			if ( facts[x]->alive ) {
+				ss << facts[x]->pretty() << " ";
+			}
+		}
+		ss << format("\n------ Logical size: %s, Actual size: %s ------\n") % size() % actual_size();
+		ss << "--------------------------------------------------\n";
+		return ss.str();
+	}
+
+	public: string markdown(bcont::map<int,string> aliases) {
+		stringstream ss;
+		ss << format("%s\n------------------------------------\n") % name ;
+		for (size_t x=0; x < facts.size(); x++) {
+			if ( facts[x]->alive ) {
+				ss << facts[x]->markdown(aliases) << " ";
+			}
+		}
+		ss << "\n";
+		return ss.str();
+	}
+
+	public: string markdown() {
+		bcont::map<int,string> aliases;
+		return markdown(aliases);
+	}
+
+};
+
+
+// Hash store: facts are keyed by the exact values of their index arguments (a value of type K,
+// a tuple for more than one argument), so lookups never return facts of other keys.
+
+template<class E, class K, int P = MSRE_PURGE_POLICY>
 class MultimapStore : public Store, public LoggerUser {
 	
-	unordered_multimap<size_t,E*> store;
+	unordered_multimap<K,E*,msre::KeyHash> store;
 	string name;
+	size_t purge_bucket;
 
-	public: MultimapStore() { }
+	public: MultimapStore() : purge_bucket(0) { }
 
 	public: void set_name(string n) { name = n; }
 
 	public: string get_name() { return name; }
 
-	public: void add(E* elem, size_t key) {
+	public: void add(E* elem, K key) {
 		store.insert( make_pair(key,elem) );
-		LOG_STORE( record( (format("Stored new fact %s as key %s") % elem->pretty() % key).str(), THIS_SRC) );
+		count_add();
+		elem->retain();
+		LOG_STORE( record( (format("Stored new fact %s") % elem->pretty()).str(), THIS_SRC) );
 	}
 
 	public: void remove(E* elem) {
 		// elem->alive = false;
+		if (elem->alive) { count_remove(); }
 		elem->set_dead();
 		LOG_STORE( record( (format("Logically deleted %s") % elem->pretty()).str(), THIS_SRC) );
 	}
 
-	public: MultimapIter<E> lookup_candidates(size_t key) {
-		MultimapIter<E> it = MultimapIter<E>(store, key);
+	public: MultimapIter<E,K> lookup_candidates(K key) {
+		MultimapIter<E,K> it = MultimapIter<E,K>(store, key, &entries);
 		LOG_STORE(
 			it.set_logger(logger);
 			stringstream ss;
@@ -423,16 +728,26 @@ class MultimapStore : public Store, public LoggerUser {
 	}
 
 	public: void purge() {
-		typename unordered_multimap<size_t,E*>::iterator start = store.begin();
+		if (P == MSRE_PURGE_INCREMENTAL) {
+			if (dead_size() > 0) { purge_slice(); }
+		} else if (purge_due()) {
+			compact();
+		}
+	}
+
+	public: void compact() {
+		typename unordered_multimap<K,E*,msre::KeyHash>::iterator start = store.begin();
 		LOG_STORE( 
 			record( "Purging dead facts", THIS_SRC);
 			int count = 0; 
 		);
 		while(start != store.end()) {
 			if (not (start->second)->alive) { 
-				typename unordered_multimap<size_t,E*>::iterator temp = start;
+				typename unordered_multimap<K,E*,msre::KeyHash>::iterator temp = start;
 				start++;
+				(temp->second)->release();
 				store.erase( temp );
+				entries--;
 				LOG_STORE( count++; );
 			} else {
 				start++;
@@ -441,22 +756,46 @@ class MultimapStore : public Store, public LoggerUser {
 		LOG_STORE( record( (format("Delinked %s facts.") % count).str() , THIS_SRC) );
 	}
 
-	public: int actual_size() {
-		return store.size();
-	}
-
-	public: int size() {
-		typename unordered_multimap<size_t,E*>::iterator start = store.begin();
-		int count = 0;
-		while(start != store.end()) {
-			if ((start->second)->alive) { count++; }
-			start++;
+	// Erases the dead entries of the next buckets, from purge_bucket onwards, until MSRE_PURGE_SLICE entries are scanned.
+	public: void purge_slice() {
+		LOG_STORE( 
+			record( "Purging dead facts", THIS_SRC);
+			int count = 0; 
+		);
+		size_t bucket_count = store.bucket_count();
+		size_t first_bucket = purge_bucket;
+		int scanned = 0;
+		for (size_t b=0; b < bucket_count && scanned < MSRE_PURGE_SLICE; b++) {
+			size_t bucket = (first_bucket + b) % bucket_count;
+			list<K> dead_keys;
+			typename unordered_multimap<K,E*,msre::KeyHash>::local_iterator start = store.begin(bucket);
+			while(start != store.end(bucket)) {
+				if (not (start->second)->alive) { dead_keys.push_back( start->first ); }
+				start++;
+				scanned++;
+			}
+			for (typename list<K>::iterator key = dead_keys.begin(); key != dead_keys.end(); key++) {
+				typename unordered_multimap<K,E*,msre::KeyHash>::iterator fst;
+				typename unordered_multimap<K,E*,msre::KeyHash>::iterator snd;
+				tie(fst,snd) = store.equal_range(*key);
+				while(fst != snd) {
+					if (not (fst->second)->alive) {
+						(fst->second)->release();
+						fst = store.erase( fst );
+						entries--;
+						LOG_STORE( count++; );
+					} else {
+						fst++;
+					}
+				}
+			}
+			purge_bucket = bucket + 1;
 		}
-		return count;
+		LOG_STORE( record( (format("Delinked %s facts.") % count).str() , THIS_SRC) );
 	}
 
 	public: string pretty() {
-		typename unordered_multimap<size_t,E*>::iterator start = store.begin();
+		typename unordered_multimap<K,E*,msre::KeyHash>::iterator start = store.begin();
 		stringstream ss;
 		ss << format("------------------- %s -------------------\n") % name;
 		while( start != store.end() ) {
@@ -471,7 +810,7 @@ class MultimapStore : public Store, public LoggerUser {
 	}
 
 	public: string markdown(bcont::map<int,string> aliases) {
-		typename unordered_multimap<size_t,E*>::iterator start = store.begin();
+		typename unordered_multimap<K,E*,msre::KeyHash>::iterator start = store.begin();
 		stringstream ss;
 		ss << format("%s\n---------------------------------------\n") % name;
 		while( start != store.end() ) {
@@ -491,4 +830,160 @@ class MultimapStore : public Store, public LoggerUser {
 
 };
 
+// Ordered store: facts are keyed by the values of their index arguments (as in MultimapStore),
+// and ordered by one argument (of type O) within each key, so that order guards can be answered
+// as range lookups.
+
+template<class E, class K, class O, int P = MSRE_PURGE_POLICY>
+class OrdMapStore : public Store, public LoggerUser {
+	
+	unordered_map<K,multimap<O,E*>,msre::KeyHash> store;
+	multimap<O,E*> empty_bucket;
+	string name;
+	size_t purge_bucket;
+
+	public: OrdMapStore() : purge_bucket(0) { }
+
+	public: void set_name(string n) { name = n; }
+
+	public: string get_name() { return name; }
+
+	public: void add(E* elem, K key, O ord_key) {
+		store[key].insert( make_pair(ord_key,elem) );
+		count_add();
+		elem->retain();
+		LOG_STORE( record( (format("Stored new fact %s") % elem->pretty()).str(), THIS_SRC) );
+	}
+
+	public: void remove(E* elem) {
+		if (elem->alive) { count_remove(); }
+		elem->set_dead();
+		LOG_STORE( record( (format("Logically deleted %s") % elem->pretty()).str(), THIS_SRC) );
+	}
+
+	// Keys without facts are looked up in empty_bucket, rather than inserted into the store
+	public: OrdIter<E,O> lookup_candidates(K key, O bound, int ord) {
+		typename unordered_map<K,multimap<O,E*>,msre::KeyHash>::iterator bucket = store.find(key);
+		OrdIter<E,O> it = OrdIter<E,O>(bucket != store.end() ? bucket->second : empty_bucket, bound, ord, &entries);
+		LOG_STORE(
+			it.set_logger(logger);
+			stringstream ss;
+			uuids::uuid uuid = uuids::random_generator()();
+			ss << logging_context << "->Iter" << uuid ;
+			it.set_logging_context(ss.str());
+		);
+		return it;
+	}
+
+	public: void purge() {
+		if (P == MSRE_PURGE_INCREMENTAL) {
+			if (dead_size() > 0) { purge_slice(); }
+		} else if (purge_due()) {
+			compact();
+		}
+	}
+
+	public: void compact() {
+		typename unordered_map<K,multimap<O,E*>,msre::KeyHash>::iterator bucket = store.begin();
+		LOG_STORE( 
+			record( "Purging dead facts", THIS_SRC);
+			int count = 0; 
+		);
+		while(bucket != store.end()) {
+			int purged = purge_keys( bucket->second );
+			LOG_STORE( count += purged; );
+			if (bucket->second.empty()) {
+				bucket = store.erase( bucket );
+			} else {
+				bucket++;
+			}
+		}
+		LOG_STORE( record( (format("Delinked %s facts.") % count).str() , THIS_SRC) );
+	}
+
+	// Erases the dead entries of the next buckets (of keys), from purge_bucket onwards, until MSRE_PURGE_SLICE entries are scanned.
+	public: void purge_slice() {
+		LOG_STORE( 
+			record( "Purging dead facts", THIS_SRC);
+			int count = 0; 
+		);
+		size_t bucket_count = store.bucket_count();
+		size_t first_bucket = purge_bucket;
+		int scanned = 0;
+		for (size_t b=0; b < bucket_count && scanned < MSRE_PURGE_SLICE; b++) {
+			size_t bucket = (first_bucket + b) % bucket_count;
+			typename unordered_map<K,multimap<O,E*>,msre::KeyHash>::local_iterator keys = store.begin(bucket);
+			while(keys != store.end(bucket)) {
+				scanned += keys->second.size();
+				int purged = purge_keys( keys->second );
+				LOG_STORE( count += purged; );
+				keys++;
+			}
+			purge_bucket = bucket + 1;
+		}
+		LOG_STORE( record( (format("Delinked %s facts.") % count).str() , THIS_SRC) );
+	}
+
+	private: int purge_keys(multimap<O,E*>& facts) {
+		int count = 0;
+		typename multimap<O,E*>::iterator start = facts.begin();
+		while(start != facts.end()) {
+			if (not (start->second)->alive) { 
+				typename multimap<O,E*>::iterator temp = start;
+				start++;
+				(temp->second)->release();
+				facts.erase( temp );
+				entries--;
+				count++;
+			} else {
+				start++;
+			}
+		}
+		return count;
+	}
+
+	public: string pretty() {
+		typename unordered_map<K,multimap<O,E*>,msre::KeyHash>::iterator bucket = store.begin();
+		stringstream ss;
+		ss << format("------------------- %s -------------------\n") % name;
+		while(bucket != store.end()) {
+			typename multimap<O,E*>::iterator start = bucket->second.begin();
+			while(start != bucket->second.end()) {
+				if ((start->second)->alive) {
+					ss << (*(*start).second).pretty() << " ";
+				} 
+				start++;
+			}
+			bucket++;
+		}
+		ss << format("\n------ Logical size: %s, Actual size: %s ------\n") % size() % actual_size();
+		ss << "----------------------------------------------------\n";
+		return ss.str();
+	}
+
+	public: string markdown(bcont::map<int,string> aliases) {
+		typename unordered_map<K,multimap<O,E*>,msre::KeyHash>::iterator bucket = store.begin();
+		stringstream ss;
+		ss << format("%s\n---------------------------------------\n") % name;
+		while(bucket != store.end()) {
+			typename multimap<O,E*>::iterator start = bucket->second.begin();
+			while(start != bucket->second.end()) {
+				if ((start->second)->alive) {
+					ss << (*(*start).second).markdown(aliases) << " ";
+				} 
+				start++;
+			}
+			bucket++;
+		}
+		ss << "\n";
+		return ss.str();
+	}
+
+	public: string markdown() {
+		bcont::map<int,string> aliases;
+		return markdown(aliases);
+	}
+
+};
+
 #endif /* MSRE_STORE_H */
@@ -13,3 +13,15 @@
 #define MSRE_VERBOSE
 #define MSRE_PTR_SCREEN
 #define MSRE_HASH_COLLISION_CHECK
+
+// Purging of dead facts from stores: MSRE_PURGE_THRESHOLD or MSRE_PURGE_INCREMENTAL (see msre/store.h)
+#define MSRE_PURGE_POLICY MSRE_PURGE_THRESHOLD
+
+// Number of facts per chunk of the fact pools (see msre/pool.h)
+#define MSRE_POOL_CHUNK_SIZE 1024
+
+// Batching of facts sent to other ranks (see msre/comm.h): facts per message, age (in milliseconds)
+// after which a batch is sent, and number of sends between checks of the batch ages
+#define MSRE_SEND_BATCH_SIZE 64
+#define MSRE_SEND_BATCH_TIME 5
+#define MSRE_SEND_CHECK_INTERVAL 16